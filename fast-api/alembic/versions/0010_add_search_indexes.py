@@ -0,0 +1,58 @@
+"""add full-text search indexes
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17 05:02:41.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (índice, tabela de origem, colunas indexadas) — ver app/services/search.py
+SEARCH_INDEXES = (
+    ("expenses_fts", "expenses", ("name", "description")),
+    ("investments_fts", "investments", ("name", "ticker")),
+)
+
+
+def upgrade() -> None:
+    for index, source, columns in SEARCH_INDEXES:
+        column_list = ", ".join(columns)
+        new_values = ", ".join(f"new.{col}" for col in columns)
+        old_values = ", ".join(f"old.{col}" for col in columns)
+
+        op.execute(
+            f"CREATE VIRTUAL TABLE {index} USING fts5("
+            f"{column_list}, content='{source}', content_rowid='rowid', tokenize='trigram')"
+        )
+        op.execute(
+            f"CREATE TRIGGER {index}_insert AFTER INSERT ON {source} BEGIN "
+            f"INSERT INTO {index}(rowid, {column_list}) VALUES (new.rowid, {new_values}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {index}_delete AFTER DELETE ON {source} BEGIN "
+            f"INSERT INTO {index}({index}, rowid, {column_list}) VALUES ('delete', old.rowid, {old_values}); END"
+        )
+        # Só reindexar quando o texto muda (atualizações de valor ou data não tocam o índice)
+        op.execute(
+            f"CREATE TRIGGER {index}_update AFTER UPDATE OF {column_list} ON {source} BEGIN "
+            f"INSERT INTO {index}({index}, rowid, {column_list}) VALUES ('delete', old.rowid, {old_values}); "
+            f"INSERT INTO {index}(rowid, {column_list}) VALUES (new.rowid, {new_values}); END"
+        )
+        # Indexar as linhas existentes
+        op.execute(f"INSERT INTO {index}({index}) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    for index, source, columns in SEARCH_INDEXES:
+        for event in ("insert", "delete", "update"):
+            op.execute(f"DROP TRIGGER IF EXISTS {index}_{event}")
+        op.execute(f"DROP TABLE IF EXISTS {index}")
@@ -1,7 +1,9 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, user_cache
 from app.models.user import User
 from app.schemas.auth import (
     UserCreate,
@@ -9,30 +11,37 @@ from app.schemas.auth import (
     UserUpdate,
     UserResponse,
     ChangePassword,
+    RefreshTokenRequest,
     AuthResponse,
 )
 from app.core.security import (
-    verify_password,
-    get_password_hash,
+    check_password,
+    hash_password,
     create_access_token,
 )
+from app.services.refresh_tokens import (
+    issue_refresh_token,
+    revoke_refresh_token_session,
+    revoke_refresh_tokens,
+    rotate_refresh_token,
+)
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
 @router.post("/register", response_model=AuthResponse, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """Registrar novo usuário."""
     # Verificar se email já existe
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
-    if existing_user:
+    result = await db.execute(select(User).where(User.email == user_data.email))
+    if result.scalar_one_or_none():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email já cadastrado",
         )
     
     # Criar usuário
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await hash_password(user_data.password)
     db_user = User(
         name=user_data.name,
         email=user_data.email,
@@ -40,44 +49,87 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.flush()
     
-    # Criar token
+    # Criar tokens
+    refresh_token = await issue_refresh_token(db, db_user.id)
+    await db.commit()
+    await db.refresh(db_user)
     access_token = create_access_token(data={"sub": db_user.id})
     
     return AuthResponse(
         user=UserResponse.model_validate(db_user),
         token=access_token,
+        refresh_token=refresh_token,
     )
 
 
 @router.post("/login", response_model=AuthResponse)
-async def login(credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(credentials: UserLogin, db: AsyncSession = Depends(get_db)):
     """Fazer login."""
     # Buscar usuário
-    user = db.query(User).filter(User.email == credentials.email).first()
-    if not user or not verify_password(credentials.password, user.hashed_password):
+    result = await db.execute(select(User).where(User.email == credentials.email))
+    user = result.scalar_one_or_none()
+    valid, new_hash = await check_password(credentials.password, user.hashed_password) if user else (False, None)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Email ou senha incorretos",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Criar token
+    # Regravar o hash se o custo do bcrypt estiver desatualizado
+    if new_hash:
+        user.hashed_password = new_hash
+    
+    # Criar tokens
+    refresh_token = await issue_refresh_token(db, user.id)
+    await db.commit()
     access_token = create_access_token(data={"sub": user.id})
     
     return AuthResponse(
         user=UserResponse.model_validate(user),
         token=access_token,
+        refresh_token=refresh_token,
+    )
+
+
+@router.post("/refresh", response_model=AuthResponse)
+async def refresh(data: RefreshTokenRequest, db: AsyncSession = Depends(get_db)):
+    """Renovar o access token com um refresh token (que é trocado por um novo)."""
+    rotated = await rotate_refresh_token(db, data.refresh_token)
+    if rotated is None:
+        # Persistir a revogação da sessão em caso de reutilização do token
+        await db.commit()
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token inválido ou expirado",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    user_id, refresh_token = rotated
+    user = await db.get(User, user_id)
+    await db.commit()
+    
+    return AuthResponse(
+        user=UserResponse.model_validate(user),
+        token=create_access_token(data={"sub": user_id}),
+        refresh_token=refresh_token,
     )
 
 
 @router.post("/logout")
-async def logout(current_user: User = Depends(get_current_user)):
+async def logout(
+    data: Optional[RefreshTokenRequest] = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
     """Fazer logout."""
-    # Como estamos usando JWT stateless, apenas retornamos sucesso
-    # O cliente deve remover o token
+    # O access token JWT é stateless e o cliente deve removê-lo; se o refresh token
+    # for enviado, a sessão correspondente é revogada
+    if data is not None:
+        await revoke_refresh_token_session(db, current_user.id, data.refresh_token)
+        await db.commit()
     return {"message": "Logout realizado com sucesso"}
 
 
@@ -91,13 +143,16 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
 async def update_profile(
     user_data: UserUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Atualizar perfil do usuário."""
+    # O usuário autenticado pode vir do cache; alterar a versão atual do banco
+    current_user = await db.get(User, current_user.id)
+    
     # Verificar se email já está em uso por outro usuário
     if user_data.email and user_data.email != current_user.email:
-        existing_user = db.query(User).filter(User.email == user_data.email).first()
-        if existing_user:
+        result = await db.execute(select(User).where(User.email == user_data.email))
+        if result.scalar_one_or_none():
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email já está em uso",
@@ -111,8 +166,9 @@ async def update_profile(
     if user_data.avatar is not None:
         current_user.avatar = user_data.avatar
     
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await db.refresh(current_user)
+    user_cache.invalidate(current_user.id)
     
     return UserResponse.model_validate(current_user)
 
@@ -121,11 +177,15 @@ async def update_profile(
 async def change_password(
     password_data: ChangePassword,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Alterar senha do usuário."""
+    # O usuário autenticado pode vir do cache; verificar contra a senha atual do banco
+    current_user = await db.get(User, current_user.id)
+    
     # Verificar senha atual
-    if not verify_password(password_data.current_password, current_user.hashed_password):
+    valid, _ = await check_password(password_data.current_password, current_user.hashed_password)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Senha atual incorreta",
@@ -139,7 +199,10 @@ async def change_password(
         )
     
     # Atualizar senha
-    current_user.hashed_password = get_password_hash(password_data.new_password)
-    db.commit()
+    current_user.hashed_password = await hash_password(password_data.new_password)
+    # Encerrar todas as sessões abertas com a senha antiga
+    await revoke_refresh_tokens(db, current_user.id)
+    await db.commit()
+    user_cache.invalidate(current_user.id)
     
     return {"message": "Senha alterada com sucesso"}
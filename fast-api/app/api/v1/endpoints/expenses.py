@@ -1,67 +1,80 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
-import time
-import hashlib
-from functools import wraps
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response, UploadFile, File
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, func, select
+from pydantic import TypeAdapter
+import io
 from datetime import datetime
 from app.database import get_db
 from app.dependencies import get_current_user
+from app.core.conditional import bump_data_version, conditional_get
+from app.core.coalesce import CoalescingRoute
 from app.models.user import User
 from app.models.expense import Expense
+from app.core.rate_limit import RateLimiter
+from app.core.responses import json_response, schema_columns
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, SortKey, apply_keyset, paginate
+from app.services.export import EXPORT_MEDIA_TYPES, build_export_query, stream_expenses
+from app.services.importer import ExpenseImporter, detect_encoding, iter_statement_rows
+from app.services.expense_batch import ExpenseBatch
+from app.services.rollups import RollupDeltas
+from app.services.search import EXPENSE_SEARCH
 from app.schemas.expense import (
     ExpenseCreate,
     ExpenseUpdate,
     ExpenseResponse,
     ExpenseStats,
+    ExpenseFilters,
+    ExportFormat,
+    ImportAmountSign,
+    ImportFormat,
+    ExpenseImportResult,
+    ExpenseBatchRequest,
+    ExpenseBatchResponse,
     PaymentMethodType,
     Period,
 )
 
 
 
-router = APIRouter(prefix="/expenses", tags=["Expenses"])
-
+router = APIRouter(
+    prefix="/expenses",
+    tags=["Expenses"],
+    route_class=CoalescingRoute,
+    dependencies=[Depends(RateLimiter()), Depends(conditional_get)],
+)
 
-# Cache para rate limiting (armazena: {chave: timestamp_da_última_chamada})
-_request_cache = {}
-_RATE_LIMIT_SECONDS = 1  # Tempo mínimo entre requisições idênticas
+EXPENSE_SORT = (SortKey(Expense.date, descending=True), SortKey(Expense.id, descending=True))
+EXPENSE_LIST = TypeAdapter(List[ExpenseResponse])
+EXPENSE_COLUMNS = schema_columns(Expense, ExpenseResponse)
 
 
-def _generate_cache_key(user_id: str, endpoint: str, **kwargs) -> str:
-    """Gera uma chave única para o cache baseada no usuário e parâmetros."""
-    params_str = str(sorted(kwargs.items()))
-    cache_string = f"{user_id}:{endpoint}:{params_str}"
-    return hashlib.md5(cache_string.encode()).hexdigest()
+def apply_expense_filters(query, filters: ExpenseFilters):
+    """Aplicar os filtros de listagem de despesas a uma consulta."""
+    if filters.start_date:
+        query = query.where(Expense.date >= filters.start_date)
+    if filters.end_date:
+        query = query.where(Expense.date <= filters.end_date)
+    if filters.category:
+        query = query.where(Expense.category == filters.category)
+    if filters.payment_method:
+        query = query.where(Expense.payment_method == filters.payment_method)
+    if filters.min_value is not None:
+        query = query.where(Expense.value >= filters.min_value)
+    if filters.max_value is not None:
+        query = query.where(Expense.value <= filters.max_value)
+    if filters.is_recurring is not None:
+        query = query.where(Expense.is_recurring == filters.is_recurring)
+    if filters.search:
+        query, _ = EXPENSE_SEARCH.apply(query, filters.search)
+    return query
 
 
-def _is_rate_limited(cache_key: str) -> bool:
-    """Verifica se a requisição deve ser bloqueada por rate limiting."""
-    current_time = time.time()
-    
-    if cache_key in _request_cache:
-        last_request_time = _request_cache[cache_key]
-        time_diff = current_time - last_request_time
-        
-        if time_diff < _RATE_LIMIT_SECONDS:
-            return True
-    
-    # Atualizar o cache com o tempo atual
-    _request_cache[cache_key] = current_time
-    
-    # Limpar entradas antigas do cache (mais de 60 segundos)
-    keys_to_remove = [
-        key for key, timestamp in _request_cache.items()
-        if current_time - timestamp > 60
-    ]
-    for key in keys_to_remove:
-        del _request_cache[key]
-    
-    return False
-
 @router.get("", response_model=List[ExpenseResponse])
 async def get_expenses(
+    response: Response,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     category: Optional[str] = None,
@@ -70,60 +83,43 @@ async def get_expenses(
     max_value: Optional[float] = None,
     is_recurring: Optional[bool] = None,
     search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
+    """Listar despesas paginadas (cursor da próxima página no header X-Next-Cursor).
+
+    Com `search`, os resultados vêm do índice de texto, ordenados por relevância.
+    """
     try:
-        cache_key = _generate_cache_key(
-            user_id=str(current_user.id),
-            endpoint="get_expenses",
-            start_date=start_date,
-            end_date=end_date,
-            category=category,
-            payment_method=payment_method,
-            min_value=min_value,
-            max_value=max_value,
-            is_recurring=is_recurring,
-            search=search,
-        )
-        
-        # Verificar rate limiting
-        if _is_rate_limited(cache_key):
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Muitas requisições. Aguarde um momento antes de tentar novamente.",
-            )
-        
-        query = db.query(Expense).filter(Expense.user_id == current_user.id)
-        
-        # Aplicar filtros
-        if start_date:
-            query = query.filter(Expense.date >= start_date)
-        if end_date:
-            query = query.filter(Expense.date <= end_date)
-        if category:
-            query = query.filter(Expense.category == category)
-        if payment_method:
-            query = query.filter(Expense.payment_method == payment_method)
-        if min_value is not None:
-            query = query.filter(Expense.value >= min_value)
-        if max_value is not None:
-            query = query.filter(Expense.value <= max_value)
-        if is_recurring is not None:
-            query = query.filter(Expense.is_recurring == is_recurring)
+        query = select(*EXPENSE_COLUMNS).where(Expense.user_id == current_user.id)
+        sort = EXPENSE_SORT
         if search:
-            query = query.filter(
-                or_(
-                    Expense.name.ilike(f"%{search}%"),
-                    Expense.description.ilike(f"%{search}%")
-                )
-            )
+            query, rank = EXPENSE_SEARCH.apply(query, search)
+            if rank is not None:
+                query = query.add_columns(rank)
+                sort = (SortKey(rank),) + EXPENSE_SORT
+        
+        query = apply_expense_filters(
+            query,
+            ExpenseFilters(
+                start_date=start_date,
+                end_date=end_date,
+                category=category,
+                payment_method=payment_method,
+                min_value=min_value,
+                max_value=max_value,
+                is_recurring=is_recurring,
+            ),
+        )
         
-        expenses = query.order_by(Expense.date.desc()).all()
-        return [ExpenseResponse.model_validate(expense) for expense in expenses]
+        result = await db.execute(apply_keyset(query, sort, cursor, limit))
+        expenses = paginate(result.mappings().all(), sort, limit, response)
+        return json_response(EXPENSE_LIST, expenses, response)
     
     except HTTPException:
-        # Re-lançar HTTPException (rate limit)
+        # Re-lançar HTTPException (cursor inválido)
         raise
     except Exception as e:
         # Capturar qualquer outro erro inesperado
@@ -139,44 +135,41 @@ async def get_expense_stats(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Obter estatísticas de despesas."""
-    query = db.query(Expense).filter(Expense.user_id == current_user.id)
+    filters = [Expense.user_id == current_user.id]
     
     if start_date:
-        query = query.filter(Expense.date >= start_date)
+        filters.append(Expense.date >= start_date)
     if end_date:
-        query = query.filter(Expense.date <= end_date)
+        filters.append(Expense.date <= end_date)
     
-    expenses = query.all()
-    
-    if not expenses:
-        return ExpenseStats(
-            total=0.0,
-            count=0,
-            average=0.0,
-            by_category={},
-            by_payment_method={},
-            period=period,
+    # Uma única varredura agrupada por categoria e método de pagamento;
+    # os totais são derivados das poucas linhas agregadas
+    result = await db.execute(
+        select(
+            Expense.category,
+            Expense.payment_method,
+            func.sum(Expense.value),
+            func.count(Expense.id),
         )
+        .where(*filters)
+        .group_by(Expense.category, Expense.payment_method)
+    )
     
-    total = sum(exp.value for exp in expenses)
-    count = len(expenses)
-    average = total / count if count > 0 else 0.0
-    
-    # Agrupar por categoria
+    total = 0.0
+    count = 0
     by_category = {}
-    for expense in expenses:
-        category = expense.category
-        by_category[category] = by_category.get(category, 0.0) + expense.value
-    
-    # Agrupar por método de pagamento
     by_payment_method = {}
-    for expense in expenses:
-        if expense.payment_method:
-            method = expense.payment_method.value
-            by_payment_method[method] = by_payment_method.get(method, 0.0) + expense.value
+    for category, method, value, rows in result.all():
+        total += value
+        count += rows
+        by_category[category] = by_category.get(category, 0.0) + value
+        if method:
+            by_payment_method[method.value] = by_payment_method.get(method.value, 0.0) + value
+    
+    average = total / count if count > 0 else 0.0
     
     return ExpenseStats(
         total=total,
@@ -188,16 +181,87 @@ async def get_expense_stats(
     )
 
 
+@router.get("/export")
+async def export_expenses(
+    format: ExportFormat = Query(ExportFormat.CSV),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    category: Optional[str] = None,
+    payment_method: Optional[PaymentMethodType] = None,
+    min_value: Optional[float] = None,
+    max_value: Optional[float] = None,
+    is_recurring: Optional[bool] = None,
+    search: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+):
+    """Exportar despesas em CSV ou NDJSON via streaming (mesmos filtros da listagem)."""
+    query = apply_expense_filters(
+        build_export_query(current_user.id),
+        ExpenseFilters(
+            start_date=start_date,
+            end_date=end_date,
+            category=category,
+            payment_method=payment_method,
+            min_value=min_value,
+            max_value=max_value,
+            is_recurring=is_recurring,
+            search=search,
+        ),
+    ).order_by(Expense.date.desc(), Expense.id.desc())
+    
+    return StreamingResponse(
+        stream_expenses(query, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="despesas.{format.value}"'},
+    )
+
+
+@router.post("/import", response_model=ExpenseImportResult)
+async def import_expenses(
+    file: UploadFile = File(...),
+    format: Optional[ImportFormat] = Query(None),
+    amount_sign: ImportAmountSign = Query(ImportAmountSign.NEGATIVE),
+    default_category: str = Query("Outros", min_length=1, max_length=50),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Importar despesas de um extrato CSV ou OFX, ignorando lançamentos já importados."""
+    if format is None:
+        filename = (file.filename or "").lower()
+        format = ImportFormat.OFX if filename.endswith(".ofx") else ImportFormat.CSV
+    
+    encoding = await run_in_threadpool(detect_encoding, file.file)
+    stream = io.TextIOWrapper(file.file, encoding=encoding, errors="replace", newline="")
+    try:
+        # OFX sempre registra débitos com valor negativo
+        sign = ImportAmountSign.NEGATIVE if format == ImportFormat.OFX else amount_sign
+        importer = ExpenseImporter(db, current_user.id, sign)
+        return await importer.run(iter_statement_rows(stream, format, default_category))
+    finally:
+        stream.detach()
+
+
+@router.post("/batch", response_model=ExpenseBatchResponse)
+async def batch_expenses(
+    batch: ExpenseBatchRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Criar, atualizar e deletar despesas em lote, em uma única transação."""
+    return await ExpenseBatch(db, current_user.id).run(batch)
+
+
 @router.get("/{expense_id}", response_model=ExpenseResponse)
 async def get_expense(
     expense_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Buscar despesa por ID."""
-    expense = db.query(Expense).filter(
-        and_(Expense.id == expense_id, Expense.user_id == current_user.id)
-    ).first()
+    result = await db.execute(
+        select(Expense).where(and_(Expense.id == expense_id, Expense.user_id == current_user.id))
+    )
+    expense = result.scalar_one_or_none()
     
     if not expense:
         raise HTTPException(
@@ -212,7 +276,7 @@ async def get_expense(
 async def create_expense(
     expense_data: ExpenseCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Criar nova despesa."""
     db_expense = Expense(
@@ -221,8 +285,14 @@ async def create_expense(
     )
     
     db.add(db_expense)
-    db.commit()
-    db.refresh(db_expense)
+    
+    rollups = RollupDeltas()
+    rollups.add(current_user.id, db_expense.date, db_expense.category, db_expense.value)
+    await rollups.apply(db)
+    
+    await bump_data_version(db, current_user.id)
+    await db.commit()
+    await db.refresh(db_expense)
     
     return ExpenseResponse.model_validate(db_expense)
 
@@ -232,12 +302,13 @@ async def update_expense(
     expense_id: str,
     expense_data: ExpenseUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Atualizar despesa."""
-    expense = db.query(Expense).filter(
-        and_(Expense.id == expense_id, Expense.user_id == current_user.id)
-    ).first()
+    result = await db.execute(
+        select(Expense).where(and_(Expense.id == expense_id, Expense.user_id == current_user.id))
+    )
+    expense = result.scalar_one_or_none()
     
     if not expense:
         raise HTTPException(
@@ -245,13 +316,20 @@ async def update_expense(
             detail="Despesa não encontrada",
         )
     
+    rollups = RollupDeltas()
+    rollups.remove(current_user.id, expense.date, expense.category, expense.value)
+    
     # Atualizar campos
     update_data = expense_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(expense, field, value)
     
-    db.commit()
-    db.refresh(expense)
+    rollups.add(current_user.id, expense.date, expense.category, expense.value)
+    await rollups.apply(db)
+    
+    await bump_data_version(db, current_user.id)
+    await db.commit()
+    await db.refresh(expense)
     
     return ExpenseResponse.model_validate(expense)
 
@@ -260,12 +338,13 @@ async def update_expense(
 async def delete_expense(
     expense_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Deletar despesa."""
-    expense = db.query(Expense).filter(
-        and_(Expense.id == expense_id, Expense.user_id == current_user.id)
-    ).first()
+    result = await db.execute(
+        select(Expense).where(and_(Expense.id == expense_id, Expense.user_id == current_user.id))
+    )
+    expense = result.scalar_one_or_none()
     
     if not expense:
         raise HTTPException(
@@ -273,7 +352,13 @@ async def delete_expense(
             detail="Despesa não encontrada",
         )
     
-    db.delete(expense)
-    db.commit()
+    await db.delete(expense)
+    
+    rollups = RollupDeltas()
+    rollups.remove(current_user.id, expense.date, expense.category, expense.value)
+    await rollups.apply(db)
+    
+    await bump_data_version(db, current_user.id)
+    await db.commit()
     
     return None
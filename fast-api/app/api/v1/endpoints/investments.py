@@ -1,101 +1,163 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from datetime import date, datetime
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, func, select
+from pydantic import TypeAdapter
 from app.database import get_db
 from app.dependencies import get_current_user
+from app.core.conditional import bump_data_version, conditional_get
+from app.core.coalesce import CoalescingRoute
 from app.models.user import User
 from app.models.investment import Investment, InvestmentHistory, InvestmentType
+from app.core.responses import json_response, schema_columns
+from app.services.search import INVESTMENT_SEARCH
+from app.services.history import HistorySeries, PortfolioTimeseries, downsample_rows
+from app.services.performance import PerformanceEngine
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, SortKey, apply_keyset, paginate
 from app.schemas.investment import (
     InvestmentCreate,
     InvestmentUpdate,
     InvestmentResponse,
     InvestmentStats,
     InvestmentHistoryResponse,
+    InvestmentHistorySeries,
+    PortfolioPerformance,
+    PortfolioValueSeries,
+    TimeseriesGroup,
     InvestmentTypeStats,
     UpdateCurrentValueRequest,
+    HistoryBucket,
+    HistorySampling,
+    DEFAULT_HISTORY_POINTS,
+    MAX_HISTORY_POINTS,
 )
 
-router = APIRouter(prefix="/investments", tags=["Investments"])
+router = APIRouter(
+    prefix="/investments",
+    tags=["Investments"],
+    route_class=CoalescingRoute,
+    dependencies=[Depends(conditional_get)],
+)
+
+INVESTMENT_SORT = (SortKey(Investment.purchase_date, descending=True), SortKey(Investment.id, descending=True))
+INVESTMENT_LIST = TypeAdapter(List[InvestmentResponse])
+INVESTMENT_HISTORY_LIST = TypeAdapter(List[InvestmentHistoryResponse])
+INVESTMENT_HISTORY_SERIES = TypeAdapter(InvestmentHistorySeries)
+PORTFOLIO_PERFORMANCE = TypeAdapter(PortfolioPerformance)
+PORTFOLIO_VALUE_SERIES = TypeAdapter(PortfolioValueSeries)
+INVESTMENT_COLUMNS = schema_columns(Investment, InvestmentResponse)
+INVESTMENT_HISTORY_COLUMNS = schema_columns(InvestmentHistory, InvestmentHistoryResponse)
 
 
 @router.get("", response_model=List[InvestmentResponse])
 async def get_investments(
+    response: Response,
     type: Optional[InvestmentType] = None,
     min_value: Optional[float] = None,
     max_value: Optional[float] = None,
     search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    """Listar investimentos."""
-    query = db.query(Investment).filter(Investment.user_id == current_user.id)
+    """Listar investimentos paginados (cursor da próxima página no header X-Next-Cursor).
+
+    Com `search`, os resultados vêm do índice de texto, ordenados por relevância.
+    """
+    query = select(*INVESTMENT_COLUMNS).where(Investment.user_id == current_user.id)
+    sort = INVESTMENT_SORT
     
     if type:
-        query = query.filter(Investment.type == type)
+        query = query.where(Investment.type == type)
     if min_value is not None:
-        query = query.filter(Investment.current_value >= min_value)
+        query = query.where(Investment.current_value >= min_value)
     if max_value is not None:
-        query = query.filter(Investment.current_value <= max_value)
+        query = query.where(Investment.current_value <= max_value)
     if search:
-        query = query.filter(or_(Investment.name.ilike(f"%{search}%"), Investment.ticker.ilike(f"%{search}%")))
+        query, rank = INVESTMENT_SEARCH.apply(query, search)
+        if rank is not None:
+            query = query.add_columns(rank)
+            sort = (SortKey(rank),) + INVESTMENT_SORT
     
-    investments = query.order_by(Investment.purchase_date.desc()).all()
-    return [InvestmentResponse.model_validate(inv) for inv in investments]
+    result = await db.execute(apply_keyset(query, sort, cursor, limit))
+    investments = paginate(result.mappings().all(), sort, limit, response)
+    return json_response(INVESTMENT_LIST, investments, response)
 
 
 @router.get("/stats", response_model=InvestmentStats)
 async def get_investment_stats(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Obter estatísticas de investimentos."""
-    investments = db.query(Investment).filter(Investment.user_id == current_user.id).all()
-    
-    if not investments:
-        return InvestmentStats(
-            total_invested=0.0,
-            current_total=0.0,
-            total_profit=0.0,
-            profit_percentage=0.0,
-            count=0,
-            by_type={},
+    result = await db.execute(
+        select(
+            Investment.type,
+            func.sum(Investment.value),
+            func.sum(Investment.current_value),
+            func.count(Investment.id),
         )
+        .where(Investment.user_id == current_user.id)
+        .group_by(Investment.type)
+    )
     
-    total_invested = sum(inv.value for inv in investments)
-    current_total = sum(inv.current_value for inv in investments)
+    by_type = {}
+    for inv_type, invested, current, count in result.all():
+        by_type[inv_type.value] = InvestmentTypeStats(invested=invested, current=current, count=count)
+    
+    total_invested = sum(stats.invested for stats in by_type.values())
+    current_total = sum(stats.current for stats in by_type.values())
     total_profit = current_total - total_invested
     profit_percentage = (total_profit / total_invested * 100) if total_invested > 0 else 0.0
     
-    by_type = {}
-    for inv in investments:
-        type_name = inv.type.value
-        if type_name not in by_type:
-            by_type[type_name] = InvestmentTypeStats(invested=0, current=0, count=0)
-        by_type[type_name].invested += inv.value
-        by_type[type_name].current += inv.current_value
-        by_type[type_name].count += 1
-    
     return InvestmentStats(
         total_invested=total_invested,
         current_total=current_total,
         total_profit=total_profit,
         profit_percentage=profit_percentage,
-        count=len(investments),
+        count=sum(stats.count for stats in by_type.values()),
         by_type=by_type,
     )
 
 
+@router.get("/performance", response_model=PortfolioPerformance)
+async def get_investment_performance(
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Retorno ponderado pelo tempo (TWR) e pelo dinheiro (XIRR) por investimento, por tipo e da carteira."""
+    performance = await PerformanceEngine(db, current_user.id).build()
+    return json_response(PORTFOLIO_PERFORMANCE, performance, response)
+
+
+@router.get("/timeseries", response_model=PortfolioValueSeries)
+async def get_investment_timeseries(
+    response: Response,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    group_by: TimeseriesGroup = Query(TimeseriesGroup.TYPE),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Valor diário da carteira (total e por tipo ou investimento) em arrays alinhados com `dates`."""
+    series = await PortfolioTimeseries(db, current_user.id, start_date, end_date).build(group_by)
+    return json_response(PORTFOLIO_VALUE_SERIES, series, response)
+
+
 @router.get("/{investment_id}", response_model=InvestmentResponse)
 async def get_investment(
     investment_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Buscar investimento por ID."""
-    investment = db.query(Investment).filter(
-        and_(Investment.id == investment_id, Investment.user_id == current_user.id)
-    ).first()
+    result = await db.execute(
+        select(Investment).where(and_(Investment.id == investment_id, Investment.user_id == current_user.id))
+    )
+    investment = result.scalar_one_or_none()
     
     if not investment:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Investimento não encontrado")
@@ -107,18 +169,19 @@ async def get_investment(
 async def create_investment(
     investment_data: InvestmentCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Criar investimento."""
     db_investment = Investment(user_id=current_user.id, **investment_data.model_dump())
     db.add(db_investment)
-    db.commit()
-    db.refresh(db_investment)
+    await db.commit()
+    await db.refresh(db_investment)
     
     # Criar histórico inicial
     history = InvestmentHistory(investment_id=db_investment.id, value=db_investment.current_value)
     db.add(history)
-    db.commit()
+    await bump_data_version(db, current_user.id)
+    await db.commit()
     
     return InvestmentResponse.model_validate(db_investment)
 
@@ -128,12 +191,13 @@ async def update_investment(
     investment_id: str,
     investment_data: InvestmentUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Atualizar investimento."""
-    investment = db.query(Investment).filter(
-        and_(Investment.id == investment_id, Investment.user_id == current_user.id)
-    ).first()
+    result = await db.execute(
+        select(Investment).where(and_(Investment.id == investment_id, Investment.user_id == current_user.id))
+    )
+    investment = result.scalar_one_or_none()
     
     if not investment:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Investimento não encontrado")
@@ -142,8 +206,9 @@ async def update_investment(
     for field, value in update_data.items():
         setattr(investment, field, value)
     
-    db.commit()
-    db.refresh(investment)
+    await bump_data_version(db, current_user.id)
+    await db.commit()
+    await db.refresh(investment)
     return InvestmentResponse.model_validate(investment)
 
 
@@ -151,40 +216,75 @@ async def update_investment(
 async def delete_investment(
     investment_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Deletar investimento."""
-    investment = db.query(Investment).filter(
-        and_(Investment.id == investment_id, Investment.user_id == current_user.id)
-    ).first()
+    result = await db.execute(
+        select(Investment).where(and_(Investment.id == investment_id, Investment.user_id == current_user.id))
+    )
+    investment = result.scalar_one_or_none()
     
     if not investment:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Investimento não encontrado")
     
-    db.delete(investment)
-    db.commit()
+    await db.delete(investment)
+    await bump_data_version(db, current_user.id)
+    await db.commit()
     return None
 
 
 @router.get("/{investment_id}/history", response_model=List[InvestmentHistoryResponse])
 async def get_investment_history(
     investment_id: str,
+    response: Response,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    max_points: int = Query(DEFAULT_HISTORY_POINTS, ge=3, le=MAX_HISTORY_POINTS),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    """Buscar histórico de investimento."""
-    investment = db.query(Investment).filter(
-        and_(Investment.id == investment_id, Investment.user_id == current_user.id)
-    ).first()
+    """Buscar histórico de investimento, reduzido via LTTB a no máximo `max_points` registros."""
+    result = await db.execute(
+        select(Investment.id).where(and_(Investment.id == investment_id, Investment.user_id == current_user.id))
+    )
     
-    if not investment:
+    if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Investimento não encontrado")
     
-    history = db.query(InvestmentHistory).filter(
-        InvestmentHistory.investment_id == investment_id
-    ).order_by(InvestmentHistory.date.desc()).all()
+    query = select(*INVESTMENT_HISTORY_COLUMNS).where(InvestmentHistory.investment_id == investment_id)
+    if start_date:
+        query = query.where(InvestmentHistory.date >= start_date)
+    if end_date:
+        query = query.where(InvestmentHistory.date <= end_date)
+    
+    result = await db.execute(query.order_by(InvestmentHistory.date.desc()))
+    history = downsample_rows(result.mappings().all(), max_points)
+    
+    return json_response(INVESTMENT_HISTORY_LIST, history, response)
+
+
+@router.get("/{investment_id}/history/series", response_model=InvestmentHistorySeries)
+async def get_investment_history_series(
+    investment_id: str,
+    response: Response,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    sampling: HistorySampling = Query(HistorySampling.LTTB),
+    bucket: HistoryBucket = Query(HistoryBucket.AUTO),
+    max_points: int = Query(DEFAULT_HISTORY_POINTS, ge=3, le=MAX_HISTORY_POINTS),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Histórico reduzido para gráficos: OHLC por bucket ou linha via LTTB, com no máximo `max_points` pontos."""
+    result = await db.execute(
+        select(Investment.id).where(and_(Investment.id == investment_id, Investment.user_id == current_user.id))
+    )
+    
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Investimento não encontrado")
     
-    return [InvestmentHistoryResponse.model_validate(h) for h in history]
+    series = await HistorySeries(db, investment_id, start_date, end_date).build(sampling, bucket, max_points)
+    return json_response(INVESTMENT_HISTORY_SERIES, series, response)
 
 
 @router.patch("/{investment_id}/update-value", response_model=InvestmentResponse)
@@ -192,12 +292,13 @@ async def update_current_value(
     investment_id: str,
     request: UpdateCurrentValueRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Atualizar valor atual do investimento."""
-    investment = db.query(Investment).filter(
-        and_(Investment.id == investment_id, Investment.user_id == current_user.id)
-    ).first()
+    result = await db.execute(
+        select(Investment).where(and_(Investment.id == investment_id, Investment.user_id == current_user.id))
+    )
+    investment = result.scalar_one_or_none()
     
     if not investment:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Investimento não encontrado")
@@ -208,7 +309,8 @@ async def update_current_value(
     history = InvestmentHistory(investment_id=investment_id, value=request.current_value)
     db.add(history)
     
-    db.commit()
-    db.refresh(investment)
+    await bump_data_version(db, current_user.id)
+    await db.commit()
+    await db.refresh(investment)
     
     return InvestmentResponse.model_validate(investment)
@@ -1,43 +1,63 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, select, update
+from pydantic import TypeAdapter
 from app.database import get_db
 from app.dependencies import get_current_user
+from app.core.conditional import bump_data_version, conditional_get
 from app.models.user import User
 from app.models.payment_method import PaymentMethod
+from app.core.responses import json_response, schema_columns
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, SortKey, apply_keyset, paginate
 from app.schemas.payment_method import (
     PaymentMethodCreate,
     PaymentMethodUpdate,
     PaymentMethodResponse,
 )
 
-router = APIRouter(prefix="/payment-methods", tags=["Payment Methods"])
+router = APIRouter(
+    prefix="/payment-methods",
+    tags=["Payment Methods"],
+    dependencies=[Depends(conditional_get)],
+)
+
+PAYMENT_METHOD_SORT = (
+    SortKey(PaymentMethod.is_default, descending=True),
+    SortKey(PaymentMethod.name),
+    SortKey(PaymentMethod.id),
+)
+PAYMENT_METHOD_LIST = TypeAdapter(List[PaymentMethodResponse])
+PAYMENT_METHOD_COLUMNS = schema_columns(PaymentMethod, PaymentMethodResponse)
 
 
 @router.get("", response_model=List[PaymentMethodResponse])
 async def get_payment_methods(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    """Listar todos os métodos de pagamento do usuário."""
-    methods = db.query(PaymentMethod).filter(
-        PaymentMethod.user_id == current_user.id
-    ).order_by(PaymentMethod.is_default.desc(), PaymentMethod.name).all()
+    """Listar métodos de pagamento do usuário (cursor da próxima página no header X-Next-Cursor)."""
+    query = select(*PAYMENT_METHOD_COLUMNS).where(PaymentMethod.user_id == current_user.id)
+    result = await db.execute(apply_keyset(query, PAYMENT_METHOD_SORT, cursor, limit))
+    methods = paginate(result.mappings().all(), PAYMENT_METHOD_SORT, limit, response)
     
-    return [PaymentMethodResponse.model_validate(method) for method in methods]
+    return json_response(PAYMENT_METHOD_LIST, methods, response)
 
 
 @router.get("/{method_id}", response_model=PaymentMethodResponse)
 async def get_payment_method(
     method_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Buscar método de pagamento por ID."""
-    method = db.query(PaymentMethod).filter(
-        and_(PaymentMethod.id == method_id, PaymentMethod.user_id == current_user.id)
-    ).first()
+    result = await db.execute(
+        select(PaymentMethod).where(and_(PaymentMethod.id == method_id, PaymentMethod.user_id == current_user.id))
+    )
+    method = result.scalar_one_or_none()
     
     if not method:
         raise HTTPException(
@@ -52,14 +72,16 @@ async def get_payment_method(
 async def create_payment_method(
     method_data: PaymentMethodCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Criar novo método de pagamento."""
     # Se for definido como padrão, remover o padrão dos outros
     if method_data.is_default:
-        db.query(PaymentMethod).filter(
-            PaymentMethod.user_id == current_user.id
-        ).update({PaymentMethod.is_default: False})
+        await db.execute(
+            update(PaymentMethod)
+            .where(PaymentMethod.user_id == current_user.id)
+            .values(is_default=False)
+        )
     
     db_method = PaymentMethod(
         user_id=current_user.id,
@@ -67,8 +89,9 @@ async def create_payment_method(
     )
     
     db.add(db_method)
-    db.commit()
-    db.refresh(db_method)
+    await bump_data_version(db, current_user.id)
+    await db.commit()
+    await db.refresh(db_method)
     
     return PaymentMethodResponse.model_validate(db_method)
 
@@ -78,12 +101,13 @@ async def update_payment_method(
     method_id: str,
     method_data: PaymentMethodUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Atualizar método de pagamento."""
-    method = db.query(PaymentMethod).filter(
-        and_(PaymentMethod.id == method_id, PaymentMethod.user_id == current_user.id)
-    ).first()
+    result = await db.execute(
+        select(PaymentMethod).where(and_(PaymentMethod.id == method_id, PaymentMethod.user_id == current_user.id))
+    )
+    method = result.scalar_one_or_none()
     
     if not method:
         raise HTTPException(
@@ -93,17 +117,20 @@ async def update_payment_method(
     
     # Se for definido como padrão, remover o padrão dos outros
     if method_data.is_default:
-        db.query(PaymentMethod).filter(
-            and_(PaymentMethod.user_id == current_user.id, PaymentMethod.id != method_id)
-        ).update({PaymentMethod.is_default: False})
+        await db.execute(
+            update(PaymentMethod)
+            .where(and_(PaymentMethod.user_id == current_user.id, PaymentMethod.id != method_id))
+            .values(is_default=False)
+        )
     
     # Atualizar campos
     update_data = method_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(method, field, value)
     
-    db.commit()
-    db.refresh(method)
+    await bump_data_version(db, current_user.id)
+    await db.commit()
+    await db.refresh(method)
     
     return PaymentMethodResponse.model_validate(method)
 
@@ -112,12 +139,13 @@ async def update_payment_method(
 async def delete_payment_method(
     method_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Deletar método de pagamento."""
-    method = db.query(PaymentMethod).filter(
-        and_(PaymentMethod.id == method_id, PaymentMethod.user_id == current_user.id)
-    ).first()
+    result = await db.execute(
+        select(PaymentMethod).where(and_(PaymentMethod.id == method_id, PaymentMethod.user_id == current_user.id))
+    )
+    method = result.scalar_one_or_none()
     
     if not method:
         raise HTTPException(
@@ -125,8 +153,9 @@ async def delete_payment_method(
             detail="Método de pagamento não encontrado",
         )
     
-    db.delete(method)
-    db.commit()
+    await db.delete(method)
+    await bump_data_version(db, current_user.id)
+    await db.commit()
     
     return None
 
@@ -135,12 +164,13 @@ async def delete_payment_method(
 async def set_default_payment_method(
     method_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Definir método de pagamento como padrão."""
-    method = db.query(PaymentMethod).filter(
-        and_(PaymentMethod.id == method_id, PaymentMethod.user_id == current_user.id)
-    ).first()
+    result = await db.execute(
+        select(PaymentMethod).where(and_(PaymentMethod.id == method_id, PaymentMethod.user_id == current_user.id))
+    )
+    method = result.scalar_one_or_none()
     
     if not method:
         raise HTTPException(
@@ -149,13 +179,16 @@ async def set_default_payment_method(
         )
     
     # Remover padrão dos outros
-    db.query(PaymentMethod).filter(
-        and_(PaymentMethod.user_id == current_user.id, PaymentMethod.id != method_id)
-    ).update({PaymentMethod.is_default: False})
+    await db.execute(
+        update(PaymentMethod)
+        .where(and_(PaymentMethod.user_id == current_user.id, PaymentMethod.id != method_id))
+        .values(is_default=False)
+    )
     
     # Definir como padrão
     method.is_default = True
-    db.commit()
-    db.refresh(method)
+    await bump_data_version(db, current_user.id)
+    await db.commit()
+    await db.refresh(method)
     
     return PaymentMethodResponse.model_validate(method)
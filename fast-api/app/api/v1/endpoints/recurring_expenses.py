@@ -1,14 +1,19 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, select, update
+from pydantic import TypeAdapter
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
 from app.database import get_db
 from app.dependencies import get_current_user
+from app.core.conditional import bump_data_version
 from app.models.user import User
-from app.models.recurring_expense import RecurringExpense, RecurringFrequency
 from app.models.expense import Expense
+from app.models.recurring_expense import RecurringExpense
+from app.core.responses import json_response, schema_columns
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, SortKey, apply_keyset, paginate
+from app.services.recurrence import MAX_GENERATION_DAYS, materialize, reschedule, schedule_next
 from app.schemas.recurring_expense import (
     RecurringExpenseCreate,
     RecurringExpenseUpdate,
@@ -18,33 +23,42 @@ from app.schemas.recurring_expense import (
 
 router = APIRouter(prefix="/recurring-expenses", tags=["Recurring Expenses"])
 
+RECURRING_EXPENSE_SORT = (SortKey(RecurringExpense.name), SortKey(RecurringExpense.id))
+RECURRING_EXPENSE_LIST = TypeAdapter(List[RecurringExpenseResponse])
+RECURRING_EXPENSE_COLUMNS = schema_columns(RecurringExpense, RecurringExpenseResponse)
+
 
 @router.get("", response_model=List[RecurringExpenseResponse])
 async def get_recurring_expenses(
+    response: Response,
     is_active: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    """Listar despesas recorrentes."""
-    query = db.query(RecurringExpense).filter(RecurringExpense.user_id == current_user.id)
+    """Listar despesas recorrentes paginadas (cursor da próxima página no header X-Next-Cursor)."""
+    query = select(*RECURRING_EXPENSE_COLUMNS).where(RecurringExpense.user_id == current_user.id)
     
     if is_active is not None:
-        query = query.filter(RecurringExpense.is_active == is_active)
+        query = query.where(RecurringExpense.is_active == is_active)
     
-    expenses = query.order_by(RecurringExpense.name).all()
-    return [RecurringExpenseResponse.model_validate(exp) for exp in expenses]
+    result = await db.execute(apply_keyset(query, RECURRING_EXPENSE_SORT, cursor, limit))
+    expenses = paginate(result.mappings().all(), RECURRING_EXPENSE_SORT, limit, response)
+    return json_response(RECURRING_EXPENSE_LIST, expenses, response)
 
 
 @router.get("/{expense_id}", response_model=RecurringExpenseResponse)
 async def get_recurring_expense(
     expense_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Buscar despesa recorrente por ID."""
-    expense = db.query(RecurringExpense).filter(
-        and_(RecurringExpense.id == expense_id, RecurringExpense.user_id == current_user.id)
-    ).first()
+    result = await db.execute(
+        select(RecurringExpense).where(and_(RecurringExpense.id == expense_id, RecurringExpense.user_id == current_user.id))
+    )
+    expense = result.scalar_one_or_none()
     
     if not expense:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Despesa recorrente não encontrada")
@@ -56,13 +70,15 @@ async def get_recurring_expense(
 async def create_recurring_expense(
     expense_data: RecurringExpenseCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Criar despesa recorrente."""
     db_expense = RecurringExpense(user_id=current_user.id, **expense_data.model_dump())
+    schedule_next(db_expense, datetime.utcnow().date())
     db.add(db_expense)
-    db.commit()
-    db.refresh(db_expense)
+    await bump_data_version(db, current_user.id)
+    await db.commit()
+    await db.refresh(db_expense)
     return RecurringExpenseResponse.model_validate(db_expense)
 
 
@@ -71,12 +87,13 @@ async def update_recurring_expense(
     expense_id: str,
     expense_data: RecurringExpenseUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Atualizar despesa recorrente."""
-    expense = db.query(RecurringExpense).filter(
-        and_(RecurringExpense.id == expense_id, RecurringExpense.user_id == current_user.id)
-    ).first()
+    result = await db.execute(
+        select(RecurringExpense).where(and_(RecurringExpense.id == expense_id, RecurringExpense.user_id == current_user.id))
+    )
+    expense = result.scalar_one_or_none()
     
     if not expense:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Despesa recorrente não encontrada")
@@ -84,9 +101,11 @@ async def update_recurring_expense(
     update_data = expense_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(expense, field, value)
+    reschedule(expense, datetime.utcnow().date())
     
-    db.commit()
-    db.refresh(expense)
+    await bump_data_version(db, current_user.id)
+    await db.commit()
+    await db.refresh(expense)
     return RecurringExpenseResponse.model_validate(expense)
 
 
@@ -94,18 +113,25 @@ async def update_recurring_expense(
 async def delete_recurring_expense(
     expense_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Deletar despesa recorrente."""
-    expense = db.query(RecurringExpense).filter(
-        and_(RecurringExpense.id == expense_id, RecurringExpense.user_id == current_user.id)
-    ).first()
+    result = await db.execute(
+        select(RecurringExpense).where(and_(RecurringExpense.id == expense_id, RecurringExpense.user_id == current_user.id))
+    )
+    expense = result.scalar_one_or_none()
     
     if not expense:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Despesa recorrente não encontrada")
     
-    db.delete(expense)
-    db.commit()
+    # O SQLite não aplica o ON DELETE SET NULL (foreign_keys fica desligado): desvincular
+    # as despesas geradas, que continuam existindo, antes de remover a recorrência
+    await db.execute(
+        update(Expense).where(Expense.recurring_expense_id == expense.id).values(recurring_expense_id=None)
+    )
+    await db.delete(expense)
+    await bump_data_version(db, current_user.id)
+    await db.commit()
     return None
 
 
@@ -113,19 +139,22 @@ async def delete_recurring_expense(
 async def toggle_active(
     expense_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Ativar/desativar despesa recorrente."""
-    expense = db.query(RecurringExpense).filter(
-        and_(RecurringExpense.id == expense_id, RecurringExpense.user_id == current_user.id)
-    ).first()
+    result = await db.execute(
+        select(RecurringExpense).where(and_(RecurringExpense.id == expense_id, RecurringExpense.user_id == current_user.id))
+    )
+    expense = result.scalar_one_or_none()
     
     if not expense:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Despesa recorrente não encontrada")
     
     expense.is_active = not expense.is_active
-    db.commit()
-    db.refresh(expense)
+    reschedule(expense, datetime.utcnow().date())
+    await bump_data_version(db, current_user.id)
+    await db.commit()
+    await db.refresh(expense)
     return RecurringExpenseResponse.model_validate(expense)
 
 
@@ -134,12 +163,13 @@ async def generate_expenses(
     expense_id: str,
     request: GenerateExpensesRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Gerar despesas a partir da recorrência."""
-    recurring = db.query(RecurringExpense).filter(
-        and_(RecurringExpense.id == expense_id, RecurringExpense.user_id == current_user.id)
-    ).first()
+    result = await db.execute(
+        select(RecurringExpense).where(and_(RecurringExpense.id == expense_id, RecurringExpense.user_id == current_user.id))
+    )
+    recurring = result.scalar_one_or_none()
     
     if not recurring:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Despesa recorrente não encontrada")
@@ -147,31 +177,12 @@ async def generate_expenses(
     start = request.start_date or datetime.utcnow()
     end = request.end_date or start + relativedelta(months=3)
     
-    generated_count = 0
-    current_date = start
-    
-    while current_date <= end:
-        # Criar despesa
-        expense = Expense(
-            user_id=current_user.id,
-            name=recurring.name,
-            value=recurring.value,
-            category=recurring.category,
-            date=current_date,
-            description=recurring.description,
-            payment_method=recurring.payment_method,
-            is_recurring=True,
+    if end - start > timedelta(days=MAX_GENERATION_DAYS):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"O período de geração não pode exceder {MAX_GENERATION_DAYS} dias",
         )
-        db.add(expense)
-        generated_count += 1
-        
-        # Calcular próxima data
-        if recurring.frequency == RecurringFrequency.MONTHLY:
-            current_date += relativedelta(months=1)
-        elif recurring.frequency == RecurringFrequency.YEARLY:
-            current_date += relativedelta(years=1)
-        elif recurring.frequency == RecurringFrequency.WEEKLY:
-            current_date += timedelta(weeks=1)
     
-    db.commit()
-    return {"message": f"{generated_count} despesas geradas com sucesso"}
+    generated_count = await materialize(db, recurring, start, end)
+    await db.commit()
+    return {"message": f"{generated_count} despesas geradas com sucesso", "generated": generated_count}
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -12,10 +12,35 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    
+    # Hash de senhas (bcrypt)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 32
+    PASSWORD_HASH_TARGET_MS: float = 250
+    PASSWORD_HASH_MIN_ROUNDS: int = 10
+    PASSWORD_HASH_MAX_ROUNDS: int = 15
+    PASSWORD_HASH_ROUNDS: Optional[int] = None  # Fixa o custo e dispensa a calibração
     
     # Banco de Dados
     DATABASE_URL: str = "sqlite:///./financial_manager.db"
     
+    # Cache de usuários autenticados
+    USER_CACHE_SIZE: int = 1024
+    USER_CACHE_TTL_SECONDS: float = 60
+    
+    # Agendador de despesas recorrentes
+    SCHEDULER_ENABLED: bool = True
+    SCHEDULER_INTERVAL_SECONDS: int = 60
+    SCHEDULER_BATCH_SIZE: int = 500
+    
+    # Rate limiting (token bucket por usuário e rota)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BURST: float = 30
+    RATE_LIMIT_PER_SECOND: float = 10
+    RATE_LIMIT_BACKEND: str = "sqlite"  # "sqlite" (compartilhado entre workers) ou "memory"
+    RATE_LIMIT_SQLITE_PATH: str = "./rate_limit.db"
+    
     # CORS
     CORS_ORIGINS: List[str] = ["https://financial-manager-nine.vercel.app"]
     
@@ -0,0 +1,74 @@
+import asyncio
+import hashlib
+from typing import Awaitable, Callable, Dict, TypeVar
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Executa uma única vez as chamadas concorrentes com a mesma chave.
+
+    A primeira chamada inicia a tarefa; as seguintes, enquanto ela estiver em
+    andamento, aguardam o mesmo resultado (ou a mesma exceção). A tarefa é
+    protegida com `shield`, para que o cancelamento de quem a iniciou não
+    interrompa os demais.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Marca a exceção como recuperada mesmo se todos os chamadores foram cancelados
+        if not task.cancelled():
+            task.exception()
+
+
+_flights = SingleFlight()
+
+
+def coalesce_key(request: Request) -> str:
+    """Chave da leitura: credencial, validador condicional, caminho e parâmetros normalizados."""
+    raw = "|".join([
+        request.headers.get("authorization", ""),
+        request.headers.get("if-none-match", ""),
+        request.url.path,
+        repr(sorted(request.query_params.multi_items())),
+    ])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class CoalescingRoute(APIRoute):
+    """Rota que agrupa GETs idênticos e concorrentes em uma única execução.
+
+    Só se aplica a rotas GET com `response_model`, cuja resposta JSON é montada por
+    completo e pode ser enviada a todos os chamadores; a chave inclui a credencial,
+    então cada usuário só compartilha resultados consigo mesmo.
+
+    Uso:
+        router = APIRouter(prefix="/expenses", route_class=CoalescingRoute)
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Awaitable[Response]]:
+        handler = super().get_route_handler()
+        if "GET" not in self.methods or self.response_model is None:
+            return handler
+
+        async def coalesced_handler(request: Request) -> Response:
+            return await _flights.do(coalesce_key(request), lambda: handler(request))
+
+        return coalesced_handler
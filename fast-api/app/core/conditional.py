@@ -0,0 +1,53 @@
+from datetime import datetime
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db
+from app.dependencies import get_current_user
+from app.models.user import User
+
+
+async def bump_data_version(db: AsyncSession, *user_ids: str) -> None:
+    """Incrementar a versão dos dados dos usuários; chamar antes do commit da escrita."""
+    if not user_ids:
+        return
+    await db.execute(
+        update(User)
+        .where(User.id.in_(set(user_ids)))
+        # Manter updated_at: a versão muda a cada escrita, o perfil não
+        .values(data_version=User.data_version + 1, updated_at=User.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def build_etag(user_id: str, version: int, now: datetime) -> str:
+    """ETag fraca da versão dos dados; inclui o dia, pois janelas relativas a hoje mudam com a data."""
+    return f'W/"{user_id[:8]}-{version}-{now:%Y%m%d}"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+async def conditional_get(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> None:
+    """Dependência de GET condicional baseada na versão dos dados do usuário.
+
+    Publica o ETag em toda leitura e responde 304 para `If-None-Match` coincidente
+    antes de executar o endpoint, ao custo de uma busca pela chave primária.
+    """
+    if request.method != "GET":
+        return
+
+    result = await db.execute(select(User.data_version).where(User.id == current_user.id))
+    etag = build_etag(current_user.id, result.scalar_one(), datetime.utcnow())
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
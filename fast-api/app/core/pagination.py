@@ -0,0 +1,83 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Mapping, NamedTuple, Optional, Sequence
+from fastapi import HTTPException, Response, status
+from sqlalchemy import DateTime, and_, literal, or_, tuple_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class SortKey(NamedTuple):
+    column: Any
+    descending: bool = False
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Codificar os valores da chave de ordenação em um cursor opaco."""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence[SortKey]) -> List[Any]:
+    """Decodificar um cursor opaco de volta para os valores da chave de ordenação."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError(cursor)
+        return [
+            datetime.fromisoformat(value) if isinstance(key.column.type, DateTime) else value
+            for key, value in zip(keys, values)
+        ]
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor de paginação inválido",
+        )
+
+
+def _after(keys: Sequence[SortKey], values: Sequence[Any]):
+    """Condição que seleciona as linhas posteriores ao cursor na ordem das chaves."""
+    values = [literal(value, key.column.type) for key, value in zip(keys, values)]
+    if all(key.descending == keys[0].descending for key in keys):
+        # Direção única: comparação de row values, que o SQLite resolve pelo índice
+        columns = tuple_(*(key.column for key in keys))
+        bound = tuple_(*values)
+        return columns < bound if keys[0].descending else columns > bound
+
+    # Direções mistas: expandir em (k1 > v1) OR (k1 = v1 AND k2 > v2) ...
+    clauses = []
+    for i, key in enumerate(keys):
+        equal = [keys[j].column == values[j] for j in range(i)]
+        step = key.column < values[i] if key.descending else key.column > values[i]
+        clauses.append(and_(*equal, step))
+    return or_(*clauses)
+
+
+def apply_keyset(query, keys: Sequence[SortKey], cursor: Optional[str], limit: int):
+    """Aplicar ordenação, filtro do cursor e limite (buscando uma linha extra)."""
+    if cursor:
+        query = query.where(_after(keys, decode_cursor(cursor, keys)))
+    order = [key.column.desc() if key.descending else key.column.asc() for key in keys]
+    return query.order_by(*order).limit(limit + 1)
+
+
+def paginate(rows: Sequence[Any], keys: Sequence[SortKey], limit: int, response: Response) -> List[Any]:
+    """Cortar a página e publicar o cursor da próxima no header de resposta.
+
+    Aceita entidades ORM ou linhas de `.mappings()` contendo as colunas da ordenação.
+    """
+    rows = list(rows)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        if isinstance(last, Mapping):
+            values = [last[key.column.key] for key in keys]
+        else:
+            values = [getattr(last, key.column.key) for key in keys]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(values)
+    return rows
@@ -0,0 +1,189 @@
+import asyncio
+import heapq
+import math
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from app.config import settings
+from app.core.security import decode_access_token
+
+
+class MemoryBackend:
+    """Baldes de tokens em memória do processo (um worker).
+
+    Um heap ordenado pelo instante em que cada balde volta a ficar cheio permite
+    descartar baldes ociosos sem varrer o dicionário: cada requisição remove só as
+    entradas já vencidas do topo do heap. Roda direto no event loop, sem threads.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float, float]] = {}  # chave: (tokens, atualizado_em, cheio_em)
+        self._expiry: List[Tuple[float, str]] = []
+
+    async def take(self, key: str, capacity: float, rate: float, cost: float = 1.0) -> float:
+        now = time.monotonic()
+        self._evict(now)
+
+        tokens, updated, _ = self._buckets.get(key, (capacity, now, now))
+        tokens = min(capacity, tokens + (now - updated) * rate)
+        if tokens < cost:
+            return (cost - tokens) / rate
+
+        tokens -= cost
+        full_at = now + (capacity - tokens) / rate
+        self._buckets[key] = (tokens, now, full_at)
+        heapq.heappush(self._expiry, (full_at, key))
+        return 0.0
+
+    def _evict(self, now: float) -> None:
+        while self._expiry and self._expiry[0][0] <= now:
+            full_at, key = heapq.heappop(self._expiry)
+            bucket = self._buckets.get(key)
+            # Entradas antigas do heap são ignoradas se o balde foi usado depois
+            if bucket is not None and bucket[2] == full_at:
+                del self._buckets[key]
+
+
+class SQLiteBackend:
+    """Baldes de tokens em um arquivo SQLite local, compartilhados entre workers.
+
+    Cada consumo é uma transação `BEGIN IMMEDIATE` (leitura + gravação de uma linha
+    pela chave primária). Baldes ociosos são removidos pelo índice de `expires_at`,
+    no máximo uma vez por segundo. As transações rodam em uma thread própria (já são
+    serializadas pelo lock), fora do pool padrão e do executor do bcrypt.
+    """
+
+    SWEEP_INTERVAL_SECONDS = 1.0
+
+    def __init__(self, path: str):
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rate-limit")
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            # Estado descartável: dispensa fsync a cada requisição
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+                "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL, expires_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_rate_limit_buckets_expires_at ON rate_limit_buckets (expires_at)"
+            )
+            self._connection = connection
+        return self._connection
+
+    async def take(self, key: str, capacity: float, rate: float, cost: float = 1.0) -> float:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._take, key, capacity, rate, cost)
+
+    def _take(self, key: str, capacity: float, rate: float, cost: float) -> float:
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                if now >= self._next_sweep:
+                    connection.execute("DELETE FROM rate_limit_buckets WHERE expires_at <= ?", (now,))
+                    self._next_sweep = now + self.SWEEP_INTERVAL_SECONDS
+
+                row = connection.execute(
+                    "SELECT tokens, updated_at FROM rate_limit_buckets WHERE key = ?", (key,)
+                ).fetchone()
+                tokens, updated = row if row else (capacity, now)
+                tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+                if tokens < cost:
+                    connection.execute("COMMIT")
+                    return (cost - tokens) / rate
+
+                tokens -= cost
+                connection.execute(
+                    "INSERT OR REPLACE INTO rate_limit_buckets (key, tokens, updated_at, expires_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, tokens, now, now + (capacity - tokens) / rate),
+                )
+                connection.execute("COMMIT")
+                return 0.0
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+
+def create_backend():
+    """Backend configurado em RATE_LIMIT_BACKEND ("sqlite" ou "memory")."""
+    if settings.RATE_LIMIT_BACKEND == "memory":
+        return MemoryBackend()
+    return SQLiteBackend(settings.RATE_LIMIT_SQLITE_PATH)
+
+
+_default_backend = None
+
+
+def get_default_backend():
+    global _default_backend
+    if _default_backend is None:
+        _default_backend = create_backend()
+    return _default_backend
+
+
+_bearer = HTTPBearer(auto_error=False)
+
+
+class RateLimiter:
+    """Dependência de rate limiting por token bucket, aplicável a rotas ou routers.
+
+    O balde é identificado pelo usuário do token (ou IP do cliente, sem token), pelo
+    método e pelo caminho da rota, e permite rajadas de até `burst` requisições
+    recarregadas a `per_second` tokens por segundo.
+
+    Uso:
+        router = APIRouter(dependencies=[Depends(RateLimiter())])
+    """
+
+    def __init__(
+        self,
+        burst: Optional[float] = None,
+        per_second: Optional[float] = None,
+        scope: Optional[str] = None,
+        backend=None,
+    ):
+        self.burst = burst or settings.RATE_LIMIT_BURST
+        self.per_second = per_second or settings.RATE_LIMIT_PER_SECOND
+        self.scope = scope
+        self.backend = backend
+
+    def _identity(self, request: Request, credentials: Optional[HTTPAuthorizationCredentials]) -> str:
+        if credentials is not None:
+            payload = decode_access_token(credentials.credentials)
+            if payload and payload.get("sub"):
+                return f"user:{payload['sub']}"
+        return f"ip:{request.client.host if request.client else 'unknown'}"
+
+    async def __call__(
+        self,
+        request: Request,
+        credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer),
+    ) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+
+        route = request.scope.get("route")
+        scope = self.scope or f"{request.method}:{getattr(route, 'path', request.url.path)}"
+        key = f"{self._identity(request, credentials)}:{scope}"
+
+        backend = self.backend or get_default_backend()
+        retry_after = await backend.take(key, self.burst, self.per_second)
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Muitas requisições. Aguarde um momento antes de tentar novamente.",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
@@ -0,0 +1,42 @@
+from typing import Any, List, Optional, Type
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def schema_columns(model, schema: Type[BaseModel]) -> List[Any]:
+    """Colunas do modelo ORM que alimentam os campos do schema de resposta.
+
+    `select(*schema_columns(...))` devolve linhas simples em vez de entidades: sem
+    identity map, instrumentação de atributos nem lazy loading. Com `.mappings()`,
+    as linhas vão direto para o `TypeAdapter` do `json_response`.
+    """
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def json_response(
+    adapter: TypeAdapter,
+    content: Any,
+    response: Optional[Response] = None,
+    status_code: int = 200,
+) -> Response:
+    """Validar uma única vez com o `TypeAdapter` e serializar direto para bytes JSON.
+
+    Aceita objetos ORM (via `from_attributes`) ou modelos já construídos. Devolver
+    um `Response` faz o FastAPI pular a revalidação e a serialização do
+    `response_model`, que continua declarado na rota só para a documentação. Os
+    headers definidos no `response` injetado (X-Next-Cursor, ETag) são copiados,
+    pois o FastAPI não os mescla em respostas devolvidas diretamente.
+
+    Uso:
+        EXPENSE_LIST = TypeAdapter(List[ExpenseResponse])
+        return json_response(EXPENSE_LIST, expenses, response)
+    """
+    body = adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+    result = Response(body, status_code=status_code, media_type=JSON_MEDIA_TYPE)
+    if response is not None:
+        result.headers.raw.extend(
+            (name, value) for name, value in response.headers.raw if name != b"content-length"
+        )
+    return result
@@ -1,12 +1,27 @@
+import asyncio
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional, Tuple, TypeVar
+from fastapi import HTTPException, status
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.config import settings
 
+T = TypeVar("T")
+
 # Contexto para hash de senhas
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# O bcrypt libera o GIL, então um pool de threads dedicado executa os hashes em
+# paralelo sem bloquear o event loop
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
+_pending_password_jobs = 0
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verificar se a senha está correta."""
@@ -18,6 +33,57 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def calibrate_password_hashing() -> int:
+    """Escolher o custo do bcrypt para que um hash leve cerca de PASSWORD_HASH_TARGET_MS.
+
+    Mede um hash com o custo mínimo e sobe um nível para cada vez que o tempo cabe
+    dobrado no alvo. Hashes com custo menor passam a ser atualizados no login
+    (`needs_update`). PASSWORD_HASH_ROUNDS fixa o custo e dispensa a medição.
+    """
+    rounds = settings.PASSWORD_HASH_ROUNDS
+    if rounds is None:
+        minimum = settings.PASSWORD_HASH_MIN_ROUNDS
+        start = time.perf_counter()
+        pwd_context.hash("calibration", rounds=minimum)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        extra = math.floor(math.log2(settings.PASSWORD_HASH_TARGET_MS / elapsed_ms)) if elapsed_ms > 0 else 0
+        rounds = min(max(minimum, minimum + extra), settings.PASSWORD_HASH_MAX_ROUNDS)
+
+    pwd_context.update(bcrypt__default_rounds=rounds, bcrypt__min_rounds=rounds)
+    return rounds
+
+
+async def _run_password_job(fn: Callable[..., T], *args) -> T:
+    """Executar um hash no pool dedicado, recusando quando a fila está cheia."""
+    global _pending_password_jobs
+    if _pending_password_jobs >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_QUEUE:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Servidor ocupado. Tente novamente em instantes.",
+            headers={"Retry-After": "1"},
+        )
+
+    _pending_password_jobs += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_password_executor, fn, *args)
+    finally:
+        _pending_password_jobs -= 1
+
+
+async def hash_password(password: str) -> str:
+    """Gerar hash da senha fora do event loop."""
+    return await _run_password_job(pwd_context.hash, password)
+
+
+async def check_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verificar a senha fora do event loop.
+
+    Devolve também um novo hash quando o atual está com custo desatualizado
+    (`needs_update`), para ser gravado no lugar do antigo.
+    """
+    return await _run_password_job(pwd_context.verify_and_update, plain_password, hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Criar token JWT."""
     to_encode = data.copy()
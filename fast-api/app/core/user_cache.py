@@ -0,0 +1,83 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+from sqlalchemy.orm import make_transient_to_detached
+from app.models.user import User
+
+CacheKey = Tuple[str, str]
+
+
+class UserCache:
+    """Cache LRU com TTL dos usuários autenticados, por id de usuário e token.
+
+    Guarda apenas os valores das colunas; cada acerto devolve uma instância nova
+    e destacada da sessão, para que requisições concorrentes não compartilhem o
+    mesmo objeto ORM. O cache é local ao processo: alterações feitas em outro
+    worker só aparecem após o TTL.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[CacheKey, Tuple[float, dict]]" = OrderedDict()
+        self._keys_by_user: Dict[str, Set[CacheKey]] = {}
+
+    @staticmethod
+    def _key(user_id: str, token: str) -> CacheKey:
+        return user_id, hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, user_id: str, token: str) -> Optional[User]:
+        key = self._key(user_id, token)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        user = User(**entry[1])
+        make_transient_to_detached(user)
+        return user
+
+    def set(self, user_id: str, token: str, user: User) -> None:
+        key = self._key(user_id, token)
+        values = {column.key: getattr(user, column.key) for column in User.__table__.columns}
+        self._entries[key] = (time.monotonic() + self.ttl, values)
+        self._entries.move_to_end(key)
+        self._keys_by_user.setdefault(user_id, set()).add(key)
+
+        while len(self._entries) > self.maxsize:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+
+    def invalidate(self, user_id: str) -> None:
+        """Descartar todas as entradas do usuário (todos os tokens)."""
+        for key in self._keys_by_user.pop(user_id, set()):
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._keys_by_user.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _remove(self, key: CacheKey) -> None:
+        self._entries.pop(key, None)
+        keys = self._keys_by_user.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[key[0]]
@@ -6,7 +6,8 @@ def calculate_percentage_change(current: float, previous: float) -> float:
     """Calcular porcentagem de mudança."""
     if previous == 0:
         return 0.0
-    return ((current - previous) / previous) * 100
+    # Base em módulo: com saldo anterior negativo, melhorar continua sendo positivo
+    return ((current - previous) / abs(previous)) * 100
 
 
 def format_currency(value: float) -> str:
@@ -1,26 +1,103 @@
-from sqlalchemy import create_engine
+import os
+from typing import Optional
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
 
-# Criar engine do banco de dados
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+# Revisão que corresponde ao esquema criado pelo antigo Base.metadata.create_all
+BASELINE_REVISION = "0001"
+
+
+def get_async_database_url(url: str) -> str:
+    """Converter a URL do banco para o driver assíncrono equivalente."""
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
+_connect_args = {"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
+
+# Engine síncrona (scripts, migrações e criação de tabelas)
 engine = create_engine(
     settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
+    connect_args=_connect_args,
+    echo=settings.DEBUG,
+)
+
+# Engine assíncrona usada pelos endpoints
+async_engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL),
+    connect_args=_connect_args,
     echo=settings.DEBUG,
 )
 
 # Criar SessionLocal
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Sessões assíncronas não expiram os objetos no commit para evitar lazy loads fora do greenlet
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # Base para os modelos
 Base = declarative_base()
 
 
-# Dependency para obter sessão do banco
-def get_db():
-    db = SessionLocal()
+def get_alembic_config(database_url: Optional[str] = None) -> Config:
+    """Montar a configuração do Alembic apontando para o banco informado."""
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("script_location", os.path.join(os.path.dirname(ALEMBIC_INI), "alembic"))
+    config.set_main_option("sqlalchemy.url", database_url or settings.DATABASE_URL)
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def run_migrations(database_url: Optional[str] = None) -> None:
+    """Aplicar as migrações pendentes (`python -m scripts.migrate`).
+
+    Ao contrário de um `alembic upgrade head` direto, marca na revisão inicial os
+    bancos criados antes do Alembic. Deve rodar uma única vez antes de iniciar os
+    workers, e não em cada um deles.
+    """
+    config = get_alembic_config(database_url)
+    
+    # Bancos criados antes do Alembic já têm as tabelas, mas não a versão; a tabela de
+    # versão pode existir vazia se um `alembic upgrade head` direto já falhou nesse banco
+    migration_engine = create_engine(config.get_main_option("sqlalchemy.url"))
     try:
-        yield db
+        with migration_engine.connect() as connection:
+            tables = inspect(connection).get_table_names()
+            versioned = "alembic_version" in tables and connection.execute(
+                text("SELECT COUNT(*) FROM alembic_version")
+            ).scalar_one() > 0
     finally:
-        db.close()
+        migration_engine.dispose()
+    if "users" in tables and not versioned:
+        command.stamp(config, BASELINE_REVISION)
+    
+    command.upgrade(config, "head")
+
+
+def dialect_insert(db: AsyncSession, table):
+    """INSERT do dialeto da sessão, para usar ON CONFLICT no SQLite ou no PostgreSQL."""
+    if db.bind.dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+
+# Dependency para obter sessão do banco
+async def get_db():
+    async with AsyncSessionLocal() as db:
+        yield db
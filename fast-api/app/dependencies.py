@@ -1,17 +1,23 @@
 from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
 from app.database import get_db
 from app.core.security import decode_access_token
+from app.core.user_cache import UserCache
 from app.models.user import User
 
 security = HTTPBearer()
 
+# Usuários já resolvidos, para que a autenticação não consulte o banco a cada requisição
+user_cache = UserCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> User:
     """Obter usuário atual a partir do token JWT."""
     token = credentials.credentials
@@ -32,7 +38,12 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = user_cache.get(user_id, token)
+    if user is not None:
+        return user
+    
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -40,18 +51,19 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    user_cache.set(user_id, token, user)
     return user
 
 
-def get_optional_current_user(
+async def get_optional_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Optional[User]:
     """Obter usuário atual se autenticado (opcional)."""
     if credentials is None:
         return None
     
     try:
-        return get_current_user(credentials, db)
+        return await get_current_user(credentials, db)
     except HTTPException:
         return None
@@ -1,11 +1,35 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
-from app.database import engine, Base
+from app.database import async_engine
 from app.api.v1.router import api_router
+from app.dependencies import user_cache
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.security import calibrate_password_hashing
+from app.services.scheduler import run_scheduler
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Inicializar e finalizar recursos da aplicação.
+
+    As migrações não rodam aqui, pois cada worker do uvicorn executa o lifespan: aplique-as
+    uma vez antes de subir o servidor (`python -m scripts.migrate`).
+    """
+    # Ajustar o custo do bcrypt ao hardware
+    await asyncio.to_thread(calibrate_password_hashing)
+    
+    # Gerar despesas recorrentes vencidas em segundo plano
+    scheduler = asyncio.create_task(run_scheduler()) if settings.SCHEDULER_ENABLED else None
+    yield
+    if scheduler:
+        scheduler.cancel()
+        with suppress(asyncio.CancelledError):
+            await scheduler
+    await async_engine.dispose()
 
-# Criar tabelas do banco de dados
-Base.metadata.create_all(bind=engine)
 
 # Criar aplicação FastAPI
 app = FastAPI(
@@ -14,6 +38,7 @@ app = FastAPI(
     description="API para gerenciamento financeiro pessoal",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Configurar CORS
@@ -23,6 +48,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "Retry-After", "ETag"],
 )
 
 # Incluir router da API v1
@@ -45,4 +71,5 @@ async def health_check():
     return {
         "status": "healthy",
         "version": settings.API_VERSION,
+        "user_cache": user_cache.stats(),
     }
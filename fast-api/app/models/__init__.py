@@ -1,15 +1,19 @@
 # Importar todos os modelos para garantir que sejam registrados com Base
 from app.models.user import User
 from app.models.expense import Expense
+from app.models.expense_rollup import ExpenseMonthlyRollup
 from app.models.payment_method import PaymentMethod
 from app.models.recurring_expense import RecurringExpense
 from app.models.investment import Investment, InvestmentHistory
+from app.models.refresh_token import RefreshToken
 
 __all__ = [
     "User",
     "Expense",
+    "ExpenseMonthlyRollup",
     "PaymentMethod",
     "RecurringExpense",
     "Investment",
     "InvestmentHistory",
+    "RefreshToken",
 ]
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, String, Float, DateTime, Boolean, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, Float, DateTime, Boolean, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 import enum
 from app.database import Base
@@ -17,6 +17,11 @@ class PaymentMethodType(str, enum.Enum):
 
 class Expense(Base):
     __tablename__ = "expenses"
+    __table_args__ = (
+        Index("ix_expenses_user_id_date_id", "user_id", "date", "id"),
+        Index("ix_expenses_user_id_import_hash", "user_id", "import_hash", unique=True),
+        Index("ix_expenses_recurring_expense_id_date", "recurring_expense_id", "date", unique=True),
+    )
 
     id = Column(String, primary_key=True, default=generate_uuid)
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
@@ -27,6 +32,8 @@ class Expense(Base):
     description = Column(String(500), nullable=True)
     payment_method = Column(SQLEnum(PaymentMethodType), nullable=True)
     is_recurring = Column(Boolean, default=False)
+    import_hash = Column(String(64), nullable=True)  # Deduplicação de extratos importados
+    recurring_expense_id = Column(String, ForeignKey("recurring_expenses.id", ondelete="SET NULL"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, String, Float, Integer, Date, ForeignKey, PrimaryKeyConstraint
+from app.database import Base
+
+
+class ExpenseMonthlyRollup(Base):
+    """Total e quantidade de despesas por usuário, mês e categoria."""
+
+    __tablename__ = "expense_monthly_rollups"
+    __table_args__ = (
+        PrimaryKeyConstraint("user_id", "month", "category"),
+        {"sqlite_with_rowid": False},
+    )
+
+    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    month = Column(Date, nullable=False)  # Primeiro dia do mês
+    category = Column(String(50), nullable=False)
+    total = Column(Float, nullable=False, default=0.0)
+    count = Column(Integer, nullable=False, default=0)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Enum as SQLEnum, Integer
+from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Index, Enum as SQLEnum, Integer
 from sqlalchemy.orm import relationship
 import enum
 from app.database import Base
@@ -18,6 +18,9 @@ class InvestmentType(str, enum.Enum):
 
 class Investment(Base):
     __tablename__ = "investments"
+    __table_args__ = (
+        Index("ix_investments_user_id_purchase_date_id", "user_id", "purchase_date", "id"),
+    )
 
     id = Column(String, primary_key=True, default=generate_uuid)
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
@@ -39,6 +42,10 @@ class Investment(Base):
 
 class InvestmentHistory(Base):
     __tablename__ = "investment_history"
+    __table_args__ = (
+        # Cobre buscas "valor até a data" sem ler a tabela (séries e desempenho)
+        Index("ix_investment_history_investment_id_date_value", "investment_id", "date", "value"),
+    )
 
     id = Column(String, primary_key=True, default=generate_uuid)
     investment_id = Column(String, ForeignKey("investments.id"), nullable=False)
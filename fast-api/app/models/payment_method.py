@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, String, Float, Boolean, ForeignKey, Enum as SQLEnum, Integer, DateTime
+from sqlalchemy import Column, String, Float, Boolean, ForeignKey, Index, Enum as SQLEnum, Integer, DateTime
 from sqlalchemy.orm import relationship
 from app.database import Base
 from app.models.user import generate_uuid
@@ -8,6 +8,9 @@ from app.models.expense import PaymentMethodType
 
 class PaymentMethod(Base):
     __tablename__ = "payment_methods"
+    __table_args__ = (
+        Index("ix_payment_methods_user_id_is_default_name", "user_id", "is_default", "name"),
+    )
 
     id = Column(String, primary_key=True, default=generate_uuid)
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, String, Float, Boolean, ForeignKey, Enum as SQLEnum, Integer, DateTime
+from sqlalchemy import Column, String, Float, Boolean, ForeignKey, Index, Enum as SQLEnum, Integer, DateTime
 from sqlalchemy.orm import relationship
 import enum
 from app.database import Base
@@ -15,6 +15,10 @@ class RecurringFrequency(str, enum.Enum):
 
 class RecurringExpense(Base):
     __tablename__ = "recurring_expenses"
+    __table_args__ = (
+        Index("ix_recurring_expenses_user_id_name", "user_id", "name"),
+        Index("ix_recurring_expenses_next_due_date", "next_due_date"),
+    )
 
     id = Column(String, primary_key=True, default=generate_uuid)
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
@@ -28,6 +32,7 @@ class RecurringExpense(Base):
     is_active = Column(Boolean, default=True)
     start_date = Column(DateTime, nullable=False)
     end_date = Column(DateTime, nullable=True)
+    next_due_date = Column(DateTime, nullable=True)  # Próxima ocorrência a gerar; nula se inativa ou encerrada
     description = Column(String(500), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
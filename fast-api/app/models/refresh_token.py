@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        Index("ix_refresh_tokens_user_id_family_id", "user_id", "family_id"),
+        {"sqlite_with_rowid": False},
+    )
+
+    token_hash = Column(String(64), primary_key=True)  # SHA-256 do token; o token em si não é gravado
+    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    family_id = Column(String(36), nullable=False)  # Tokens rotacionados a partir do mesmo login
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, nullable=True)
+
+    # Relacionamento
+    user = relationship("User", back_populates="refresh_tokens")
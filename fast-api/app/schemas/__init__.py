@@ -5,6 +5,7 @@ from app.schemas.auth import (
     UserUpdate,
     UserResponse,
     ChangePassword,
+    RefreshTokenRequest,
     Token,
     AuthResponse,
 )
@@ -14,6 +15,11 @@ from app.schemas.expense import (
     ExpenseResponse,
     ExpenseFilters,
     ExpenseStats,
+    ExportFormat,
+    ImportFormat,
+    ExpenseImportResult,
+    ExpenseBatchRequest,
+    ExpenseBatchResponse,
     PaymentMethodType,
     Period,
 )
@@ -54,6 +60,7 @@ __all__ = [
     "UserUpdate",
     "UserResponse",
     "ChangePassword",
+    "RefreshTokenRequest",
     "Token",
     "AuthResponse",
     # Expense
@@ -62,6 +69,11 @@ __all__ = [
     "ExpenseResponse",
     "ExpenseFilters",
     "ExpenseStats",
+    "ExportFormat",
+    "ImportFormat",
+    "ExpenseImportResult",
+    "ExpenseBatchRequest",
+    "ExpenseBatchResponse",
     "PaymentMethodType",
     "Period",
     # Payment Method
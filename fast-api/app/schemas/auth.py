@@ -30,6 +30,12 @@ class ChangePassword(BaseModel):
     confirm_new_password: str = Field(..., min_length=8)
 
 
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str = Field(..., alias="refreshToken")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
 class UserResponse(UserBase):
     id: str
     avatar: Optional[str] = None
@@ -47,4 +53,5 @@ class Token(BaseModel):
 class AuthResponse(BaseModel):
     user: UserResponse
     token: str
-    refresh_token: Optional[str] = None
+    # Mesmo nome aceito por RefreshTokenRequest
+    refresh_token: Optional[str] = Field(None, serialization_alias="refreshToken")
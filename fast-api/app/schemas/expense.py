@@ -1,6 +1,7 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Literal, Optional, Union
 from pydantic import BaseModel, Field, ConfigDict
+from typing_extensions import Annotated
 from enum import Enum
 
 
@@ -20,6 +21,21 @@ class Period(str, Enum):
     YEAR = "year"
 
 
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class ImportFormat(str, Enum):
+    CSV = "csv"
+    OFX = "ofx"
+
+
+class ImportAmountSign(str, Enum):
+    NEGATIVE = "negative"  # extrato bancário: despesas negativas, créditos ignorados
+    POSITIVE = "positive"  # planilha de despesas: valores positivos
+
+
 # Expense Schemas
 class ExpenseBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=100)
@@ -72,3 +88,59 @@ class ExpenseStats(BaseModel):
     by_category: dict[str, float]
     by_payment_method: dict[str, float]
     period: Period
+
+
+class ExpenseImportError(BaseModel):
+    line: int
+    message: str
+
+
+class ExpenseImportResult(BaseModel):
+    imported: int
+    duplicates: int
+    skipped: int = 0  # lançamentos com o sinal de crédito (não são despesas)
+    failed: int
+    errors: List[ExpenseImportError]
+
+
+# Batch Schemas
+MAX_BATCH_OPERATIONS = 500
+
+
+class ExpenseBatchCreate(BaseModel):
+    op: Literal["create"]
+    data: ExpenseCreate
+
+
+class ExpenseBatchUpdate(BaseModel):
+    op: Literal["update"]
+    id: str
+    data: ExpenseUpdate
+
+
+class ExpenseBatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: str
+
+
+ExpenseBatchOperation = Annotated[
+    Union[ExpenseBatchCreate, ExpenseBatchUpdate, ExpenseBatchDelete],
+    Field(discriminator="op"),
+]
+
+
+class ExpenseBatchRequest(BaseModel):
+    operations: List[ExpenseBatchOperation] = Field(..., min_length=1, max_length=MAX_BATCH_OPERATIONS)
+
+
+class ExpenseBatchResult(BaseModel):
+    index: int
+    op: str
+    id: Optional[str] = None
+    status: int
+    expense: Optional[ExpenseResponse] = None
+    detail: Optional[str] = None
+
+
+class ExpenseBatchResponse(BaseModel):
+    results: List[ExpenseBatchResult]
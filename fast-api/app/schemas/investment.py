@@ -1,5 +1,5 @@
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import List, Optional
 from pydantic import BaseModel, Field, ConfigDict
 from enum import Enum
 
@@ -81,5 +81,80 @@ class InvestmentHistoryResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class PerformanceMetrics(BaseModel):
+    invested: float
+    current: float
+    twr_percentage: Optional[float] = None  # retorno ponderado pelo tempo, acumulado
+    xirr_percentage: Optional[float] = None  # retorno ponderado pelo dinheiro, anualizado
+
+
+class InvestmentPerformance(PerformanceMetrics):
+    id: str
+    name: str
+    type: InvestmentType
+
+
+class PortfolioPerformance(BaseModel):
+    as_of: datetime
+    portfolio: PerformanceMetrics
+    by_type: dict[str, PerformanceMetrics]
+    investments: List[InvestmentPerformance]
+
+
+class HistoryBucket(str, Enum):
+    AUTO = "auto"
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class HistorySampling(str, Enum):
+    OHLC = "ohlc"
+    LTTB = "lttb"
+
+
+MAX_HISTORY_POINTS = 2000
+DEFAULT_HISTORY_POINTS = 300
+
+
+class InvestmentHistoryPoint(BaseModel):
+    date: datetime
+    value: float
+
+
+class InvestmentHistoryCandle(BaseModel):
+    date: date  # início do bucket
+    open: float
+    high: float
+    low: float
+    close: float
+    count: int
+
+
+class InvestmentHistorySeries(BaseModel):
+    investment_id: str
+    sampling: HistorySampling
+    bucket: Optional[HistoryBucket] = None  # apenas em OHLC
+    bucket_span: int = 1  # buckets por candle (auto junta meses quando nem o mensal cabe)
+    source_points: int
+    points: List[InvestmentHistoryPoint] = []  # LTTB
+    candles: List[InvestmentHistoryCandle] = []  # OHLC
+
+
+class TimeseriesGroup(str, Enum):
+    TYPE = "type"
+    INVESTMENT = "investment"
+
+
+MAX_TIMESERIES_DAYS = 7320  # 20 anos
+
+
+class PortfolioValueSeries(BaseModel):
+    group_by: TimeseriesGroup
+    dates: List[date]
+    total: List[float]
+    series: dict[str, List[float]]  # por tipo ou id do investimento, alinhadas com `dates`
+
+
 class UpdateCurrentValueRequest(BaseModel):
     current_value: float = Field(..., ge=0)
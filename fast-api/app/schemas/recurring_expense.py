@@ -47,6 +47,7 @@ class RecurringExpenseUpdate(BaseModel):
 class RecurringExpenseResponse(RecurringExpenseBase):
     id: str
     user_id: str
+    next_due_date: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
 
@@ -0,0 +1,288 @@
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import and_, case, extract, func, literal, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.expense import Expense
+from app.models.expense_rollup import ExpenseMonthlyRollup
+from app.models.investment import Investment, InvestmentHistory
+from app.schemas.dashboard import (
+    DashboardData,
+    FinancialSummary,
+    RecentTransaction,
+    CategorySpending,
+    MonthlyTrend,
+    FinancialChangePercentage,
+)
+from app.schemas.expense import Period
+from app.core.utils import calculate_percentage_change
+from app.services.rollups import month_start
+
+CATEGORY_COLORS = ["#FF6384", "#36A2EB", "#FFCE56", "#4BC0C0", "#9966FF", "#FF9F40"]
+
+
+def get_period_start(period: Period, end_date: datetime) -> datetime:
+    """Calcular o início da janela do resumo para o período."""
+    if period == Period.DAY:
+        return end_date - timedelta(days=1)
+    if period == Period.WEEK:
+        return end_date - timedelta(weeks=1)
+    if period == Period.MONTH:
+        return end_date - timedelta(days=30)
+    return end_date - timedelta(days=365)
+
+
+def get_previous_period_start(period: Period, end_date: datetime) -> datetime:
+    """Calcular o início da janela anterior, de mesmo tamanho, usada nas variações do resumo."""
+    start = get_period_start(period, end_date)
+    return start - (end_date - start)
+
+
+def get_category_start(period: Period, end_date: datetime) -> datetime:
+    """Calcular o início da janela de gastos por categoria."""
+    if period == Period.MONTH:
+        return end_date - timedelta(days=30)
+    return end_date - timedelta(days=365)
+
+
+def get_trend_start(months: int, end_date: datetime) -> datetime:
+    """Calcular o início da janela da tendência mensal."""
+    return end_date - timedelta(days=30 * months)
+
+
+class DashboardEngine:
+    """Deriva todas as seções do dashboard de um conjunto fixo de consultas agregadas.
+
+    As despesas são agrupadas por (categoria, ano, mês) sobre a maior janela
+    solicitada, com somas condicionais para cada janela: meses completos vêm da
+    tabela de totais mensais e apenas os meses parciais são lidos das despesas.
+    Resumo, gastos por categoria e tendência mensal são montados dessas poucas linhas.
+    A janela anterior do resumo é só mais uma soma condicional, então as variações
+    percentuais não acrescentam consultas.
+    """
+
+    SUMMARY = "summary"
+    PREVIOUS = "previous"
+    CATEGORY = "category"
+    TREND = "trend"
+
+    def __init__(self, db: AsyncSession, user_id: str, now: Optional[datetime] = None):
+        self.db = db
+        self.user_id = user_id
+        self.now = now or datetime.utcnow()
+
+    async def build(self, period: Period, recent_limit: int = 10, trend_months: int = 6) -> DashboardData:
+        """Montar o dashboard completo."""
+        buckets = await self._expense_buckets({
+            self.SUMMARY: get_period_start(period, self.now),
+            self.PREVIOUS: get_previous_period_start(period, self.now),
+            self.CATEGORY: get_category_start(period, self.now),
+            self.TREND: get_trend_start(trend_months, self.now),
+        })
+
+        return DashboardData(
+            summary=self._build_summary(period, buckets, await self._investments_totals(period)),
+            recent_transactions=await self.recent_transactions(recent_limit),
+            category_spending=self._build_category_spending(buckets),
+            monthly_trend=self._build_monthly_trend(buckets),
+        )
+
+    async def summary(self, period: Period) -> FinancialSummary:
+        """Obter apenas o resumo financeiro."""
+        buckets = await self._expense_buckets({
+            self.SUMMARY: get_period_start(period, self.now),
+            self.PREVIOUS: get_previous_period_start(period, self.now),
+        })
+        return self._build_summary(period, buckets, await self._investments_totals(period))
+
+    async def category_spending(self, period: Period) -> List[CategorySpending]:
+        """Obter apenas os gastos por categoria."""
+        buckets = await self._expense_buckets({self.CATEGORY: get_category_start(period, self.now)})
+        return self._build_category_spending(buckets)
+
+    async def monthly_trend(self, months: int) -> List[MonthlyTrend]:
+        """Obter apenas a tendência mensal."""
+        buckets = await self._expense_buckets({self.TREND: get_trend_start(months, self.now)})
+        return self._build_monthly_trend(buckets)
+
+    async def recent_transactions(self, limit: int) -> List[RecentTransaction]:
+        """Obter as transações mais recentes."""
+        # Data já formatada e tipo fixo no SQL: cada linha é exatamente uma RecentTransaction
+        result = await self.db.execute(
+            select(
+                Expense.id,
+                Expense.name,
+                Expense.value,
+                func.strftime("%d/%m/%Y", Expense.date).label("date"),
+                Expense.category,
+                literal("expense").label("type"),
+            )
+            .where(Expense.user_id == self.user_id)
+            .order_by(Expense.date.desc())
+            .limit(limit)
+        )
+        return [RecentTransaction(**row) for row in result.mappings()]
+
+    async def _investments_totals(self, period: Period) -> Tuple[float, float]:
+        """Valor atual da carteira e o valor no início da janela do resumo."""
+        period_start = get_period_start(period, self.now)
+        # Último valor do histórico até o início da janela; sem histórico, o custo
+        value_at_start = (
+            select(InvestmentHistory.value)
+            .where(InvestmentHistory.investment_id == Investment.id, InvestmentHistory.date <= period_start)
+            .order_by(InvestmentHistory.date.desc())
+            .limit(1)
+            .correlate(Investment)
+            .scalar_subquery()
+        )
+        held = Investment.purchase_date <= period_start
+        result = await self.db.execute(
+            select(
+                func.coalesce(func.sum(Investment.current_value), 0.0),
+                func.coalesce(func.sum(case((held, func.coalesce(value_at_start, Investment.value)), else_=0.0)), 0.0),
+            )
+            .where(Investment.user_id == self.user_id)
+        )
+        return tuple(result.one())
+
+    async def _expense_buckets(self, windows: Dict[str, datetime]) -> List[dict]:
+        """Agrupar despesas por (categoria, ano, mês) com totais condicionais por janela.
+
+        Meses inteiramente contidos nas janelas vêm da tabela de totais mensais; só o
+        mês corrente e os meses em que alguma janela começa no meio são lidos das
+        despesas.
+        """
+        current_month = month_start(self.now)
+        partial_months = {current_month} | {
+            month_start(window_start) for window_start in windows.values()
+            if window_start != datetime.combine(month_start(window_start), time.min)
+        }
+        return (
+            await self._raw_buckets(windows, partial_months)
+            + await self._rollup_buckets(windows, partial_months, current_month)
+        )
+
+    async def _raw_buckets(self, windows: Dict[str, datetime], months: Set[date]) -> List[dict]:
+        columns = []
+        for key, window_start in windows.items():
+            in_window = Expense.date >= window_start
+            columns.append(func.sum(case((in_window, Expense.value), else_=0.0)).label(f"{key}_total"))
+            columns.append(func.sum(case((in_window, 1), else_=0)).label(f"{key}_count"))
+
+        # Um intervalo por mês parcial, cada um resolvido pelo índice (user_id, date)
+        first = min(windows.values())
+        ranges = []
+        for month in months:
+            month_begin = datetime.combine(month, time.min)
+            next_month = datetime.combine(month + relativedelta(months=1), time.min)
+            if next_month <= first:
+                continue
+            ranges.append(and_(
+                Expense.user_id == self.user_id,
+                Expense.date >= max(month_begin, first),
+                Expense.date < next_month,
+                Expense.date <= self.now,
+            ))
+        if not ranges:
+            return []
+
+        year = extract("year", Expense.date)
+        month = extract("month", Expense.date)
+        result = await self.db.execute(
+            select(Expense.category, year.label("year"), month.label("month"), *columns)
+            .where(or_(*ranges))
+            .group_by(Expense.category, year, month)
+        )
+        return [row._asdict() for row in result.all()]
+
+    async def _rollup_buckets(self, windows: Dict[str, datetime], partial_months: Set[date], current_month: date) -> List[dict]:
+        # Primeiro mês inteiro de cada janela
+        first_full = {
+            key: month_start(window_start) if month_start(window_start) not in partial_months
+            else month_start(window_start) + relativedelta(months=1)
+            for key, window_start in windows.items()
+        }
+        columns = []
+        for key, first_month in first_full.items():
+            in_window = ExpenseMonthlyRollup.month >= first_month
+            columns.append(func.sum(case((in_window, ExpenseMonthlyRollup.total), else_=0.0)).label(f"{key}_total"))
+            columns.append(func.sum(case((in_window, ExpenseMonthlyRollup.count), else_=0)).label(f"{key}_count"))
+
+        result = await self.db.execute(
+            select(ExpenseMonthlyRollup.category, ExpenseMonthlyRollup.month, *columns)
+            .where(
+                ExpenseMonthlyRollup.user_id == self.user_id,
+                ExpenseMonthlyRollup.month >= min(first_full.values()),
+                ExpenseMonthlyRollup.month < current_month,
+                ExpenseMonthlyRollup.month.not_in(partial_months),
+            )
+            .group_by(ExpenseMonthlyRollup.category, ExpenseMonthlyRollup.month)
+        )
+        buckets = []
+        for row in result.all():
+            bucket = row._asdict()
+            month = bucket.pop("month")
+            bucket["year"], bucket["month"] = month.year, month.month
+            buckets.append(bucket)
+        return buckets
+
+    def _build_summary(self, period: Period, buckets: List[dict], investments: Tuple[float, float]) -> FinancialSummary:
+        total_investments, previous_investments = investments
+        total_expenses = sum(bucket[f"{self.SUMMARY}_total"] for bucket in buckets)
+        # A janela anterior soma tudo desde o seu início: descontar a janela atual
+        previous_expenses = sum(bucket[f"{self.PREVIOUS}_total"] for bucket in buckets) - total_expenses
+        total_income = previous_income = 0.0  # TODO: Implementar quando houver modelo de receitas
+        total_balance = total_income - total_expenses + total_investments
+        previous_balance = previous_income - previous_expenses + previous_investments
+
+        change_percentage = FinancialChangePercentage(
+            balance=calculate_percentage_change(total_balance, previous_balance),
+            income=calculate_percentage_change(total_income, previous_income),
+            expenses=calculate_percentage_change(total_expenses, previous_expenses),
+            investments=calculate_percentage_change(total_investments, previous_investments),
+        )
+
+        return FinancialSummary(
+            total_balance=total_balance,
+            total_income=total_income,
+            total_expenses=total_expenses,
+            total_investments=total_investments,
+            period=period,
+            change_percentage=change_percentage,
+        )
+
+    def _build_category_spending(self, buckets: List[dict]) -> List[CategorySpending]:
+        by_category = {}
+        for bucket in buckets:
+            if bucket[f"{self.CATEGORY}_count"]:
+                category = bucket["category"]
+                by_category[category] = by_category.get(category, 0.0) + bucket[f"{self.CATEGORY}_total"]
+
+        total = sum(by_category.values())
+        categories = []
+        for i, (category, value) in enumerate(sorted(by_category.items(), key=lambda x: x[1], reverse=True)):
+            percentage = (value / total * 100) if total > 0 else 0
+            categories.append(CategorySpending(
+                category=category,
+                value=value,
+                percentage=percentage,
+                color=CATEGORY_COLORS[i % len(CATEGORY_COLORS)],
+            ))
+
+        return categories
+
+    def _build_monthly_trend(self, buckets: List[dict]) -> List[MonthlyTrend]:
+        by_month = {}
+        for bucket in buckets:
+            if bucket[f"{self.TREND}_count"]:
+                month_key = (int(bucket["year"]), int(bucket["month"]))
+                by_month[month_key] = by_month.get(month_key, 0.0) + bucket[f"{self.TREND}_total"]
+
+        return [
+            MonthlyTrend(
+                month=datetime(year, month, 1).strftime("%b/%Y"),
+                income=0.0,
+                expenses=by_month[(year, month)],
+            )
+            for year, month in sorted(by_month.keys())
+        ]
@@ -0,0 +1,132 @@
+from datetime import datetime
+from typing import Dict, Tuple
+from fastapi import status
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.expense import Expense
+from app.core.conditional import bump_data_version
+from app.models.user import generate_uuid
+from app.services.rollups import RollupDeltas
+from app.schemas.expense import (
+    ExpenseBatchCreate,
+    ExpenseBatchDelete,
+    ExpenseBatchRequest,
+    ExpenseBatchResponse,
+    ExpenseBatchResult,
+    ExpenseBatchUpdate,
+    ExpenseResponse,
+)
+
+NOT_FOUND_DETAIL = "Despesa não encontrada"
+
+
+class ExpenseBatch:
+    """Aplica criações, atualizações e exclusões de despesas em uma única transação.
+
+    Cada tipo de operação vira um único comando em massa: um INSERT com várias linhas,
+    um UPDATE por chave primária (executemany) e um DELETE com IN. Dentro do lote as
+    operações são aplicadas nessa ordem; IDs que não pertencem ao usuário resultam em
+    404 no item, sem abortar os demais. Os totais mensais são ajustados na mesma transação.
+    """
+
+    def __init__(self, db: AsyncSession, user_id: str):
+        self.db = db
+        self.user_id = user_id
+
+    async def run(self, request: ExpenseBatchRequest) -> ExpenseBatchResponse:
+        operations = list(enumerate(request.operations))
+        creates = [(i, op) for i, op in operations if isinstance(op, ExpenseBatchCreate)]
+        updates = [(i, op) for i, op in operations if isinstance(op, ExpenseBatchUpdate)]
+        deletes = [(i, op) for i, op in operations if isinstance(op, ExpenseBatchDelete)]
+
+        # Estado atual (data, categoria, valor) das despesas do usuário afetadas pelo lote
+        owned = await self._owned({op.id for _, op in updates + deletes})
+        results: Dict[int, ExpenseBatchResult] = {}
+        rollups = RollupDeltas()
+        now = datetime.utcnow()
+
+        created_rows = []
+        for index, op in creates:
+            row = {
+                **op.data.model_dump(),
+                "id": generate_uuid(),
+                "user_id": self.user_id,
+                "created_at": now,
+                "updated_at": now,
+            }
+            created_rows.append(row)
+            rollups.add(self.user_id, row["date"], row["category"], row["value"])
+            results[index] = ExpenseBatchResult(index=index, op=op.op, id=row["id"], status=status.HTTP_201_CREATED)
+
+        updated_rows = []
+        for index, op in updates:
+            if op.id not in owned:
+                results[index] = self._not_found(index, op)
+                continue
+            changes = op.data.model_dump(exclude_unset=True)
+            updated_rows.append({**changes, "id": op.id, "updated_at": now})
+            current = owned[op.id]
+            rollups.remove(self.user_id, *current)
+            owned[op.id] = current = (
+                changes.get("date", current[0]),
+                changes.get("category", current[1]),
+                changes.get("value", current[2]),
+            )
+            rollups.add(self.user_id, *current)
+            results[index] = ExpenseBatchResult(index=index, op=op.op, id=op.id, status=status.HTTP_200_OK)
+
+        deleted_ids = set()
+        for index, op in deletes:
+            if op.id not in owned or op.id in deleted_ids:
+                results[index] = self._not_found(index, op)
+                continue
+            deleted_ids.add(op.id)
+            rollups.remove(self.user_id, *owned[op.id])
+            results[index] = ExpenseBatchResult(index=index, op=op.op, id=op.id, status=status.HTTP_204_NO_CONTENT)
+
+        if created_rows:
+            await self.db.execute(insert(Expense), created_rows)
+        if updated_rows:
+            await self.db.execute(update(Expense), updated_rows)
+        if deleted_ids:
+            await self.db.execute(
+                delete(Expense).where(Expense.user_id == self.user_id, Expense.id.in_(deleted_ids))
+            )
+        await rollups.apply(self.db)
+        await bump_data_version(self.db, self.user_id)
+        await self.db.commit()
+
+        # Estado final das despesas criadas/atualizadas (que não foram excluídas no mesmo lote)
+        written = {row["id"] for row in created_rows + updated_rows} - deleted_ids
+        expenses = await self._load(written)
+        for result in results.values():
+            if result.id in expenses:
+                result.expense = expenses[result.id]
+
+        return ExpenseBatchResponse(results=[results[index] for index in sorted(results)])
+
+    def _not_found(self, index: int, op) -> ExpenseBatchResult:
+        return ExpenseBatchResult(
+            index=index,
+            op=op.op,
+            id=op.id,
+            status=status.HTTP_404_NOT_FOUND,
+            detail=NOT_FOUND_DETAIL,
+        )
+
+    async def _owned(self, ids: set) -> Dict[str, Tuple[datetime, str, float]]:
+        if not ids:
+            return {}
+        result = await self.db.execute(
+            select(Expense.id, Expense.date, Expense.category, Expense.value)
+            .where(Expense.user_id == self.user_id, Expense.id.in_(ids))
+        )
+        return {row.id: (row.date, row.category, row.value) for row in result.all()}
+
+    async def _load(self, ids: set) -> Dict[str, ExpenseResponse]:
+        if not ids:
+            return {}
+        result = await self.db.execute(
+            select(Expense).where(Expense.user_id == self.user_id, Expense.id.in_(ids))
+        )
+        return {expense.id: ExpenseResponse.model_validate(expense) for expense in result.scalars()}
@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+from datetime import datetime
+from enum import Enum
+from typing import AsyncIterator
+from sqlalchemy import Select, select
+from app.database import AsyncSessionLocal
+from app.models.expense import Expense
+from app.schemas.expense import ExportFormat
+
+# Linhas buscadas do cursor do banco por vez; também é o tamanho de cada chunk enviado
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_COLUMNS = (
+    Expense.id,
+    Expense.name,
+    Expense.value,
+    Expense.category,
+    Expense.date,
+    Expense.description,
+    Expense.payment_method,
+    Expense.is_recurring,
+    Expense.created_at,
+    Expense.updated_at,
+)
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+
+def build_export_query(user_id: str) -> Select:
+    """Consulta base da exportação, apenas com as colunas exportadas."""
+    return select(*EXPORT_COLUMNS).where(Expense.user_id == user_id)
+
+
+def _serialize(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _render_csv(rows, header: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow([column.key for column in EXPORT_COLUMNS])
+    writer.writerows([_serialize(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+
+def _render_ndjson(rows) -> str:
+    keys = [column.key for column in EXPORT_COLUMNS]
+    return "".join(
+        json.dumps({key: _serialize(value) for key, value in zip(keys, row)}, ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+
+async def stream_expenses(query: Select, export_format: ExportFormat) -> AsyncIterator[str]:
+    """Transmitir as despesas em CSV ou NDJSON com memória constante.
+
+    Usa uma sessão própria, para que o cursor continue aberto enquanto a resposta é
+    enviada, e `yield_per` para buscar as linhas do banco em lotes.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+
+        if export_format == ExportFormat.CSV:
+            yield _render_csv([], header=True)
+
+        async for rows in result.partitions():
+            if export_format == ExportFormat.CSV:
+                yield _render_csv(rows, header=False)
+            else:
+                yield _render_ndjson(rows)
@@ -0,0 +1,282 @@
+from datetime import date, datetime, timedelta
+from typing import List, Mapping, Optional, Sequence, Tuple
+import numpy as np
+from fastapi import HTTPException, status
+from sqlalchemy import String, func, select, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.investment import Investment, InvestmentHistory, InvestmentType
+from app.schemas.investment import (
+    HistoryBucket,
+    HistorySampling,
+    InvestmentHistoryCandle,
+    InvestmentHistoryPoint,
+    InvestmentHistorySeries,
+    MAX_TIMESERIES_DAYS,
+    PortfolioValueSeries,
+    TimeseriesGroup,
+)
+
+# Dia juliano de 1970-01-01 00:00 (UTC)
+UNIX_EPOCH_JULIAN_DAY = 2440587.5
+
+
+def bucket_keys(bucket: HistoryBucket, julian_days: np.ndarray) -> np.ndarray:
+    """Primeiro dia do bucket de cada instante (semanas começam na segunda-feira)."""
+    moments = np.round((julian_days - UNIX_EPOCH_JULIAN_DAY) * 86_400_000).astype("datetime64[ms]")
+    days = moments.astype("datetime64[D]")
+    if bucket == HistoryBucket.DAY:
+        return days
+    if bucket == HistoryBucket.WEEK:
+        # 1970-01-01 foi uma quinta-feira: (dia + 3) % 7 é a distância até a segunda anterior
+        return days - (days.astype(np.int64) + 3) % 7
+    return moments.astype("datetime64[M]").astype("datetime64[D]")
+
+
+def epoch_days(julian_days: np.ndarray) -> np.ndarray:
+    """Dia (UTC) de cada instante, contado a partir de 1970-01-01."""
+    return np.floor(julian_days - UNIX_EPOCH_JULIAN_DAY).astype(np.int64)
+
+
+def forward_fill(matrix: np.ndarray) -> np.ndarray:
+    """Repetir em cada linha o último valor não-NaN nas colunas seguintes."""
+    columns = np.where(np.isnan(matrix), 0, np.arange(matrix.shape[1]))
+    np.maximum.accumulate(columns, axis=1, out=columns)
+    return matrix[np.arange(matrix.shape[0])[:, None], columns]
+
+
+def merge_months(keys: np.ndarray, max_points: int) -> Tuple[int, np.ndarray]:
+    """Agrupar chaves mensais em blocos de meses de mesma largura para caber em `max_points`.
+
+    Devolve a largura (em meses) e o primeiro dia do bloco de cada instante.
+    """
+    months = keys.astype("datetime64[M]").astype(np.int64)
+    first = months[0]
+    span = -(-(int(months[-1] - first) + 1) // max_points)
+    merged = first + (months - first) // span * span
+    return span, merged.astype("datetime64[M]").astype("datetime64[D]")
+
+
+def resolve_bucket(bucket: HistoryBucket, julian_days: np.ndarray, max_points: int) -> Tuple[HistoryBucket, int, np.ndarray]:
+    """Bucket usado, quantos buckets cada candle junta e as chaves de cada instante.
+
+    `auto` escolhe o menor bucket que cabe em `max_points`; se nem o mensal couber,
+    junta meses em blocos de mesma largura. Um bucket explícito grande demais é erro.
+    """
+    candidates = [HistoryBucket.DAY, HistoryBucket.WEEK, HistoryBucket.MONTH] if bucket == HistoryBucket.AUTO else [bucket]
+    for candidate in candidates:
+        keys = bucket_keys(candidate, julian_days)
+        if np.count_nonzero(keys[1:] != keys[:-1]) + 1 <= max_points:
+            return candidate, 1, keys
+    if bucket == HistoryBucket.AUTO:
+        span, keys = merge_months(keys, max_points)
+        return HistoryBucket.MONTH, span, keys
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="O intervalo gera mais pontos que max_points; use um bucket maior ou um intervalo menor",
+    )
+
+
+def ohlc(keys: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """(início, abertura, máxima, mínima, fechamento, quantidade) por bucket, com os valores em ordem de tempo."""
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(values)]
+    return (
+        keys[starts],
+        values[starts],
+        np.maximum.reduceat(values, starts),
+        np.minimum.reduceat(values, starts),
+        values[ends - 1],
+        ends - starts,
+    )
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Índices escolhidos pelo Largest-Triangle-Three-Buckets.
+
+    Mantém o primeiro e o último ponto e, em cada um dos `threshold - 2` buckets
+    intermediários, o ponto que forma o maior triângulo com o ponto escolhido no
+    bucket anterior e a média do seguinte. O laço percorre apenas os buckets; as
+    áreas de cada bucket são calculadas de forma vetorizada.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[hi:next_hi].mean()
+        avg_y = y[hi:next_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+
+def downsample_rows(rows: Sequence[Mapping], max_points: int) -> List[Mapping]:
+    """Reduzir registros do histórico (em ordem decrescente de data) a `max_points` via LTTB.
+
+    Os registros escolhidos são devolvidos inteiros e na mesma ordem, para manter o
+    formato da listagem.
+    """
+    if len(rows) <= max_points:
+        return list(rows)
+    chronological = rows[::-1]
+    x = np.array([row["date"].timestamp() for row in chronological])
+    y = np.array([row["value"] for row in chronological], dtype=np.float64)
+    return [chronological[index] for index in lttb(x, y, max_points)[::-1]]
+
+class HistorySeries:
+    """Séries reduzidas do histórico de um investimento para gráficos.
+
+    Uma única consulta busca apenas (tempo, valor) do intervalo, pelo índice
+    (investment_id, date); OHLC por bucket e LTTB são calculados de forma
+    vetorizada, e a resposta fica limitada a `max_points` pontos qualquer que seja
+    o tamanho do histórico.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        investment_id: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ):
+        self.db = db
+        self.investment_id = investment_id
+        self.filters = [InvestmentHistory.investment_id == investment_id]
+        if start_date:
+            self.filters.append(InvestmentHistory.date >= start_date)
+        if end_date:
+            self.filters.append(InvestmentHistory.date <= end_date)
+
+    async def build(self, sampling: HistorySampling, bucket: HistoryBucket, max_points: int) -> InvestmentHistorySeries:
+        # Tempo como número (julianday) para o cálculo; a data original só é necessária no LTTB
+        columns = [func.julianday(InvestmentHistory.date), InvestmentHistory.value]
+        if sampling == HistorySampling.LTTB:
+            columns.append(type_coerce(InvestmentHistory.date, String))
+        result = await self.db.execute(select(*columns).where(*self.filters).order_by(InvestmentHistory.date))
+        rows = result.all()
+
+        series = InvestmentHistorySeries(investment_id=self.investment_id, sampling=sampling, source_points=len(rows))
+        if not rows:
+            return series
+
+        x = np.fromiter((row[0] for row in rows), dtype=np.float64, count=len(rows))
+        y = np.fromiter((row[1] for row in rows), dtype=np.float64, count=len(rows))
+        if sampling == HistorySampling.OHLC:
+            series.bucket, series.bucket_span, keys = resolve_bucket(bucket, x, max_points)
+            series.candles = [
+                InvestmentHistoryCandle(date=start, open=o, high=high, low=low, close=c, count=n)
+                for start, o, high, low, c, n in zip(*(column.tolist() for column in ohlc(keys, y)))
+            ]
+        else:
+            series.points = [
+                InvestmentHistoryPoint(date=datetime.fromisoformat(rows[i][2]), value=y[i])
+                for i in lttb(x, y, max_points)
+            ]
+        return series
+
+
+class PortfolioTimeseries:
+    """Valor diário da carteira, total e por tipo ou por investimento.
+
+    Todo o histórico do usuário até o fim do intervalo vem de uma única consulta
+    ordenada por (investment_id, date), coberta pelo índice do histórico. O
+    valor de cada posição em cada dia é o último conhecido até aquele dia (merge
+    "as-of"): o custo a partir do aporte, substituído pelos pontos do histórico
+    e repetido nos dias sem atualização. Antes do aporte a posição vale zero.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        user_id: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ):
+        self.db = db
+        self.user_id = user_id
+        self.start_date = start_date
+        self.end_date = end_date or datetime.utcnow().date()
+
+    async def build(self, group_by: TimeseriesGroup) -> PortfolioValueSeries:
+        series = PortfolioValueSeries(group_by=group_by, dates=[], total=[], series={})
+        if self.start_date and self.start_date > self.end_date:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="start_date deve ser anterior ou igual a end_date",
+            )
+
+        # Tudo até o fim do último dia do intervalo
+        until = datetime.combine(self.end_date + timedelta(days=1), datetime.min.time())
+        result = await self.db.execute(
+            select(Investment.id, Investment.type, Investment.value, func.julianday(Investment.purchase_date))
+            .where(Investment.user_id == self.user_id, Investment.purchase_date < until)
+            .order_by(Investment.purchase_date, Investment.id)
+        )
+        positions = result.all()
+        if not positions:
+            return series
+
+        n = len(positions)
+        purchased = epoch_days(np.fromiter((row[3] for row in positions), dtype=np.float64, count=n))
+        end = (self.end_date - date(1970, 1, 1)).days
+        start = (self.start_date - date(1970, 1, 1)).days if self.start_date else int(purchased.min())
+        days = end - start + 1
+        if days > MAX_TIMESERIES_DAYS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"O intervalo não pode passar de {MAX_TIMESERIES_DAYS} dias",
+            )
+
+        result = await self.db.execute(
+            select(InvestmentHistory.investment_id, func.julianday(InvestmentHistory.date), InvestmentHistory.value)
+            .join(Investment, Investment.id == InvestmentHistory.investment_id)
+            # Mesmas posições da consulta acima: investimentos com aporte depois do intervalo
+            # já têm o ponto gravado na criação, mas ficam fora da série
+            .where(
+                Investment.user_id == self.user_id,
+                Investment.purchase_date < until,
+                InvestmentHistory.date < until,
+            )
+            .order_by(InvestmentHistory.investment_id, InvestmentHistory.date)
+        )
+        history = result.all()
+
+        # Posições x dias; o que vem antes do intervalo cai na primeira coluna
+        values = np.full((n, days), np.nan)
+        rows = np.arange(n)
+        purchase_columns = np.clip(purchased - start, 0, None)
+        values[rows, purchase_columns] = np.fromiter((row[2] for row in positions), dtype=np.float64, count=n)
+        if history:
+            index = {row[0]: i for i, row in enumerate(positions)}
+            m = len(history)
+            owners = np.fromiter((index[row[0]] for row in history), dtype=np.intp, count=m)
+            history_days = epoch_days(np.fromiter((row[1] for row in history), dtype=np.float64, count=m))
+            columns = np.clip(history_days - start, 0, None)
+            # Último ponto de cada (posição, dia), ignorando pontos anteriores ao aporte
+            last = np.r_[(owners[1:] != owners[:-1]) | (columns[1:] != columns[:-1]), True]
+            last &= history_days >= purchased[owners]
+            values[owners[last], columns[last]] = np.fromiter((row[2] for row in history), dtype=np.float64, count=m)[last]
+        values = np.nan_to_num(forward_fill(values))
+
+        if group_by == TimeseriesGroup.INVESTMENT:
+            keys, grouped = [row[0] for row in positions], values
+        else:
+            types = list(InvestmentType)
+            type_index = np.fromiter((types.index(row[1]) for row in positions), dtype=np.intp, count=n)
+            present = np.unique(type_index)
+            keys = [types[t].value for t in present.tolist()]
+            grouped = (type_index == present[:, None]).astype(np.float64) @ values
+
+        series.dates = np.arange(start, end + 1).astype("datetime64[D]").tolist()
+        series.total = values.sum(axis=0).tolist()
+        series.series = dict(zip(keys, grouped.tolist()))
+        return series
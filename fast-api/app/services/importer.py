@@ -0,0 +1,331 @@
+import csv
+import hashlib
+import re
+from datetime import datetime
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Tuple
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from app.core.conditional import bump_data_version
+from app.database import dialect_insert
+from app.models.expense import Expense
+from app.services.rollups import RollupDeltas
+from app.schemas.expense import (
+    ExpenseCreate,
+    ExpenseImportError,
+    ExpenseImportResult,
+    ImportAmountSign,
+    ImportFormat,
+)
+
+# Linhas validadas e inseridas por transação
+IMPORT_BATCH_SIZE = 5000
+# Quantidade máxima de erros detalhados na resposta
+MAX_REPORTED_ERRORS = 100
+
+_expense_batch_adapter = TypeAdapter(List[ExpenseCreate])
+
+# Cabeçalhos aceitos no CSV (em minúsculas) para cada campo de ExpenseCreate
+CSV_HEADER_ALIASES = {
+    "name": ("name", "nome", "descrição", "descricao", "histórico", "historico", "lançamento", "lancamento"),
+    "value": ("value", "valor", "amount", "montante"),
+    "category": ("category", "categoria"),
+    "date": ("date", "data"),
+    "description": ("description", "observação", "observacao", "memo"),
+    "payment_method": ("payment_method", "método de pagamento", "metodo de pagamento"),
+}
+
+_OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+_OFX_DATE = re.compile(r"(\d{8})(\d{6})?(?:\.\d+)?(?:\[.*\])?$")
+_AMOUNT = re.compile(r"[-+]?\d+(?:\.\d+)?")
+_DOT_THOUSANDS = re.compile(r"^[-+]?[1-9]\d{0,2}\.\d{3}$")
+
+
+def parse_amount(raw: str) -> float:
+    """Converter valores como "-1.234,56", "R$ 45,90", "45.90" ou "1,234.56" para float.
+
+    Com os dois separadores, o último é o decimal e o outro é o de milhar. Com um só,
+    segue o padrão brasileiro: a vírgula é decimal e o ponto seguido de exatamente três
+    dígitos ("1.234", "1.234.567") é de milhar; nos demais casos ("45.90") o ponto é decimal.
+    Um separador repetido ("1,234,567") é sempre de milhar.
+    """
+    text = raw.strip().replace("R$", "").replace(" ", "")
+    if "," in text and "." in text:
+        decimal = "," if text.rfind(",") > text.rfind(".") else "."
+    elif text.count(",") > 1:
+        decimal = "."
+    elif text.count(".") > 1 or _DOT_THOUSANDS.search(text):
+        decimal = ","
+    else:
+        decimal = "," if "," in text else "."
+    thousands = "." if decimal == "," else ","
+    text = text.replace(thousands, "").replace(decimal, ".")
+    if not _AMOUNT.fullmatch(text):
+        raise ValueError(f"Valor inválido: {raw}")
+    return float(text)
+
+
+def parse_statement_date(raw: str) -> datetime:
+    """Converter datas ISO, dd/mm/aaaa ou OFX (aaaammdd[hhmmss]) para datetime."""
+    text = raw.strip()
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        pass
+    ofx_date = _OFX_DATE.match(text)
+    if ofx_date:
+        return datetime.strptime(ofx_date.group(1) + (ofx_date.group(2) or "000000"), "%Y%m%d%H%M%S")
+    for fmt in ("%d/%m/%Y", "%d/%m/%Y %H:%M", "%d/%m/%y"):
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    raise ValueError(f"Data inválida: {raw}")
+
+
+def _row_hash(row: dict, occurrence: int) -> str:
+    """Hash do conteúdo da linha; `occurrence` diferencia linhas idênticas no mesmo arquivo."""
+    if row.get("fitid"):
+        content = f"ofx|{row['fitid']}"
+    else:
+        content = "|".join([
+            row["date"].isoformat(),
+            f"{row['value']:.2f}",
+            row["name"].strip().lower(),
+            (row.get("description") or "").strip().lower(),
+            str(occurrence),
+        ])
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def iter_csv_rows(stream: IO[str], default_category: str) -> Iterator[Tuple[int, dict]]:
+    """Ler um CSV linha a linha, devolvendo (número da linha, dados da despesa)."""
+    first_line = stream.readline()
+    delimiter = max(",;\t", key=first_line.count)
+    header = next(csv.reader([first_line], delimiter=delimiter), [])
+    columns = {}
+    for index, title in enumerate(header):
+        for field, aliases in CSV_HEADER_ALIASES.items():
+            if title.strip().lower() in aliases and field not in columns:
+                columns[field] = index
+
+    for line, values in enumerate(csv.reader(stream, delimiter=delimiter), start=2):
+        if not any(value.strip() for value in values):
+            continue
+        row = {field: values[index] for field, index in columns.items() if index < len(values)}
+        row.setdefault("category", default_category)
+        if not row.get("category"):
+            row["category"] = default_category
+        yield line, row
+
+
+def iter_ofx_rows(stream: IO[str], default_category: str) -> Iterator[Tuple[int, dict]]:
+    """Ler as transações (STMTTRN) de um extrato OFX sem carregar o arquivo inteiro."""
+    transaction = None
+    start_line = 0
+    for line, text in enumerate(stream, start=1):
+        for closing, tag, value in _OFX_TAG.findall(text):
+            tag = tag.upper()
+            if tag == "STMTTRN":
+                if closing and transaction is not None:
+                    yield start_line, _ofx_transaction(transaction, default_category)
+                    transaction = None
+                elif not closing:
+                    transaction = {}
+                    start_line = line
+            elif transaction is not None and not closing:
+                transaction[tag] = value.strip()
+
+
+def iter_statement_rows(stream: IO[str], import_format: ImportFormat, default_category: str) -> Iterator[Tuple[int, dict]]:
+    """Escolher o leitor do extrato conforme o formato."""
+    if import_format == ImportFormat.OFX:
+        return iter_ofx_rows(stream, default_category)
+    return iter_csv_rows(stream, default_category)
+
+
+def detect_encoding(raw: IO[bytes]) -> str:
+    """Extratos de bancos brasileiros costumam vir em UTF-8 ou Windows-1252."""
+    sample = raw.read(64 * 1024)
+    raw.seek(0)
+    try:
+        sample.decode("utf-8")
+        return "utf-8-sig"
+    except UnicodeDecodeError as e:
+        # Um caractere multibyte cortado no fim da amostra não invalida o UTF-8
+        return "utf-8-sig" if e.start >= len(sample) - 3 else "cp1252"
+
+
+def _ofx_transaction(transaction: dict, default_category: str) -> dict:
+    amount = transaction.get("TRNAMT", "")
+    memo = transaction.get("MEMO")
+    return {
+        "name": transaction.get("NAME") or memo or "Transação importada",
+        "value": amount,
+        "date": transaction.get("DTPOSTED", ""),
+        "description": memo if transaction.get("NAME") else None,
+        "category": default_category,
+        "fitid": transaction.get("FITID"),
+    }
+
+
+def _normalize(row: dict) -> dict:
+    """Converter os textos brutos do extrato para os tipos esperados por ExpenseCreate."""
+    normalized = dict(row)
+    if isinstance(row.get("value"), str) and row["value"].strip():
+        normalized["value"] = parse_amount(row["value"])
+    if isinstance(row.get("date"), str) and row["date"].strip():
+        normalized["date"] = parse_statement_date(row["date"])
+    for field in ("description", "payment_method"):
+        if isinstance(normalized.get(field), str) and not normalized[field].strip():
+            normalized[field] = None
+    return normalized
+
+
+def _batches(rows: Iterable[Tuple[int, dict]], size: int) -> Iterator[List[Tuple[int, dict]]]:
+    batch = []
+    for item in rows:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class ExpenseImporter:
+    """Importa extratos em lotes: valida, remove duplicatas por hash e insere em massa.
+
+    `amount_sign` indica o sinal das despesas no arquivo; lançamentos com o sinal
+    oposto (créditos, estornos, salário) e valores zerados são ignorados e contados
+    em `skipped`. Extratos OFX sempre usam débitos negativos.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        user_id: str,
+        amount_sign: ImportAmountSign = ImportAmountSign.NEGATIVE,
+        batch_size: int = IMPORT_BATCH_SIZE,
+    ):
+        self.db = db
+        self.user_id = user_id
+        self.amount_sign = amount_sign
+        self.batch_size = batch_size
+        self.imported = 0
+        self.duplicates = 0
+        self.skipped = 0
+        self.failed = 0
+        self.errors: List[ExpenseImportError] = []
+        self._occurrences = {}
+
+    async def run(self, rows: Iterable[Tuple[int, dict]]) -> ExpenseImportResult:
+        batches = _batches(rows, self.batch_size)
+        while True:
+            # Ler o arquivo, converter e validar o lote fora do event loop; só a escrita roda nele
+            candidates = await run_in_threadpool(self._prepare_next_batch, batches)
+            if candidates is None:
+                break
+            await self._insert(candidates)
+
+        return ExpenseImportResult(
+            imported=self.imported,
+            duplicates=self.duplicates,
+            skipped=self.skipped,
+            failed=self.failed,
+            errors=self.errors,
+        )
+
+    def _fail(self, line: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(ExpenseImportError(line=line, message=message))
+
+    def _prepare_next_batch(self, batches: Iterator[List[Tuple[int, dict]]]) -> Optional[Dict[str, dict]]:
+        """Ler o próximo lote e devolver as despesas válidas por hash, ou None no fim do arquivo."""
+        batch = next(batches, None)
+        if batch is None:
+            return None
+
+        lines, raw_rows = [], []
+        for line, row in batch:
+            try:
+                normalized = _normalize(row)
+            except ValueError as e:
+                self._fail(line, str(e))
+                continue
+            value = normalized.get("value")
+            if isinstance(value, float):
+                if self.amount_sign == ImportAmountSign.NEGATIVE:
+                    value = -value
+                if value <= 0:
+                    self.skipped += 1
+                    continue
+                normalized["value"] = value
+            raw_rows.append(normalized)
+            lines.append(line)
+
+        # Validar o lote inteiro de uma vez; só revalida o restante se houver erros
+        try:
+            expenses = _expense_batch_adapter.validate_python(raw_rows)
+        except ValidationError as e:
+            invalid = {}
+            for error in e.errors():
+                field = ".".join(str(part) for part in error["loc"][1:])
+                invalid.setdefault(error["loc"][0], f"{field}: {error['msg']}")
+            for index, message in sorted(invalid.items()):
+                self._fail(lines[index], message)
+            keep = [index for index in range(len(raw_rows)) if index not in invalid]
+            lines = [lines[index] for index in keep]
+            raw_rows = [raw_rows[index] for index in keep]
+            expenses = _expense_batch_adapter.validate_python(raw_rows)
+
+        candidates = {}
+        for row, model in zip(raw_rows, expenses):
+            expense = model.model_dump()
+            occurrence_key = (expense["date"], expense["value"], expense["name"], expense["description"])
+            occurrence = self._occurrences.get(occurrence_key, 0)
+            self._occurrences[occurrence_key] = occurrence + 1
+            import_hash = _row_hash({**expense, "fitid": row.get("fitid")}, occurrence)
+            if import_hash in candidates:
+                self.duplicates += 1
+                continue
+            candidates[import_hash] = {**expense, "user_id": self.user_id, "import_hash": import_hash}
+        return candidates
+
+    async def _insert(self, candidates: Dict[str, dict]) -> None:
+        if not candidates:
+            return
+
+        result = await self.db.execute(
+            select(Expense.import_hash).where(
+                Expense.user_id == self.user_id,
+                Expense.import_hash.in_(candidates.keys()),
+            )
+        )
+        for existing in result.scalars():
+            candidates.pop(existing, None)
+            self.duplicates += 1
+
+        if not candidates:
+            return
+
+        # Importações simultâneas do mesmo extrato passam juntas pela consulta acima: o
+        # índice único (user_id, import_hash) descarta a segunda cópia, e só as linhas
+        # de fato inseridas (RETURNING) alimentam os totais mensais
+        result = await self.db.execute(
+            dialect_insert(self.db, Expense)
+            .on_conflict_do_nothing(index_elements=["user_id", "import_hash"])
+            .returning(Expense.user_id, Expense.date, Expense.category, Expense.value),
+            list(candidates.values()),
+        )
+        inserted = [row._asdict() for row in result.all()]
+        self.duplicates += len(candidates) - len(inserted)
+        if inserted:
+            rollups = RollupDeltas()
+            rollups.add_rows(inserted)
+            await rollups.apply(self.db)
+            await bump_data_version(self.db, self.user_id)
+        await self.db.commit()
+        self.imported += len(inserted)
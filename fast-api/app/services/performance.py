@@ -0,0 +1,216 @@
+from datetime import datetime
+from typing import Optional, Tuple
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.investment import Investment, InvestmentHistory, InvestmentType
+from app.schemas.investment import (
+    InvestmentPerformance,
+    PerformanceMetrics,
+    PortfolioPerformance,
+)
+
+DAYS_PER_YEAR = 365.0
+# Dia juliano de 1970-01-01 00:00 (UTC)
+UNIX_EPOCH_JULIAN_DAY = 2440587.5
+
+
+def xirr(groups: np.ndarray, years: np.ndarray, amounts: np.ndarray, group_count: int,
+         iterations: int = 50, tolerance: float = 1e-10) -> np.ndarray:
+    """Taxa anual que zera o valor presente dos fluxos de cada grupo (NaN quando não há solução).
+
+    Os fluxos de todos os grupos ficam em vetores planos (grupo, tempo em anos,
+    valor); cada iteração de Newton calcula f(r) e f'(r) de todos os fluxos de
+    uma vez e soma por grupo com `bincount`, resolvendo todos os grupos juntos.
+    """
+    start = np.full(group_count, np.inf)
+    np.minimum.at(start, groups, years)
+    t = years - start[groups]
+
+    rate = np.full(group_count, 0.1)
+    active = np.ones(group_count, dtype=bool)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for _ in range(iterations):
+            base = 1.0 + rate[groups]
+            discounted = amounts * base ** -t
+            f = np.bincount(groups, discounted, group_count)
+            df = np.bincount(groups, -t * discounted / base, group_count)
+            step = np.where(active, f / df, 0.0)
+            rate = np.maximum(rate - step, -0.999999)
+            active &= ~(np.abs(step) <= tolerance)
+            if not active.any():
+                break
+
+        # Aceitar só as taxas que de fato zeram o valor presente (fluxos de um único sinal não têm solução)
+        residual = np.bincount(groups, amounts * (1.0 + rate[groups]) ** -t, group_count)
+        scale = np.bincount(groups, np.abs(amounts), group_count)
+        solved = ~active & np.isfinite(rate) & (np.abs(residual) <= 1e-6 * scale)
+    return np.where(solved, rate, np.nan)
+
+
+def chain_linked_return(values: np.ndarray, flows: np.ndarray) -> np.ndarray:
+    """Retorno ponderado pelo tempo de cada linha, a partir dos valores nas datas de aporte.
+
+    `values[:, k]` é o valor da carteira na data k já incluindo o aporte `flows[:, k]`;
+    cada subperíodo rende (valor - aporte) / valor anterior, e os retornos são
+    encadeados. Subperíodos antes do primeiro aporte (valor anterior zero) são neutros.
+    """
+    previous = values[:, :-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = np.where(previous > 0, (values[:, 1:] - flows[:, 1:]) / previous, 1.0)
+    return ratios.prod(axis=1) - 1.0
+
+
+def _percentage(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value) * 100
+
+
+class PerformanceEngine:
+    """Retornos TWR e XIRR por investimento, por tipo e da carteira.
+
+    Os únicos fluxos de caixa do modelo são os aportes (`value` em
+    `purchase_date`). Uma consulta busca as posições e outra todo o histórico do
+    usuário posterior a cada aporte, ordenado depois por (posição, data). O TWR de
+    cada investimento encadeia os subperíodos entre os pontos do seu histórico,
+    terminando em `current_value` na data atual. O de cada tipo e o da carteira
+    encadeiam os subperíodos entre as datas de aporte: o valor de cada grupo numa
+    data é a soma acumulada das variações (aporte e atualizações do histórico) até
+    ela, localizada com `np.searchsorted`.
+    """
+
+    def __init__(self, db: AsyncSession, user_id: str, now: Optional[datetime] = None):
+        self.db = db
+        self.user_id = user_id
+        self.now = now or datetime.utcnow()
+
+    async def build(self) -> PortfolioPerformance:
+        result = await self.db.execute(
+            select(
+                Investment.id,
+                Investment.name,
+                Investment.type,
+                Investment.value,
+                Investment.current_value,
+                func.julianday(Investment.purchase_date),
+            )
+            .where(Investment.user_id == self.user_id)
+            .order_by(Investment.purchase_date, Investment.id)
+        )
+        positions = result.all()
+        empty = PerformanceMetrics(invested=0.0, current=0.0)
+        if not positions:
+            return PortfolioPerformance(as_of=self.now, portfolio=empty, by_type={}, investments=[])
+
+        types = list(InvestmentType)
+        n, type_count = len(positions), len(types)
+        type_index = np.fromiter((types.index(row[2]) for row in positions), dtype=np.intp, count=n)
+        invested = np.fromiter((row[3] for row in positions), dtype=np.float64, count=n)
+        current = np.fromiter((row[4] for row in positions), dtype=np.float64, count=n)
+        purchased = np.fromiter((row[5] for row in positions), dtype=np.float64, count=n)
+        now = (self.now - datetime(1970, 1, 1)).total_seconds() / 86_400 + UNIX_EPOCH_JULIAN_DAY
+
+        # Grupos: cada investimento, cada tipo e a carteira (último)
+        portfolio = n + type_count
+        group_count = portfolio + 1
+        # Cada posição contribui com o aporte e o valor atual para os seus três grupos
+        members = np.concatenate([np.arange(n), n + type_index, np.full(n, portfolio)])
+        invested_totals = np.bincount(members, np.tile(invested, 3), group_count)
+        current_totals = np.bincount(members, np.tile(current, 3), group_count)
+
+        groups = np.concatenate([members, members])
+        years = np.concatenate([np.tile(purchased, 3), np.full(3 * n, now)]) / DAYS_PER_YEAR
+        amounts = np.concatenate([np.tile(-invested, 3), np.tile(current, 3)])
+        rates = xirr(groups, years, amounts, group_count)
+
+        owners, times, values, previous = await self._history(positions, invested)
+        twr = np.empty(group_count)
+        twr[:n] = self._position_twr(owners, values, previous, invested, current)
+        twr[n:] = self._grouped_twr(type_count, type_index, invested, current, purchased, owners, times, values - previous)
+
+        def metrics(g: int) -> dict:
+            return {
+                "invested": float(invested_totals[g]),
+                "current": float(current_totals[g]),
+                "twr_percentage": _percentage(twr[g]),
+                "xirr_percentage": _percentage(rates[g]),
+            }
+
+        return PortfolioPerformance(
+            as_of=self.now,
+            portfolio=PerformanceMetrics(**metrics(portfolio)),
+            by_type={
+                types[t].value: PerformanceMetrics(**metrics(n + t))
+                for t in np.unique(type_index).tolist()
+            },
+            investments=[
+                InvestmentPerformance(id=row[0], name=row[1], type=row[2], **metrics(i))
+                for i, row in enumerate(positions)
+            ],
+        )
+
+    async def _history(self, positions, invested: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """(posição, dia juliano, valor, valor anterior) de cada ponto do histórico após o aporte até agora.
+
+        Os pontos vêm ordenados por posição e data; o valor anterior do primeiro ponto de
+        cada posição é o próprio aporte.
+        """
+        # Consulta só de colunas: executada direto na conexão da sessão, sem a camada do ORM,
+        # que custa mais que a própria leitura quando o histórico tem dezenas de milhares de pontos
+        connection = await self.db.connection()
+        result = await connection.execute(
+            select(InvestmentHistory.investment_id, func.julianday(InvestmentHistory.date), InvestmentHistory.value)
+            .join(Investment, Investment.id == InvestmentHistory.investment_id)
+            .where(
+                Investment.user_id == self.user_id,
+                InvestmentHistory.date > Investment.purchase_date,
+                InvestmentHistory.date <= self.now,
+            )
+        )
+        history = result.all()
+        index = {row[0]: i for i, row in enumerate(positions)}
+        m = len(history)
+        owners = np.fromiter((index[row[0]] for row in history), dtype=np.intp, count=m)
+        times = np.fromiter((row[1] for row in history), dtype=np.float64, count=m)
+        values = np.fromiter((row[2] for row in history), dtype=np.float64, count=m)
+
+        # Ordenar aqui evita o sort do SQLite (ORDER BY fora da ordem do índice)
+        order = np.lexsort((times, owners))
+        owners, times, values = owners[order], times[order], values[order]
+        first = np.r_[True, owners[1:] != owners[:-1]] if m else np.zeros(0, dtype=bool)
+        previous = np.r_[0.0, values[:-1]] if m else values.copy()
+        previous[first] = invested[owners[first]]
+        return owners, times, values, previous
+
+    @staticmethod
+    def _position_twr(owners: np.ndarray, values: np.ndarray, previous: np.ndarray,
+                      invested: np.ndarray, current: np.ndarray) -> np.ndarray:
+        """TWR de cada investimento: produto dos retornos entre pontos consecutivos do histórico."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            growth = np.ones(len(invested))
+            np.multiply.at(growth, owners, np.where(previous > 0, values / previous, 1.0))
+            # Último subperíodo: do último ponto conhecido até o valor atual
+            last = invested.copy()
+            final = np.r_[owners[1:] != owners[:-1], True] if len(owners) else np.zeros(0, dtype=bool)
+            last[owners[final]] = values[final]
+            growth *= np.where(last > 0, current / last, 1.0)
+        return growth - 1.0
+
+    @staticmethod
+    def _grouped_twr(type_count: int, type_index: np.ndarray, invested: np.ndarray, current: np.ndarray,
+                     purchased: np.ndarray, owners: np.ndarray, times: np.ndarray, changes: np.ndarray) -> np.ndarray:
+        """TWR de cada tipo e da carteira (último elemento), encadeado nas datas de aporte."""
+        dates = np.unique(purchased)
+        # Cada variação entra no valor do grupo a partir da primeira data de aporte >= ao seu instante;
+        # a última coluna (data atual) fica com o valor final e não soma variações
+        deltas = np.zeros((type_count + 1, len(dates) + 1))
+        flows = np.zeros_like(deltas)
+        purchase_columns = np.searchsorted(dates, purchased)
+        np.add.at(deltas, (type_index, purchase_columns), invested)
+        np.add.at(flows, (type_index, purchase_columns), invested)
+        np.add.at(deltas, (type_index[owners], np.searchsorted(dates, times)), changes)
+
+        values = np.cumsum(deltas[:, :-1], axis=1)
+        values = np.c_[values, np.bincount(type_index, current, type_count + 1)]
+        values[-1] = values[:type_count].sum(axis=0)
+        flows[-1] = flows[:type_count].sum(axis=0)
+        return chain_linked_return(values, flows)
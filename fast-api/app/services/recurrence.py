@@ -0,0 +1,151 @@
+import calendar
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.conditional import bump_data_version
+from app.models.expense import Expense
+from app.models.recurring_expense import RecurringExpense, RecurringFrequency
+from app.services.rollups import RollupDeltas
+
+# Intervalo máximo gerado por chamada
+MAX_GENERATION_DAYS = 5 * 366
+
+
+def _month_day(year: int, month: int, day: int) -> date:
+    """Dia do mês limitado ao tamanho do mês (dia 31 vira 30, 29 ou 28)."""
+    return date(year, month, min(day, calendar.monthrange(year, month)[1]))
+
+
+def occurrence_dates(recurring: RecurringExpense, start: datetime, end: datetime) -> List[datetime]:
+    """Calcular todas as datas de ocorrência da recorrência dentro de [start, end].
+
+    Respeita start_date/end_date da recorrência, day_of_month (mensal e anual) e
+    day_of_week (semanal, 0 = domingo como no frontend). As ocorrências herdam o
+    horário de start_date, o que torna a data de cada uma estável entre chamadas.
+    """
+    first = max(start.date(), recurring.start_date.date())
+    last = end.date()
+    if recurring.end_date:
+        last = min(last, recurring.end_date.date())
+    if first > last:
+        return []
+
+    anchor = recurring.start_date
+    days: List[date] = []
+    if recurring.frequency == RecurringFrequency.WEEKLY:
+        weekday = anchor.weekday() if recurring.day_of_week is None else (recurring.day_of_week - 1) % 7
+        current = first + timedelta(days=(weekday - first.weekday()) % 7)
+        while current <= last:
+            days.append(current)
+            current += timedelta(weeks=1)
+    elif recurring.frequency == RecurringFrequency.MONTHLY:
+        day = recurring.day_of_month or anchor.day
+        year, month = first.year, first.month
+        while (year, month) <= (last.year, last.month):
+            days.append(_month_day(year, month, day))
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    elif recurring.frequency == RecurringFrequency.YEARLY:
+        day = recurring.day_of_month or anchor.day
+        for year in range(first.year, last.year + 1):
+            days.append(_month_day(year, anchor.month, day))
+
+    return [datetime.combine(day, anchor.time()) for day in days if first <= day <= last]
+
+
+def next_occurrence(recurring: RecurringExpense, since: date) -> Optional[datetime]:
+    """Primeira ocorrência em `since` ou depois; None se a recorrência já terminou.
+
+    A janela de busca parte do início da recorrência quando ele é posterior a `since`,
+    para que recorrências que só começam daqui a mais de um ano também sejam agendadas.
+    """
+    start = datetime.combine(max(since, recurring.start_date.date()), time.min)
+    dates = occurrence_dates(recurring, start, start + timedelta(days=366))
+    return dates[0] if dates else None
+
+
+def schedule_next(recurring: RecurringExpense, since: date) -> None:
+    """Atualizar next_due_date; recorrências inativas ou encerradas ficam fora do agendador."""
+    recurring.next_due_date = next_occurrence(recurring, since) if recurring.is_active else None
+
+
+def reschedule(recurring: RecurringExpense, today: date) -> None:
+    """Recalcular next_due_date após uma edição sem pular ocorrências ainda não geradas.
+
+    Se a próxima ocorrência já venceu (o agendador ainda não rodou), o cálculo parte
+    dela e não de hoje, para que o agendador continue gerando as pendentes.
+    """
+    pending = recurring.next_due_date
+    schedule_next(recurring, min(pending.date(), today) if pending else today)
+
+
+def _occurrence_row(recurring: RecurringExpense, occurrence: datetime) -> dict:
+    return {
+        "user_id": recurring.user_id,
+        "recurring_expense_id": recurring.id,
+        "name": recurring.name,
+        "value": recurring.value,
+        "category": recurring.category,
+        "date": occurrence,
+        "description": recurring.description,
+        "payment_method": recurring.payment_method,
+        "is_recurring": True,
+    }
+
+
+async def materialize_many(
+    db: AsyncSession,
+    items: Iterable[Tuple[RecurringExpense, datetime, datetime]],
+) -> int:
+    """Gerar as despesas de várias recorrências, cada uma em seu intervalo [start, end].
+
+    Idempotente: ocorrências já existentes (chave recurring_expense_id + date) são
+    ignoradas. Usa uma consulta para as existentes e um único INSERT em massa para
+    todas as recorrências, e ajusta os totais mensais. Não faz commit; devolve
+    quantas despesas foram criadas.
+    """
+    pending = {}
+    for recurring, start, end in items:
+        dates = occurrence_dates(recurring, start, end)
+        if dates:
+            pending[recurring.id] = (recurring, dates)
+    if not pending:
+        return 0
+
+    all_dates = [occurrence for _, dates in pending.values() for occurrence in dates]
+    result = await db.execute(
+        select(Expense.recurring_expense_id, Expense.date).where(
+            Expense.recurring_expense_id.in_(pending.keys()),
+            Expense.date.between(min(all_dates), max(all_dates)),
+        )
+    )
+    existing = {(recurring_id, occurrence) for recurring_id, occurrence in result.all()}
+    rows = [
+        _occurrence_row(recurring, occurrence)
+        for recurring, dates in pending.values()
+        for occurrence in dates
+        if (recurring.id, occurrence) not in existing
+    ]
+    if not rows:
+        return 0
+
+    # O índice único cobre gerações concorrentes entre a consulta acima e o INSERT;
+    # RETURNING devolve só as linhas de fato inseridas, que alimentam os totais mensais
+    result = await db.execute(
+        sqlite_insert(Expense)
+        .on_conflict_do_nothing(index_elements=["recurring_expense_id", "date"])
+        .returning(Expense.user_id, Expense.date, Expense.category, Expense.value),
+        rows,
+    )
+    inserted = [row._asdict() for row in result.all()]
+    rollups = RollupDeltas()
+    rollups.add_rows(inserted)
+    await rollups.apply(db)
+    await bump_data_version(db, *{row["user_id"] for row in inserted})
+    return len(inserted)
+
+
+async def materialize(db: AsyncSession, recurring: RecurringExpense, start: datetime, end: datetime) -> int:
+    """Gerar as despesas de uma recorrência em [start, end] (ver materialize_many)."""
+    return await materialize_many(db, [(recurring, start, end)])
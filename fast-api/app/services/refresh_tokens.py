@@ -0,0 +1,91 @@
+import hashlib
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models.refresh_token import RefreshToken
+
+
+def _hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+async def issue_refresh_token(db: AsyncSession, user_id: str, family_id: Optional[str] = None) -> str:
+    """Criar um refresh token opaco; sem `family_id`, inicia uma nova sessão.
+
+    Não faz commit. Aproveita para remover os tokens expirados do usuário.
+    """
+    now = datetime.utcnow()
+    if family_id is None:
+        await db.execute(
+            delete(RefreshToken).where(RefreshToken.user_id == user_id, RefreshToken.expires_at < now)
+        )
+
+    token = secrets.token_urlsafe(32)
+    db.add(RefreshToken(
+        token_hash=_hash_token(token),
+        user_id=user_id,
+        family_id=family_id or str(uuid.uuid4()),
+        expires_at=now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    ))
+    return token
+
+
+async def rotate_refresh_token(db: AsyncSession, token: str) -> Optional[Tuple[str, str]]:
+    """Trocar um refresh token válido por um novo da mesma sessão.
+
+    O token usado é revogado em um único UPDATE condicional, então duas rotações
+    concorrentes do mesmo token não podem ambas ter sucesso. Reutilizar um token
+    já rotacionado indica vazamento e revoga a sessão inteira. Devolve
+    (user_id, novo token) ou None; não faz commit.
+    """
+    now = datetime.utcnow()
+    token_hash = _hash_token(token)
+    result = await db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.token_hash == token_hash,
+            RefreshToken.revoked_at.is_(None),
+            RefreshToken.expires_at > now,
+        )
+        .values(revoked_at=now)
+        .returning(RefreshToken.user_id, RefreshToken.family_id)
+    )
+    rotated = result.first()
+    if rotated is None:
+        result = await db.execute(
+            select(RefreshToken.user_id, RefreshToken.family_id).where(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.revoked_at.is_not(None),
+            )
+        )
+        reused = result.first()
+        if reused is not None:
+            await revoke_refresh_tokens(db, reused.user_id, reused.family_id)
+        return None
+
+    return rotated.user_id, await issue_refresh_token(db, rotated.user_id, rotated.family_id)
+
+
+async def revoke_refresh_tokens(db: AsyncSession, user_id: str, family_id: Optional[str] = None) -> None:
+    """Revogar os tokens de uma sessão ou, sem `family_id`, de todas as sessões do usuário."""
+    query = update(RefreshToken).where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+    if family_id is not None:
+        query = query.where(RefreshToken.family_id == family_id)
+    await db.execute(query.values(revoked_at=datetime.utcnow()))
+
+
+async def revoke_refresh_token_session(db: AsyncSession, user_id: str, token: str) -> None:
+    """Revogar a sessão do refresh token informado, se pertencer ao usuário."""
+    result = await db.execute(
+        select(RefreshToken.family_id).where(
+            RefreshToken.token_hash == _hash_token(token),
+            RefreshToken.user_id == user_id,
+        )
+    )
+    family_id = result.scalar_one_or_none()
+    if family_id is not None:
+        await revoke_refresh_tokens(db, user_id, family_id)
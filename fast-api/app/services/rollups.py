@@ -0,0 +1,95 @@
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Iterable, Optional
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.expense import Expense
+from app.models.expense_rollup import ExpenseMonthlyRollup
+
+
+def month_start(value: datetime) -> date:
+    """Primeiro dia do mês da data."""
+    return date(value.year, value.month, 1)
+
+
+class RollupDeltas:
+    """Acumula as variações dos totais mensais causadas por uma escrita em despesas.
+
+    Os caminhos de escrita registram cada despesa incluída (`add`) ou removida
+    (`remove`) e chamam `apply` antes do commit, na mesma transação, para que a
+    tabela de totais nunca divirja das despesas.
+    """
+
+    def __init__(self):
+        self._deltas = defaultdict(lambda: [0.0, 0])
+
+    def add(self, user_id: str, expense_date: datetime, category: str, value: float) -> None:
+        delta = self._deltas[(user_id, month_start(expense_date), category)]
+        delta[0] += value
+        delta[1] += 1
+
+    def remove(self, user_id: str, expense_date: datetime, category: str, value: float) -> None:
+        delta = self._deltas[(user_id, month_start(expense_date), category)]
+        delta[0] -= value
+        delta[1] -= 1
+
+    def add_rows(self, rows: Iterable[dict]) -> None:
+        for row in rows:
+            self.add(row["user_id"], row["date"], row["category"], row["value"])
+
+    async def apply(self, db: AsyncSession) -> None:
+        """Aplicar as variações com um único upsert em massa; não faz commit."""
+        rows = [
+            {"user_id": user_id, "month": month, "category": category, "total": total, "count": count}
+            for (user_id, month, category), (total, count) in self._deltas.items()
+            if count or total
+        ]
+        self._deltas.clear()
+        if not rows:
+            return
+
+        statement = sqlite_insert(ExpenseMonthlyRollup)
+        await db.execute(
+            statement.on_conflict_do_update(
+                index_elements=["user_id", "month", "category"],
+                set_={
+                    "total": ExpenseMonthlyRollup.total + statement.excluded.total,
+                    "count": ExpenseMonthlyRollup.count + statement.excluded.count,
+                },
+            ),
+            rows,
+        )
+        # Meses/categorias que ficaram sem despesas
+        for user_id in {row["user_id"] for row in rows if row["count"] < 0}:
+            await db.execute(
+                delete(ExpenseMonthlyRollup).where(
+                    ExpenseMonthlyRollup.user_id == user_id,
+                    ExpenseMonthlyRollup.count <= 0,
+                )
+            )
+
+
+async def rebuild_rollups(db: AsyncSession, user_id: Optional[str] = None) -> None:
+    """Recalcular os totais mensais a partir das despesas (todos os usuários ou um); não faz commit."""
+    month = func.date(Expense.date, "start of month")
+    source = select(
+        Expense.user_id,
+        month,
+        Expense.category,
+        func.sum(Expense.value),
+        func.count(Expense.id),
+    ).group_by(Expense.user_id, month, Expense.category)
+
+    clear = delete(ExpenseMonthlyRollup)
+    if user_id is not None:
+        source = source.where(Expense.user_id == user_id)
+        clear = clear.where(ExpenseMonthlyRollup.user_id == user_id)
+
+    await db.execute(clear)
+    await db.execute(
+        insert(ExpenseMonthlyRollup).from_select(
+            ["user_id", "month", "category", "total", "count"],
+            source,
+        )
+    )
@@ -0,0 +1,60 @@
+import asyncio
+import logging
+from datetime import datetime, time, timedelta
+from typing import Optional
+from sqlalchemy import select
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.recurring_expense import RecurringExpense
+from app.services.recurrence import materialize_many, schedule_next
+
+logger = logging.getLogger(__name__)
+
+
+async def materialize_due(now: Optional[datetime] = None, batch_size: Optional[int] = None) -> int:
+    """Gerar as despesas recorrentes vencidas até hoje, de todos os usuários.
+
+    Busca pelo índice de next_due_date apenas as recorrências vencidas, em lotes
+    limitados; cada lote é gerado com um único INSERT em massa e tem next_due_date
+    avançado para a próxima ocorrência a partir de amanhã, na mesma transação.
+    """
+    now = now or datetime.utcnow()
+    batch_size = batch_size or settings.SCHEDULER_BATCH_SIZE
+    tomorrow = now.date() + timedelta(days=1)
+    cutoff = datetime.combine(tomorrow, time.min)
+
+    generated = 0
+    async with AsyncSessionLocal() as db:
+        while True:
+            result = await db.execute(
+                select(RecurringExpense)
+                .where(RecurringExpense.next_due_date < cutoff)
+                .order_by(RecurringExpense.next_due_date)
+                .limit(batch_size)
+            )
+            due = result.scalars().all()
+            if not due:
+                break
+
+            generated += await materialize_many(
+                db, [(recurring, recurring.next_due_date, now) for recurring in due]
+            )
+            for recurring in due:
+                schedule_next(recurring, tomorrow)
+            await db.commit()
+
+            if len(due) < batch_size:
+                break
+    return generated
+
+
+async def run_scheduler() -> None:
+    """Laço do agendador executado durante o ciclo de vida da aplicação."""
+    while True:
+        try:
+            generated = await materialize_due()
+            if generated:
+                logger.info("%s despesas recorrentes geradas", generated)
+        except Exception:
+            logger.exception("Falha ao gerar despesas recorrentes")
+        await asyncio.sleep(settings.SCHEDULER_INTERVAL_SECONDS)
@@ -0,0 +1,65 @@
+from typing import Optional, Sequence, Tuple
+from sqlalchemy import column, literal_column, or_, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.expense import Expense
+from app.models.investment import Investment
+
+# O tokenizador trigram só encontra termos com pelo menos 3 caracteres
+MIN_INDEXED_SEARCH_LENGTH = 3
+
+
+def fts_phrase(term: str) -> str:
+    """Escapar o termo como uma frase FTS5: com trigram, busca por substring."""
+    return '"' + term.replace('"', '""') + '"'
+
+
+class SearchIndex:
+    """Índice FTS5 (tokenizador trigram) sobre colunas de texto de uma tabela.
+
+    O índice é uma tabela virtual de conteúdo externo, ligada à tabela de origem
+    pelo rowid e mantida por triggers criados na migração, então todos os caminhos
+    de escrita (endpoints, lote, importação, agendador) ficam sincronizados sem
+    código extra. Recriar a tabela de origem (migrações em batch, VACUUM) pode
+    remover os triggers ou mudar rowids: nesse caso rode
+    `python -m scripts.rebuild_search_index`.
+
+    Uso:
+        query, rank = EXPENSE_SEARCH.apply(select(...), "mercado")
+    """
+
+    def __init__(self, name: str, model, columns: Sequence):
+        self.name = name
+        self.model = model
+        self.columns = tuple(columns)
+        self.rowid = literal_column(f"{model.__tablename__}.rowid")
+        self._table = table(name, column("rowid"), column("rank"))
+
+    def match(self, term: str):
+        """Subconsulta (rowid, rank) das linhas que contêm o termo, ou None se for curto demais."""
+        if len(term.strip()) < MIN_INDEXED_SEARCH_LENGTH:
+            return None
+        return (
+            select(self._table.c.rowid, self._table.c.rank)
+            .where(literal_column(self.name).op("MATCH")(fts_phrase(term.strip())))
+            .subquery(f"{self.name}_match")
+        )
+
+    def apply(self, query, term: str) -> Tuple[object, Optional[object]]:
+        """Restringir a consulta às linhas que contêm o termo.
+
+        Devolve a consulta e a coluna de relevância (bm25: menor é mais relevante).
+        Termos curtos demais para o índice caem no ILIKE e não têm relevância.
+        """
+        matches = self.match(term)
+        if matches is None:
+            return query.where(or_(*(col.ilike(f"%{term}%") for col in self.columns))), None
+        return query.join(matches, self.rowid == matches.c.rowid), matches.c.rank
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        """Reconstruir o índice a partir da tabela de origem; não faz commit."""
+        await db.execute(text(f"INSERT INTO {self.name}({self.name}) VALUES ('rebuild')"))
+
+
+EXPENSE_SEARCH = SearchIndex("expenses_fts", Expense, (Expense.name, Expense.description))
+INVESTMENT_SEARCH = SearchIndex("investments_fts", Investment, (Investment.name, Investment.ticker))
+SEARCH_INDEXES = (EXPENSE_SEARCH, INVESTMENT_SEARCH)
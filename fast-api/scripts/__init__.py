@@ -0,0 +1 @@
+# Scripts de manutenção
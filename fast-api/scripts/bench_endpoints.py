@@ -0,0 +1,517 @@
+"""Medir a latência de todas as rotas da API sobre um banco sintético.
+
+Cria um banco SQLite temporário (com as migrações do Alembic), gera dados
+sintéticos nos volumes pedidos (usuários x despesas x investimentos x pontos de
+histórico) e exercita cada rota de `app/api/v1/router.py` via cliente ASGI em
+processo. Para cada cenário reporta p50/p95/p99 da latência e consultas SQL por
+requisição; ao final, o pico de RSS do processo.
+
+Com `--baseline`, compara com um resultado salvo anteriormente (`--output`) e
+termina com código 1 se alguma rota ficar mais lenta que o limite, fizer mais
+consultas ou se o pico de RSS crescer além do limite. Rotas sem cenário também
+falham, para que novos endpoints entrem no benchmark.
+
+Uso (a partir de fast-api/, requer requirements-dev.txt):
+    python -m scripts.bench_endpoints --output bench.json
+    python -m scripts.bench_endpoints --baseline bench.json --threshold 0.2
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional
+
+_tmpdir = tempfile.mkdtemp(prefix="bench-endpoints-")
+DATABASE_PATH = os.path.join(_tmpdir, "bench.db")
+
+# A configuração precisa apontar para o banco temporário antes de importar a aplicação
+os.environ["DATABASE_URL"] = f"sqlite:///{DATABASE_PATH}"
+os.environ["DEBUG"] = "False"
+os.environ["RATE_LIMIT_ENABLED"] = "False"
+os.environ["SCHEDULER_ENABLED"] = "False"
+os.environ.setdefault("SECRET_KEY", "bench-endpoints")
+
+import httpx  # noqa: E402
+from fastapi.routing import APIRoute  # noqa: E402
+from sqlalchemy import event, insert  # noqa: E402
+from app.api.v1.router import api_router  # noqa: E402
+from app.core.security import get_password_hash  # noqa: E402
+from app.database import AsyncSessionLocal, async_engine, run_migrations  # noqa: E402
+from app.main import app, lifespan  # noqa: E402
+from app.models.expense import Expense, PaymentMethodType  # noqa: E402
+from app.models.investment import Investment, InvestmentHistory, InvestmentType  # noqa: E402
+from app.models.payment_method import PaymentMethod  # noqa: E402
+from app.models.recurring_expense import RecurringExpense, RecurringFrequency  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.rollups import rebuild_rollups  # noqa: E402
+
+BENCH_EMAIL = "bench-0@example.com"
+BENCH_PASSWORD = "bench-endpoints"
+CATEGORIES = ("Alimentação", "Moradia", "Transporte", "Lazer", "Saúde", "Educação")
+EXPENSE_NAMES = ("Mercado", "Padaria", "Aluguel", "Combustível", "Cinema", "Farmácia", "Curso", "Restaurante")
+INSERT_CHUNK = 20_000
+
+
+# ---------------------------------------------------------------------------
+# Dados sintéticos
+# ---------------------------------------------------------------------------
+
+class Volumes(NamedTuple):
+    users: int
+    expenses: int  # por usuário
+    investments: int  # por usuário
+    history: int  # pontos por investimento
+
+
+async def _insert(db, model, rows: List[dict]) -> None:
+    for start in range(0, len(rows), INSERT_CHUNK):
+        await db.execute(insert(model), rows[start:start + INSERT_CHUNK])
+
+
+async def seed(volumes: Volumes, now: datetime, seed_value: int = 42) -> None:
+    """Gerar os dados direto no banco, usuário a usuário, para limitar a memória usada no seed."""
+    rng = random.Random(seed_value)
+    hashed_password = get_password_hash(BENCH_PASSWORD)
+    methods = list(PaymentMethodType)
+    types = list(InvestmentType)
+
+    async with AsyncSessionLocal() as db:
+        for u in range(volumes.users):
+            user_id = str(uuid.uuid4())
+            await _insert(db, User, [{
+                "id": user_id,
+                "name": f"Usuário {u}",
+                "email": f"bench-{u}@example.com",
+                "hashed_password": hashed_password,
+                "created_at": now,
+                "updated_at": now,
+            }])
+            await _insert(db, Expense, [
+                {
+                    "id": str(uuid.uuid4()),
+                    "user_id": user_id,
+                    "name": rng.choice(EXPENSE_NAMES),
+                    "value": round(rng.uniform(5, 800), 2),
+                    "category": rng.choice(CATEGORIES),
+                    "date": now - timedelta(minutes=rng.randint(1, 730 * 24 * 60)),
+                    "description": f"Compra {i}" if i % 3 else None,
+                    "payment_method": rng.choice(methods),
+                    "is_recurring": False,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(volumes.expenses)
+            ])
+            await _insert(db, PaymentMethod, [
+                {
+                    "id": str(uuid.uuid4()),
+                    "user_id": user_id,
+                    "name": f"Cartão {i}",
+                    "type": PaymentMethodType.CREDIT_CARD,
+                    "last_digits": f"{1000 + i}",
+                    "is_default": i == 0,
+                    "limit": 5000.0,
+                    "used_limit": 0.0,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(3)
+            ])
+            await _insert(db, RecurringExpense, [
+                {
+                    "id": str(uuid.uuid4()),
+                    "user_id": user_id,
+                    "name": f"Assinatura {i}",
+                    "value": 49.9,
+                    "category": rng.choice(CATEGORIES),
+                    "frequency": RecurringFrequency.MONTHLY,
+                    "day_of_month": 10,
+                    "is_active": True,
+                    "start_date": now - timedelta(days=365),
+                    "next_due_date": now + timedelta(days=30),
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(5)
+            ])
+
+            investments, history = [], []
+            for i in range(volumes.investments):
+                purchase_date = now - timedelta(days=rng.randint(30, 1500), hours=rng.randint(0, 23))
+                value = current = round(rng.uniform(500, 20_000), 2)
+                investment_id = str(uuid.uuid4())
+                span = (now - purchase_date) / (volumes.history + 1)
+                for k in range(volumes.history):
+                    current *= rng.uniform(0.985, 1.016)
+                    history.append({
+                        "id": str(uuid.uuid4()),
+                        "investment_id": investment_id,
+                        "value": current,
+                        "date": purchase_date + span * (k + 1),
+                    })
+                investments.append({
+                    "id": investment_id,
+                    "user_id": user_id,
+                    "name": f"Ativo {i}",
+                    "type": rng.choice(types),
+                    "value": value,
+                    "purchase_date": purchase_date,
+                    "current_value": current,
+                    "ticker": f"BNCH{i}",
+                    "created_at": now,
+                    "updated_at": now,
+                })
+            await _insert(db, Investment, investments)
+            await _insert(db, InvestmentHistory, history)
+            await db.commit()
+
+        await rebuild_rollups(db)
+        await db.commit()
+
+
+# ---------------------------------------------------------------------------
+# Cenários
+# ---------------------------------------------------------------------------
+
+Setup = Callable[[httpx.AsyncClient, dict], Awaitable[dict]]
+
+
+class Scenario(NamedTuple):
+    method: str
+    path: str  # como declarado no router; {parâmetros} vêm do contexto
+    params: Dict[str, Any] = {}
+    body: Optional[Callable[[dict], Any]] = None
+    files: Optional[Callable[[dict], Any]] = None
+    setup: Optional[Setup] = None  # roda antes de cada requisição, fora da medição
+    label: str = ""
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.path}" + (f" [{self.label}]" if self.label else "")
+
+
+def _expense_body(ctx: dict) -> dict:
+    return {
+        "name": "Mercado",
+        "value": 42.5,
+        "category": "Alimentação",
+        "date": ctx["now"].isoformat(),
+        "payment_method": "pix",
+    }
+
+
+def _investment_body(ctx: dict) -> dict:
+    return {
+        "name": "Tesouro Selic",
+        "type": "Renda Fixa",
+        "value": 1000,
+        "purchase_date": (ctx["now"] - timedelta(days=90)).isoformat(),
+        "current_value": 1030,
+    }
+
+
+def _recurring_body(ctx: dict) -> dict:
+    return {
+        "name": "Academia",
+        "value": 99.9,
+        "category": "Saúde",
+        "frequency": "monthly",
+        "day_of_month": 5,
+        "start_date": ctx["now"].isoformat(),
+    }
+
+
+def _payment_method_body(ctx: dict) -> dict:
+    return {"name": "Débito", "type": "debit-card", "last_digits": "4321"}
+
+
+def _creates(path: str, body: Callable[[dict], dict], key: str) -> Setup:
+    """Setup que cria um recurso novo (para rotas que o consomem, como DELETE)."""
+    async def setup(client: httpx.AsyncClient, ctx: dict) -> dict:
+        response = await client.post(path, json=body(ctx), headers=ctx["headers"])
+        response.raise_for_status()
+        return {key: response.json()["id"]}
+    return setup
+
+
+async def _login(client: httpx.AsyncClient, ctx: dict) -> dict:
+    response = await client.post("/auth/login", json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD})
+    response.raise_for_status()
+    return {"refresh_token": response.json()["refreshToken"]}
+
+
+async def _new_email(client: httpx.AsyncClient, ctx: dict) -> dict:
+    return {"email": f"bench-{uuid.uuid4().hex}@example.com"}
+
+
+IMPORT_CSV = "data;nome;valor;categoria\n10/01/2026;Mercado;-120,50;Alimentação\n11/01/2026;Padaria;-18,00;Alimentação\n"
+
+SCENARIOS = [
+    # Autenticação
+    Scenario("POST", "/auth/register", setup=_new_email,
+             body=lambda ctx: {"name": "Novo Usuário", "email": ctx["email"], "password": BENCH_PASSWORD}),
+    Scenario("POST", "/auth/login", body=lambda ctx: {"email": BENCH_EMAIL, "password": BENCH_PASSWORD}),
+    Scenario("POST", "/auth/refresh", setup=_login, body=lambda ctx: {"refreshToken": ctx["refresh_token"]}),
+    Scenario("POST", "/auth/logout", setup=_login, body=lambda ctx: {"refreshToken": ctx["refresh_token"]}),
+    Scenario("GET", "/auth/me"),
+    Scenario("PUT", "/auth/profile", body=lambda ctx: {"name": "Usuário 0"}),
+    Scenario("POST", "/auth/change-password", body=lambda ctx: {
+        "current_password": BENCH_PASSWORD,
+        "new_password": BENCH_PASSWORD,
+        "confirm_new_password": BENCH_PASSWORD,
+    }),
+    # Despesas
+    Scenario("GET", "/expenses"),
+    Scenario("GET", "/expenses", params={"search": "mercado"}, label="search"),
+    Scenario("GET", "/expenses", params={"category": "Lazer", "limit": 200}, label="category"),
+    Scenario("GET", "/expenses/stats"),
+    Scenario("GET", "/expenses/export"),
+    Scenario("POST", "/expenses/import", files=lambda ctx: {"file": ("extrato.csv", IMPORT_CSV.encode(), "text/csv")}),
+    Scenario("POST", "/expenses/batch", body=lambda ctx: {"operations": [
+        {"op": "create", "data": _expense_body(ctx)},
+        {"op": "update", "id": ctx["expense_id"], "data": {"value": 55.0}},
+    ]}),
+    Scenario("GET", "/expenses/{expense_id}"),
+    Scenario("POST", "/expenses", body=_expense_body),
+    Scenario("PUT", "/expenses/{expense_id}", body=lambda ctx: {"value": 61.0}),
+    Scenario("DELETE", "/expenses/{expense_id}", setup=_creates("/expenses", _expense_body, "expense_id")),
+    # Formas de pagamento
+    Scenario("GET", "/payment-methods"),
+    Scenario("GET", "/payment-methods/{method_id}"),
+    Scenario("POST", "/payment-methods", body=_payment_method_body),
+    Scenario("PUT", "/payment-methods/{method_id}", body=lambda ctx: {"name": "Cartão principal"}),
+    Scenario("DELETE", "/payment-methods/{method_id}",
+             setup=_creates("/payment-methods", _payment_method_body, "method_id")),
+    Scenario("PATCH", "/payment-methods/{method_id}/set-default"),
+    # Despesas recorrentes
+    Scenario("GET", "/recurring-expenses"),
+    Scenario("GET", "/recurring-expenses/{recurring_id}"),
+    Scenario("POST", "/recurring-expenses", body=_recurring_body),
+    Scenario("PUT", "/recurring-expenses/{recurring_id}", body=lambda ctx: {"value": 59.9}),
+    Scenario("DELETE", "/recurring-expenses/{recurring_id}",
+             setup=_creates("/recurring-expenses", _recurring_body, "recurring_id")),
+    Scenario("PATCH", "/recurring-expenses/{recurring_id}/toggle-active"),
+    Scenario("POST", "/recurring-expenses/{recurring_id}/generate", body=lambda ctx: {}),
+    # Investimentos
+    Scenario("GET", "/investments"),
+    Scenario("GET", "/investments", params={"search": "bnch"}, label="search"),
+    Scenario("GET", "/investments/stats"),
+    Scenario("GET", "/investments/performance"),
+    Scenario("GET", "/investments/timeseries"),
+    Scenario("GET", "/investments/timeseries", params={"group_by": "investment"}, label="investment"),
+    Scenario("GET", "/investments/{investment_id}"),
+    Scenario("POST", "/investments", body=_investment_body),
+    Scenario("PUT", "/investments/{investment_id}", body=lambda ctx: {"description": "Atualizado"}),
+    Scenario("DELETE", "/investments/{investment_id}",
+             setup=_creates("/investments", _investment_body, "investment_id")),
+    Scenario("GET", "/investments/{investment_id}/history"),
+    Scenario("GET", "/investments/{investment_id}/history/series"),
+    Scenario("GET", "/investments/{investment_id}/history/series", params={"sampling": "ohlc"}, label="ohlc"),
+    Scenario("PATCH", "/investments/{investment_id}/update-value", body=lambda ctx: {"current_value": 1234.5}),
+    # Dashboard
+    Scenario("GET", "/dashboard"),
+    Scenario("GET", "/dashboard", params={"period": "year"}, label="year"),
+    Scenario("GET", "/dashboard/summary"),
+    Scenario("GET", "/dashboard/recent-transactions"),
+    Scenario("GET", "/dashboard/category-spending"),
+    Scenario("GET", "/dashboard/monthly-trend", params={"months": 24}, label="24 meses"),
+]
+
+
+def missing_scenarios() -> List[str]:
+    """Rotas do router sem nenhum cenário (os nomes dos parâmetros de caminho não entram na comparação)."""
+    def shape(method: str, path: str) -> str:
+        parts = ["{}" if part.startswith("{") else part for part in path.split("/")]
+        return f"{method} {'/'.join(parts)}"
+
+    covered = {shape(s.method, s.path) for s in SCENARIOS}
+    routes = []
+    for route in api_router.routes:
+        if isinstance(route, APIRoute):
+            for method in sorted(route.methods):
+                if shape(method, route.path) not in covered:
+                    routes.append(f"{method} {route.path}")
+    return routes
+
+
+# ---------------------------------------------------------------------------
+# Medição
+# ---------------------------------------------------------------------------
+
+def peak_rss_mb() -> float:
+    """Pico de memória residente do processo (ru_maxrss é em KB no Linux e em bytes no macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50_ms": cuts[49], "p95_ms": cuts[94], "p99_ms": cuts[98]}
+
+
+async def _context(client: httpx.AsyncClient, now: datetime) -> dict:
+    response = await client.post("/auth/login", json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD})
+    response.raise_for_status()
+    ctx = {"now": now, "headers": {"Authorization": f"Bearer {response.json()['token']}"}}
+    for path, key in (
+        ("/expenses", "expense_id"),
+        ("/investments", "investment_id"),
+        ("/payment-methods", "method_id"),
+        ("/recurring-expenses", "recurring_id"),
+    ):
+        response = await client.get(path, params={"limit": 1}, headers=ctx["headers"])
+        response.raise_for_status()
+        ctx[key] = response.json()[0]["id"]
+    return ctx
+
+
+async def _measure(client: httpx.AsyncClient, ctx: dict, scenario: Scenario, iterations: int, warmup: int) -> dict:
+    queries = 0
+
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        nonlocal queries
+        queries += 1
+
+    samples, query_counts = [], []
+    for i in range(warmup + iterations):
+        request_ctx = dict(ctx)
+        if scenario.setup:
+            request_ctx.update(await scenario.setup(client, request_ctx))
+        kwargs = {"params": scenario.params, "headers": ctx["headers"]}
+        if scenario.body:
+            kwargs["json"] = scenario.body(request_ctx)
+        if scenario.files:
+            kwargs["files"] = scenario.files(request_ctx)
+        url = scenario.path.format(**request_ctx)
+
+        queries = 0
+        event.listen(async_engine.sync_engine, "before_cursor_execute", count_query)
+        try:
+            started = time.perf_counter()
+            response = await client.request(scenario.method, url, **kwargs)
+            elapsed = time.perf_counter() - started
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", count_query)
+        if response.status_code >= 400:
+            raise RuntimeError(f"{scenario.name}: HTTP {response.status_code} {response.text[:200]}")
+        if i >= warmup:
+            samples.append(elapsed * 1000)
+            query_counts.append(queries)
+
+    return {**percentiles(samples), "queries": statistics.mean(query_counts)}
+
+
+async def run(volumes: Volumes, iterations: int, warmup: int, only: Optional[str]) -> dict:
+    now = datetime.utcnow().replace(microsecond=0)
+    run_migrations()
+    async with lifespan(app):
+        started = time.perf_counter()
+        await seed(volumes, now)
+        print(f"seed: {time.perf_counter() - started:.1f} s, pico de RSS {peak_rss_mb():.0f} MB")
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench/api/v1") as client:
+            ctx = await _context(client, now)
+            routes = {}
+            for scenario in SCENARIOS:
+                if only and only not in scenario.name:
+                    continue
+                routes[scenario.name] = result = await _measure(client, ctx, scenario, iterations, warmup)
+                print(
+                    f"{scenario.name:<62} p50 {result['p50_ms']:8.2f}  p95 {result['p95_ms']:8.2f}  "
+                    f"p99 {result['p99_ms']:8.2f} ms  {result['queries']:5.1f} consultas"
+                )
+
+    return {
+        "volumes": volumes._asdict(),
+        "iterations": iterations,
+        "peak_rss_mb": peak_rss_mb(),
+        "routes": routes,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Comparação com o baseline
+# ---------------------------------------------------------------------------
+
+def compare(current: dict, baseline: dict, threshold: float, min_delta_ms: float) -> List[str]:
+    """Regressões em relação ao baseline: latência (p50/p95), consultas por requisição e pico de RSS."""
+    regressions = []
+    for name, result in current["routes"].items():
+        previous = baseline["routes"].get(name)
+        if previous is None:
+            continue
+        for key in ("p50_ms", "p95_ms"):
+            delta = result[key] - previous[key]
+            # Diferenças absolutas pequenas são ruído, mesmo que grandes em proporção
+            if delta > min_delta_ms and result[key] > previous[key] * (1 + threshold):
+                regressions.append(f"{name}: {key} {previous[key]:.2f} -> {result[key]:.2f} ms")
+        if result["queries"] > previous["queries"] + 0.5:
+            regressions.append(f"{name}: consultas {previous['queries']:.1f} -> {result['queries']:.1f}")
+    if current["peak_rss_mb"] > baseline["peak_rss_mb"] * (1 + threshold):
+        regressions.append(f"pico de RSS {baseline['peak_rss_mb']:.0f} -> {current['peak_rss_mb']:.0f} MB")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=5, help="Usuários gerados")
+    parser.add_argument("--expenses", type=int, default=2_000, help="Despesas por usuário")
+    parser.add_argument("--investments", type=int, default=30, help="Investimentos por usuário")
+    parser.add_argument("--history", type=int, default=500, help="Pontos de histórico por investimento")
+    parser.add_argument("--iterations", type=int, default=30, help="Requisições medidas por cenário")
+    parser.add_argument("--warmup", type=int, default=3, help="Requisições descartadas por cenário")
+    parser.add_argument("--only", help="Rodar apenas cenários cujo nome contenha o texto")
+    parser.add_argument("--output", help="Salvar o resultado em JSON (pode servir de baseline)")
+    parser.add_argument("--baseline", help="Resultado anterior para comparar")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Piora relativa tolerada (0.2 = 20%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="Piora absoluta mínima para contar como regressão")
+    args = parser.parse_args()
+    if args.iterations < 2:
+        parser.error("--iterations deve ser pelo menos 2")
+
+    missing = missing_scenarios()
+    if missing:
+        print("Rotas sem cenário no benchmark:")
+        for route in missing:
+            print(f"  {route}")
+        return 1
+
+    baseline = None
+    volumes = Volumes(args.users, args.expenses, args.investments, args.history)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        if baseline["volumes"] != volumes._asdict():
+            print(f"O baseline foi gerado com outros volumes: {baseline['volumes']}")
+            return 1
+
+    result = asyncio.run(run(volumes, args.iterations, args.warmup, args.only))
+    print(f"pico de RSS: {result['peak_rss_mb']:.0f} MB")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=2, ensure_ascii=False)
+
+    if baseline is None:
+        return 0
+    regressions = compare(result, baseline, args.threshold, args.min_delta_ms)
+    if not regressions:
+        print(f"Sem regressões em relação a {args.baseline}")
+        return 0
+    print(f"Regressões em relação a {args.baseline}:")
+    for regression in regressions:
+        print(f"  {regression}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""Comparar o custo por linha da serialização das listagens, antes e depois do `json_response`.
+
+"antes" reproduz o caminho antigo: `model_validate` por linha no endpoint seguido do
+`serialize_response` do FastAPI (nova validação pelo `response_model`) e do
+`JSONResponse` (json da stdlib). "depois" é `json_response`: uma validação com
+`TypeAdapter(List[...])` e serialização direta para bytes. As linhas são objetos ORM
+em memória, então o banco não entra na medição. Também confere que os dois caminhos
+produzem o mesmo JSON.
+
+Uso (a partir de fast-api/):
+    python -m scripts.bench_serialization --rows 10000 --repeat 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+
+os.environ.setdefault("SECRET_KEY", "bench-serialization")
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from app.core.responses import json_response  # noqa: E402
+from app.models.expense import Expense, PaymentMethodType  # noqa: E402
+from app.schemas.expense import ExpenseResponse  # noqa: E402
+
+EXPENSE_LIST = TypeAdapter(List[ExpenseResponse])
+EXPENSE_LIST_FIELD = create_response_field(name="Response_get_expenses", type_=List[ExpenseResponse])
+
+
+def build_rows(count: int) -> List[Expense]:
+    user_id = str(uuid.uuid4())
+    start = datetime(2026, 1, 1, 12, 0)
+    methods = list(PaymentMethodType) + [None]
+    return [
+        Expense(
+            id=str(uuid.uuid4()),
+            user_id=user_id,
+            name=f"Despesa {i}",
+            value=round(10 + (i % 500) * 1.37, 2),
+            category=("Alimentação", "Moradia", "Transporte", "Lazer")[i % 4],
+            date=start + timedelta(hours=i),
+            payment_method=methods[i % len(methods)],
+            description=f"Compra número {i}" if i % 3 else None,
+            is_recurring=i % 10 == 0,
+            created_at=start,
+            updated_at=start,
+        )
+        for i in range(count)
+    ]
+
+
+async def before(rows: List[Expense]) -> bytes:
+    content = [ExpenseResponse.model_validate(row) for row in rows]
+    serialized = await serialize_response(field=EXPENSE_LIST_FIELD, response_content=content)
+    return JSONResponse(serialized).body
+
+
+async def after(rows: List[Expense]) -> bytes:
+    return json_response(EXPENSE_LIST, rows).body
+
+
+async def measure(path, rows: List[Expense], repeat: int) -> float:
+    """Melhor tempo (em segundos) entre as repetições."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await path(rows)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+async def _run(count: int, repeat: int) -> int:
+    rows = build_rows(count)
+    if json.loads(await before(rows)) != json.loads(await after(rows)):
+        print("Os dois caminhos produziram JSON diferente")
+        return 1
+
+    results = {}
+    for name, path in (("antes", before), ("depois", after)):
+        results[name] = await measure(path, rows, repeat)
+        print(f"{name:>6}: {results[name] * 1000:8.1f} ms  {results[name] / count * 1e6:6.2f} µs/linha")
+    print(f"ganho:  {results['antes'] / results['depois']:.1f}x ({count} linhas, melhor de {repeat})")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000, help="Linhas por listagem")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetições de cada caminho")
+    args = parser.parse_args()
+    return asyncio.run(_run(args.rows, args.repeat))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""Verificar que as consultas dos endpoints principais usam índices.
+
+Cria um banco SQLite temporário aplicando as migrações do Alembic, exercita os
+endpoints de leitura via cliente ASGI em processo, captura cada SELECT emitido e
+roda `EXPLAIN QUERY PLAN` sobre ele. Termina com código 1 se algum plano fizer
+varredura completa (SCAN) de uma tabela da aplicação.
+
+Uso (a partir de fast-api/, requer requirements-dev.txt):
+    python -m scripts.check_query_plans
+"""
+import asyncio
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+
+_tmpdir = tempfile.mkdtemp(prefix="query-plans-")
+DATABASE_PATH = os.path.join(_tmpdir, "plans.db")
+
+# A configuração precisa apontar para o banco temporário antes de importar a aplicação
+os.environ["DATABASE_URL"] = f"sqlite:///{DATABASE_PATH}"
+os.environ["DEBUG"] = "False"
+os.environ["RATE_LIMIT_BACKEND"] = "memory"
+os.environ.setdefault("SECRET_KEY", "query-plan-check")
+
+import httpx  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from app.database import Base, async_engine, run_migrations  # noqa: E402
+from app.main import app, lifespan  # noqa: E402
+
+APP_TABLES = set(Base.metadata.tables)
+SCAN_PATTERN = re.compile(r"^SCAN (\w+)")
+
+# Rotas de leitura verificadas; {investment_id} e {expenses_cursor} são preenchidos após o seed
+CHECKED_ROUTES = [
+    ("/auth/me", {}),
+    ("/expenses", {}),
+    ("/expenses", {"search": "mercado"}),
+    ("/expenses", {"start_date": "2026-01-01T00:00:00", "end_date": "2026-12-31T00:00:00"}),
+    ("/expenses", {"limit": 5, "cursor": "{expenses_cursor}"}),
+    ("/expenses/stats", {}),
+    ("/expenses/stats", {"start_date": "2026-01-01T00:00:00"}),
+    ("/investments", {}),
+    ("/investments/stats", {}),
+    ("/investments/{investment_id}/history", {}),
+    ("/investments/{investment_id}/history/series", {}),
+    ("/investments/{investment_id}/history/series", {"sampling": "ohlc"}),
+    ("/investments/performance", {}),
+    ("/investments/timeseries", {}),
+    ("/recurring-expenses", {}),
+    ("/payment-methods", {}),
+    ("/dashboard", {}),
+    ("/dashboard", {"period": "year"}),
+    ("/dashboard/monthly-trend", {"months": 24}),
+]
+
+
+async def _seed(client: httpx.AsyncClient) -> dict:
+    response = await client.post(
+        "/auth/register",
+        json={"name": "Query Plan", "email": "plans@example.com", "password": "query-plan-check"},
+    )
+    response.raise_for_status()
+    headers = {"Authorization": f"Bearer {response.json()['token']}"}
+
+    for month in range(1, 13):
+        await client.post("/expenses", headers=headers, json={
+            "name": "Mercado",
+            "value": 100 + month,
+            "category": "Alimentação",
+            "date": f"2026-{month:02d}-10T12:00:00",
+            "payment_method": "pix",
+        })
+    await client.post("/payment-methods", headers=headers, json={"name": "Cartão", "type": "credit-card"})
+    await client.post("/recurring-expenses", headers=headers, json={
+        "name": "Aluguel",
+        "value": 1500,
+        "category": "Moradia",
+        "frequency": "monthly",
+        "start_date": "2026-01-01T00:00:00",
+    })
+    response = await client.post("/investments", headers=headers, json={
+        "name": "Tesouro Selic",
+        "type": "Renda Fixa",
+        "value": 1000,
+        "purchase_date": "2026-01-01T00:00:00",
+        "current_value": 1010,
+    })
+    response.raise_for_status()
+    investment_id = response.json()["id"]
+
+    response = await client.get("/expenses", params={"limit": 1}, headers=headers)
+    response.raise_for_status()
+
+    return {
+        "headers": headers,
+        "investment_id": investment_id,
+        "expenses_cursor": response.headers["X-Next-Cursor"],
+    }
+
+
+async def _capture_queries() -> list:
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, tuple(parameters or ())))
+
+    run_migrations()
+    async with lifespan(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://check/api/v1") as client:
+            seed = await _seed(client)
+            event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+            try:
+                for path, params in CHECKED_ROUTES:
+                    response = await client.get(
+                        path.format(**seed),
+                        params={key: str(value).format(**seed) for key, value in params.items()},
+                        headers=seed["headers"],
+                    )
+                    response.raise_for_status()
+            finally:
+                event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+    # Remover duplicatas preservando a ordem
+    return list(dict.fromkeys(captured))
+
+
+def _full_scans(connection: sqlite3.Connection, statement: str, parameters: tuple) -> list:
+    plan = connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    scans = []
+    for _, _, _, detail in plan:
+        match = SCAN_PATTERN.match(detail)
+        if match and match.group(1) in APP_TABLES:
+            scans.append(detail)
+    return scans
+
+
+def main() -> int:
+    queries = asyncio.run(_capture_queries())
+
+    failures = []
+    with sqlite3.connect(DATABASE_PATH) as connection:
+        for statement, parameters in queries:
+            scans = _full_scans(connection, statement, parameters)
+            if scans:
+                failures.append((statement, scans))
+
+    print(f"{len(queries)} consultas verificadas")
+    for statement, scans in failures:
+        print("\nVarredura completa detectada:")
+        print("  " + " ".join(statement.split()))
+        for detail in scans:
+            print(f"  -> {detail}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
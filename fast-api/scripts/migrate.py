@@ -0,0 +1,25 @@
+"""Aplicar as migrações pendentes do banco de dados.
+
+Bancos criados antes do Alembic são marcados na revisão inicial antes do upgrade.
+Rode uma vez antes de iniciar o servidor; com vários workers, cada um executaria
+as migrações ao mesmo tempo.
+
+Uso (a partir de fast-api/):
+    python -m scripts.migrate
+"""
+import argparse
+import sys
+from app.database import run_migrations
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args()
+
+    run_migrations()
+    print("Migrações aplicadas")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+"""Recalcular a tabela de totais mensais de despesas a partir das despesas.
+
+Os totais são mantidos pelos próprios endpoints; este comando serve para o
+preenchimento inicial ou para corrigir divergências.
+
+Uso (a partir de fast-api/):
+    python -m scripts.rebuild_rollups [--user-id ID]
+"""
+import argparse
+import asyncio
+import sys
+from app.database import AsyncSessionLocal, async_engine
+from app.services.rollups import rebuild_rollups
+
+
+async def _rebuild(user_id):
+    async with AsyncSessionLocal() as db:
+        await rebuild_rollups(db, user_id)
+        await db.commit()
+    await async_engine.dispose()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--user-id", help="Recalcular apenas os totais deste usuário")
+    args = parser.parse_args()
+
+    asyncio.run(_rebuild(args.user_id))
+    print("Totais mensais recalculados")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+"""Reconstruir os índices de busca textual (FTS5) a partir das tabelas de origem.
+
+Os índices são mantidos por triggers; este comando serve para corrigir
+divergências depois de recriar as tabelas de origem (migrações em batch) ou de
+um VACUUM, que pode renumerar os rowids.
+
+Uso (a partir de fast-api/):
+    python -m scripts.rebuild_search_index
+"""
+import argparse
+import asyncio
+import sys
+from app.database import AsyncSessionLocal, async_engine
+from app.services.search import SEARCH_INDEXES
+
+
+async def _rebuild():
+    async with AsyncSessionLocal() as db:
+        for index in SEARCH_INDEXES:
+            await index.rebuild(db)
+        await db.commit()
+    await async_engine.dispose()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args()
+
+    asyncio.run(_rebuild())
+    print("Índices de busca reconstruídos")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,8 +10,9 @@ call venv\Scripts\activate.bat
 echo [2/4] Instalando dependencias...
 pip install -r requirements.txt
 
-echo [3/4] Criando banco de dados...
-python -c "from app.database import Base, engine; Base.metadata.create_all(bind=engine); print('Banco de dados criado com sucesso!')"
+echo [3/4] Aplicando migracoes do banco de dados...
+python -m scripts.migrate
+if errorlevel 1 exit /b 1
 
 echo [4/4] Iniciando servidor...
 echo.
@@ -11,8 +11,8 @@ source venv/bin/activate
 echo "[2/4] Instalando dependências..."
 pip install -r requirements.txt
 
-echo "[3/4] Criando banco de dados..."
-python -c "from app.database import Base, engine; Base.metadata.create_all(bind=engine); print('Banco de dados criado com sucesso!')"
+echo "[3/4] Aplicando migrações do banco de dados..."
+python -m scripts.migrate || exit 1
 
 echo "[4/4] Iniciando servidor..."
 echo ""
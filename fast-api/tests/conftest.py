@@ -0,0 +1,69 @@
+import os
+import tempfile
+import uuid
+
+# A configuração precisa apontar para um banco temporário antes de importar a aplicação
+_tmpdir = tempfile.mkdtemp(prefix="tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmpdir, 'test.db')}"
+os.environ["DEBUG"] = "False"
+os.environ["RATE_LIMIT_ENABLED"] = "False"
+os.environ["RATE_LIMIT_BACKEND"] = "memory"
+os.environ["SCHEDULER_ENABLED"] = "False"
+os.environ["PASSWORD_HASH_ROUNDS"] = "4"
+os.environ.setdefault("SECRET_KEY", "tests")
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+from app.core.security import calibrate_password_hashing  # noqa: E402
+from app.database import AsyncSessionLocal, async_engine, run_migrations  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def migrated_database():
+    run_migrations()
+    calibrate_password_hashing()
+    yield
+
+
+@pytest.fixture
+async def db():
+    async with AsyncSessionLocal() as session:
+        yield session
+    await async_engine.dispose()
+
+
+@pytest.fixture
+def user_id():
+    """Usuário isolado por teste; as tabelas não exigem a linha em users."""
+    return str(uuid.uuid4())
+
+
+@pytest.fixture
+async def client():
+    """Cliente HTTP que exercita a aplicação em processo, sem servidor."""
+    async with httpx.AsyncClient(app=app, base_url="http://test") as http:
+        yield http
+    await async_engine.dispose()
+
+
+@pytest.fixture
+async def auth(client):
+    """Registrar um usuário novo e devolver o corpo de /auth/register."""
+    response = await client.post("/api/v1/auth/register", json={
+        "name": "Usuário Teste",
+        "email": f"{uuid.uuid4().hex}@example.com",
+        "password": "senha-segura",
+    })
+    assert response.status_code == 201
+    return response.json()
+
+
+@pytest.fixture
+def headers(auth):
+    return {"Authorization": f"Bearer {auth['token']}"}
@@ -0,0 +1,27 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+BODY = {"name": "Mercado", "value": 50.0, "category": "Alimentação", "date": "2026-04-02T10:00:00"}
+
+
+@pytest.mark.parametrize("path", ["/api/v1/expenses", "/api/v1/dashboard", "/api/v1/investments"])
+async def test_matching_etag_returns_not_modified(client, headers, path):
+    first = await client.get(path, headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    response = await client.get(path, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+
+async def test_writes_change_the_etag(client, headers):
+    etag = (await client.get("/api/v1/expenses", headers=headers)).headers["etag"]
+    assert (await client.post("/api/v1/expenses", headers=headers, json=BODY)).status_code == 201
+
+    response = await client.get("/api/v1/expenses", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert len(response.json()) == 1
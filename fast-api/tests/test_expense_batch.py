@@ -0,0 +1,47 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+EXPENSES = "/api/v1/expenses"
+BODY = {"name": "Mercado", "value": 50.0, "category": "Alimentação", "date": "2026-04-02T10:00:00"}
+
+
+async def test_batch_applies_operations_and_reports_each_result(client, headers):
+    existing = (await client.post(EXPENSES, headers=headers, json=BODY)).json()
+    removed = (await client.post(EXPENSES, headers=headers, json=BODY)).json()
+
+    response = await client.post(f"{EXPENSES}/batch", headers=headers, json={"operations": [
+        {"op": "create", "data": {**BODY, "name": "Padaria"}},
+        {"op": "update", "id": existing["id"], "data": {"value": 75.0}},
+        {"op": "delete", "id": removed["id"]},
+        {"op": "delete", "id": "inexistente"},
+    ]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [(result["index"], result["status"]) for result in results] == [(0, 201), (1, 200), (2, 204), (3, 404)]
+
+    listed = {item["id"]: item for item in (await client.get(EXPENSES, headers=headers)).json()}
+    assert set(listed) == {existing["id"], results[0]["id"]}
+    assert listed[existing["id"]]["value"] == 75.0
+
+
+async def test_batch_cannot_touch_other_users_expenses(client, headers):
+    other = await client.post("/api/v1/auth/register", json={
+        "name": "Outra Pessoa", "email": "outra-pessoa@example.com", "password": "senha-segura",
+    })
+    other_headers = {"Authorization": f"Bearer {other.json()['token']}"}
+    foreign = (await client.post(EXPENSES, headers=other_headers, json=BODY)).json()
+
+    response = await client.post(f"{EXPENSES}/batch", headers=headers, json={"operations": [
+        {"op": "delete", "id": foreign["id"]},
+    ]})
+    assert response.json()["results"][0]["status"] == 404
+    assert len((await client.get(EXPENSES, headers=other_headers)).json()) == 1
+
+
+async def test_batch_rejects_invalid_operations(client, headers):
+    response = await client.post(f"{EXPENSES}/batch", headers=headers, json={"operations": [
+        {"op": "create", "data": {**BODY, "value": -1}},
+    ]})
+    assert response.status_code == 422
+    assert (await client.post(f"{EXPENSES}/batch", headers=headers, json={"operations": []})).status_code == 422
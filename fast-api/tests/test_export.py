@@ -0,0 +1,40 @@
+import csv
+import io
+import json
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+EXPENSES = "/api/v1/expenses"
+
+
+async def create_expenses(client, headers, count):
+    for day in range(1, count + 1):
+        response = await client.post(EXPENSES, headers=headers, json={
+            "name": f"Despesa, {day}", "value": float(day), "category": "Outros",
+            "date": f"2026-05-{day:02d}T09:00:00", "payment_method": "pix",
+        })
+        assert response.status_code == 201
+
+
+async def test_csv_export_streams_every_expense(client, headers):
+    await create_expenses(client, headers, 5)
+    response = await client.get(f"{EXPENSES}/export", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "despesas.csv" in response.headers["content-disposition"]
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["name"] for row in rows] == [f"Despesa, {day}" for day in range(5, 0, -1)]
+    assert rows[0]["payment_method"] == "pix"
+
+
+async def test_ndjson_export_applies_filters(client, headers):
+    await create_expenses(client, headers, 5)
+    response = await client.get(f"{EXPENSES}/export", headers=headers, params={
+        "format": "ndjson", "min_value": 3,
+    })
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["value"] for line in lines] == [5.0, 4.0, 3.0]
+    assert lines[0]["date"] == "2026-05-05T09:00:00"
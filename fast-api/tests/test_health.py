@@ -0,0 +1,18 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+API = "/api/v1"
+
+
+async def test_health(client):
+    response = await client.get("/health")
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
+
+
+async def test_me_requires_token(client, auth, headers):
+    assert (await client.get(f"{API}/auth/me")).status_code in (401, 403)
+    response = await client.get(f"{API}/auth/me", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["id"] == auth["user"]["id"]
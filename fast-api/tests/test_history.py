@@ -0,0 +1,58 @@
+import math
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import insert
+from app.models.investment import InvestmentHistory
+
+pytestmark = pytest.mark.anyio
+
+INVESTMENTS = "/api/v1/investments"
+
+
+async def create_investment_with_history(client, headers, db, points):
+    investment = (await client.post(INVESTMENTS, headers=headers, json={
+        "name": "Tesouro", "type": "Renda Fixa", "value": 1000.0, "current_value": 1000.0,
+        "purchase_date": "2020-01-01T00:00:00",
+    })).json()
+    start = datetime(2020, 1, 1)
+    await db.execute(insert(InvestmentHistory), [
+        {
+            "investment_id": investment["id"],
+            "date": start + timedelta(hours=6 * i),
+            "value": 1000.0 + 100 * math.sin(i / 40) + (500.0 if i == 1234 else 0.0),
+        }
+        for i in range(points)
+    ])
+    await db.commit()
+    return investment
+
+
+async def test_history_is_downsampled_by_default(client, headers, db):
+    investment = await create_investment_with_history(client, headers, db, 5000)
+    response = await client.get(f"{INVESTMENTS}/{investment['id']}/history", headers=headers)
+    assert response.status_code == 200
+    history = response.json()
+    assert len(history) == 300
+    dates = [item["date"] for item in history]
+    assert dates == sorted(dates, reverse=True)
+    # O primeiro e o último registro e o pico isolado sobrevivem à redução
+    assert dates[-1] == "2020-01-01T00:00:00"
+    assert max(item["value"] for item in history) > 1400
+    assert set(history[0]) == {"id", "investment_id", "value", "date"}
+
+
+async def test_history_max_points_and_small_histories(client, headers, db):
+    investment = await create_investment_with_history(client, headers, db, 50)
+    path = f"{INVESTMENTS}/{investment['id']}/history"
+    assert len((await client.get(path, headers=headers)).json()) == 51
+    assert len((await client.get(path, headers=headers, params={"max_points": 10})).json()) == 10
+    assert (await client.get(path, headers=headers, params={"max_points": 2})).status_code == 422
+
+
+async def test_history_series_respects_max_points(client, headers, db):
+    investment = await create_investment_with_history(client, headers, db, 5000)
+    path = f"{INVESTMENTS}/{investment['id']}/history/series"
+    line = (await client.get(path, headers=headers, params={"max_points": 100})).json()
+    assert len(line["points"]) == 100
+    candles = (await client.get(path, headers=headers, params={"sampling": "ohlc", "max_points": 20})).json()
+    assert 0 < len(candles["candles"]) <= 20
@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import func, select
+from app.models.expense import Expense
+from app.services.importer import parse_amount
+
+pytestmark = pytest.mark.anyio
+
+STATEMENT = (
+    "data;descrição;valor\n"
+    "05/03/2026;Mercado;-1.234,56\n"
+    "06/03/2026;Salário;5.000,00\n"
+    "07/03/2026;Padaria;-12,50\n"
+    "08/03/2026;Farmácia;abc\n"
+)
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("-1.234,56", -1234.56),
+    ("1,234.56", 1234.56),
+    ("R$ 45,90", 45.90),
+    ("45.90", 45.90),
+    ("1.234.567,89", 1234567.89),
+    ("1,234,567", 1234567.0),
+    ("-12", -12.0),
+])
+def test_parse_amount_uses_last_separator_as_decimal(raw, expected):
+    assert parse_amount(raw) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("1.234", 1234.0),
+    ("-12.500", -12500.0),
+    ("1.234.567", 1234567.0),
+    ("0.123", 0.123),
+    ("1.5", 1.5),
+    ("1,234", 1.234),
+])
+def test_parse_amount_single_separator_follows_pt_br(raw, expected):
+    assert parse_amount(raw) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("raw", ["", "abc", "12-3", "1,2,3.4.5x"])
+def test_parse_amount_rejects_invalid_values(raw):
+    with pytest.raises(ValueError):
+        parse_amount(raw)
+
+
+async def test_import_endpoint_skips_credits_and_duplicates(client, auth, headers, db):
+    files = {"file": ("extrato.csv", STATEMENT.encode("utf-8"), "text/csv")}
+    response = await client.post("/api/v1/expenses/import", headers=headers, files=files)
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["imported"], result["duplicates"], result["skipped"], result["failed"]) == (2, 0, 1, 1)
+    assert result["errors"][0]["line"] == 5
+
+    response = await client.post("/api/v1/expenses/import", headers=headers, files=files)
+    assert (response.json()["imported"], response.json()["duplicates"]) == (0, 2)
+
+    total = await db.scalar(select(func.sum(Expense.value)).where(Expense.user_id == auth["user"]["id"]))
+    assert total == pytest.approx(1247.06)
+
+
+async def test_import_endpoint_accepts_positive_expense_lists(client, headers):
+    files = {"file": ("despesas.csv", b"date,name,value,category\n2026-03-05,Aluguel,1.500,Moradia\n", "text/csv")}
+    response = await client.post(
+        "/api/v1/expenses/import", headers=headers, files=files, params={"amount_sign": "positive"},
+    )
+    assert response.json()["imported"] == 1
+    listed = (await client.get("/api/v1/expenses", headers=headers)).json()
+    assert (listed[0]["value"], listed[0]["category"]) == (1500.0, "Moradia")
@@ -0,0 +1,45 @@
+import os
+import pytest
+from alembic import command
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, text
+from app.database import BASELINE_REVISION, get_alembic_config, run_migrations
+
+
+def current_revision(url):
+    engine = create_engine(url)
+    try:
+        with engine.connect() as connection:
+            return connection.execute(text("SELECT version_num FROM alembic_version")).scalar_one_or_none()
+    finally:
+        engine.dispose()
+
+
+@pytest.fixture
+def legacy_database(tmp_path):
+    """Banco com o esquema da revisão inicial, como criado antes do Alembic."""
+    url = f"sqlite:///{os.path.join(tmp_path, 'legacy.db')}"
+    command.upgrade(get_alembic_config(url), BASELINE_REVISION)
+    return url
+
+
+@pytest.mark.parametrize("version_table", ["dropped", "emptied"])
+def test_legacy_database_is_stamped_before_upgrade(legacy_database, version_table):
+    engine = create_engine(legacy_database)
+    with engine.begin() as connection:
+        # "emptied" é o estado deixado por um `alembic upgrade head` direto que falhou
+        statement = "DROP TABLE alembic_version" if version_table == "dropped" else "DELETE FROM alembic_version"
+        connection.execute(text(statement))
+    engine.dispose()
+
+    run_migrations(legacy_database)
+    head = ScriptDirectory.from_config(get_alembic_config(legacy_database)).get_current_head()
+    assert current_revision(legacy_database) == head
+
+
+def test_new_database_is_migrated_from_scratch(tmp_path):
+    url = f"sqlite:///{os.path.join(tmp_path, 'new.db')}"
+    run_migrations(url)
+    run_migrations(url)
+    head = ScriptDirectory.from_config(get_alembic_config(url)).get_current_head()
+    assert current_revision(url) == head
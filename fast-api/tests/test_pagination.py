@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+import pytest
+from fastapi import HTTPException, Response
+from sqlalchemy import insert, select
+from app.core.pagination import NEXT_CURSOR_HEADER, SortKey, apply_keyset, decode_cursor, paginate
+from app.models.expense import Expense
+
+pytestmark = pytest.mark.anyio
+
+# Direções mistas e muitos empates, para exercitar a expansão em OR da condição do cursor
+MIXED_SORT = (SortKey(Expense.category), SortKey(Expense.value, descending=True), SortKey(Expense.id))
+
+
+async def fetch_all_pages(db, user_id, keys, limit):
+    pages, cursor = [], None
+    while True:
+        query = apply_keyset(select(Expense.id, Expense.category, Expense.value, Expense.date).where(Expense.user_id == user_id), keys, cursor, limit)
+        response = Response()
+        rows = paginate((await db.execute(query)).mappings().all(), keys, limit, response)
+        pages.append([row["id"] for row in rows])
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("keys", [
+    MIXED_SORT,
+    (SortKey(Expense.date, descending=True), SortKey(Expense.id, descending=True)),
+])
+async def test_pages_cover_the_full_ordering_once(db, user_id, keys):
+    start = datetime(2026, 1, 1)
+    await db.execute(insert(Expense), [
+        {
+            "id": f"{i:03d}",
+            "user_id": user_id,
+            "name": "Teste",
+            "category": ("A", "B", "C")[i % 3],
+            "value": float(i % 4),
+            "date": start + timedelta(days=i % 5),
+        }
+        for i in range(47)
+    ])
+    order = [key.column.desc() if key.descending else key.column.asc() for key in keys]
+    expected = (await db.execute(select(Expense.id).where(Expense.user_id == user_id).order_by(*order))).scalars().all()
+
+    pages = await fetch_all_pages(db, user_id, keys, limit=10)
+    assert [len(page) for page in pages] == [10, 10, 10, 10, 7]
+    assert [row for page in pages for row in page] == expected
+    await db.rollback()
+
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(HTTPException) as error:
+        decode_cursor("not-a-cursor", MIXED_SORT)
+    assert error.value.status_code == 400
+
+
+async def test_expenses_endpoint_follows_next_cursor(client, headers):
+    for day in range(1, 8):
+        response = await client.post("/api/v1/expenses", headers=headers, json={
+            "name": f"Despesa {day}", "value": 10.0 * day, "category": "Outros",
+            "date": f"2026-03-{day:02d}T12:00:00",
+        })
+        assert response.status_code == 201
+
+    names, params = [], {"limit": 3}
+    while True:
+        response = await client.get("/api/v1/expenses", headers=headers, params=params)
+        assert response.status_code == 200
+        names.extend(item["name"] for item in response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            break
+        params = {"limit": 3, "cursor": cursor}
+    assert names == [f"Despesa {day}" for day in range(7, 0, -1)]
+
+    response = await client.get("/api/v1/expenses", headers=headers, params={"cursor": "lixo"})
+    assert response.status_code == 400
@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta
+import uuid
+import numpy as np
+import pytest
+from sqlalchemy import insert
+from app.models.investment import Investment, InvestmentHistory
+from app.services.performance import DAYS_PER_YEAR, PerformanceEngine, chain_linked_return, xirr
+
+START = datetime(2025, 1, 1)
+NOW = datetime(2026, 1, 1)
+
+
+def test_xirr_matches_closed_form_for_two_flows():
+    # -100 hoje, +121 em dois anos: 10% ao ano
+    rates = xirr(np.array([0, 0]), np.array([0.0, 2.0]), np.array([-100.0, 121.0]), 1)
+    assert np.allclose(rates, [0.10])
+
+
+def test_xirr_solves_groups_independently():
+    groups = np.array([0, 0, 1, 1, 1])
+    years = np.array([0.0, 1.0, 0.0, 0.5, 1.0])
+    amounts = np.array([-100.0, 90.0, -100.0, -100.0, 230.0])
+    rates = xirr(groups, years, amounts, 2)
+    assert np.isclose(rates[0], -0.10)
+    for group in range(2):
+        mask = groups == group
+        t = years[mask] - years[mask].min()
+        assert abs(np.sum(amounts[mask] * (1 + rates[group]) ** -t)) < 1e-6
+
+
+def test_xirr_returns_nan_without_sign_change():
+    groups = np.array([0, 0, 1, 1])
+    years = np.array([0.0, 1.0, 0.0, 1.0])
+    amounts = np.array([-100.0, 110.0, -100.0, -50.0])
+    rates = xirr(groups, years, amounts, 2)
+    assert np.isclose(rates[0], 0.10)
+    assert np.isnan(rates[1])
+
+
+def test_xirr_uses_actual_day_counts():
+    years = np.array([0.0, 182.5]) / DAYS_PER_YEAR
+    rate = xirr(np.array([0, 0]), years, np.array([-100.0, 105.0]), 1)[0]
+    assert np.isclose(rate, 1.05 ** 2 - 1)
+
+
+def test_chain_linked_return_ignores_contributions():
+    # 100 rende 10% (110), recebe aporte de 100 (210) e rende 0% até o fim
+    values = np.array([[100.0, 210.0, 210.0]])
+    flows = np.array([[100.0, 100.0, 0.0]])
+    assert np.allclose(chain_linked_return(values, flows), [0.10])
+
+
+def test_chain_linked_return_neutral_before_first_contribution():
+    values = np.array([[0.0, 100.0, 120.0]])
+    flows = np.array([[0.0, 100.0, 0.0]])
+    assert np.allclose(chain_linked_return(values, flows), [0.20])
+
+
+async def add_position(db, user_id, type_, value, current, purchased_day, history=()):
+    investment_id = str(uuid.uuid4())
+    await db.execute(insert(Investment), [{
+        "id": investment_id, "user_id": user_id, "name": f"Ativo {purchased_day}", "type": type_,
+        "value": value, "current_value": current, "purchase_date": START + timedelta(days=purchased_day),
+    }])
+    if history:
+        await db.execute(insert(InvestmentHistory), [
+            {"investment_id": investment_id, "date": START + timedelta(days=day), "value": point}
+            for day, point in history
+        ])
+    return investment_id
+
+
+@pytest.mark.anyio
+async def test_group_twr_uses_history_values_at_contribution_dates(db, user_id):
+    # A dobra antes do aporte em B; depois disso nada rende. O retorno simples do grupo
+    # seria 1200/1100 - 1, mas o TWR encadeado é de 100%
+    await add_position(db, user_id, "Ações", 100.0, 200.0, 0, history=[(-5, 999.0), (10, 200.0)])
+    await add_position(db, user_id, "Ações", 1000.0, 1000.0, 20)
+    await add_position(db, user_id, "FII", 500.0, 550.0, 30, history=[(30, 999.0), (40, 520.0)])
+
+    performance = await PerformanceEngine(db, user_id, NOW).build()
+    assert performance.by_type["Ações"].twr_percentage == pytest.approx(100.0)
+    assert performance.by_type["FII"].twr_percentage == pytest.approx(10.0)
+    # Carteira: 100 -> 200 até o dia 20, neutra até o dia 30 e só o FII rende depois
+    assert performance.portfolio.twr_percentage == pytest.approx(200 * (1750 / 1700) - 100)
+    await db.rollback()
+
+
+@pytest.mark.anyio
+async def test_position_twr_chains_its_own_history(db, user_id):
+    await add_position(db, user_id, "ETF", 100.0, 99.0, 0, history=[(10, 120.0), (20, 90.0)])
+    await add_position(db, user_id, "ETF", 100.0, 100.0, 5)
+
+    performance = await PerformanceEngine(db, user_id, NOW).build()
+    twr = [item.twr_percentage for item in performance.investments]
+    assert twr == pytest.approx([(1.2 * 0.75 * 1.1 - 1) * 100, 0.0])
+    await db.rollback()
+
+
+@pytest.mark.anyio
+async def test_performance_endpoint(client, headers):
+    assert (await client.get("/api/v1/investments/performance", headers=headers)).json()["investments"] == []
+    await client.post("/api/v1/investments", headers=headers, json={
+        "name": "Tesouro", "type": "Renda Fixa", "value": 1000.0, "current_value": 1100.0,
+        "purchase_date": "2025-01-01T00:00:00",
+    })
+    response = await client.get("/api/v1/investments/performance", headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["portfolio"]["twr_percentage"] == pytest.approx(10.0)
+    assert body["by_type"]["Renda Fixa"]["invested"] == 1000.0
+    assert body["investments"][0]["xirr_percentage"] > 0
@@ -0,0 +1,107 @@
+from datetime import date, datetime
+import pytest
+from app.models.recurring_expense import RecurringExpense, RecurringFrequency
+from app.services.recurrence import next_occurrence, occurrence_dates, reschedule
+
+RECURRING = "/api/v1/recurring-expenses"
+
+
+def recurring(frequency, start_date, **kwargs) -> RecurringExpense:
+    return RecurringExpense(
+        name="Teste", value=10.0, category="Outros", frequency=frequency,
+        start_date=start_date, is_active=True, **kwargs,
+    )
+
+
+def test_monthly_day_is_clamped_to_month_length():
+    item = recurring(RecurringFrequency.MONTHLY, datetime(2024, 1, 31, 9, 30), day_of_month=31)
+    dates = occurrence_dates(item, datetime(2024, 1, 1), datetime(2024, 4, 30))
+    assert dates == [
+        datetime(2024, 1, 31, 9, 30),
+        datetime(2024, 2, 29, 9, 30),
+        datetime(2024, 3, 31, 9, 30),
+        datetime(2024, 4, 30, 9, 30),
+    ]
+
+
+def test_weekly_day_of_week_zero_is_sunday():
+    item = recurring(RecurringFrequency.WEEKLY, datetime(2026, 1, 1), day_of_week=0)
+    dates = occurrence_dates(item, datetime(2026, 1, 1), datetime(2026, 1, 31))
+    assert [d.date() for d in dates] == [date(2026, 1, 4), date(2026, 1, 11), date(2026, 1, 18), date(2026, 1, 25)]
+    assert all(d.weekday() == 6 for d in dates)
+
+
+def test_yearly_uses_start_month_and_feb_29_falls_back():
+    item = recurring(RecurringFrequency.YEARLY, datetime(2024, 2, 29))
+    dates = occurrence_dates(item, datetime(2024, 1, 1), datetime(2026, 12, 31))
+    assert [d.date() for d in dates] == [date(2024, 2, 29), date(2025, 2, 28), date(2026, 2, 28)]
+
+
+def test_window_is_bounded_by_start_and_end_dates():
+    item = recurring(
+        RecurringFrequency.MONTHLY, datetime(2026, 3, 10), day_of_month=10, end_date=datetime(2026, 5, 10),
+    )
+    dates = occurrence_dates(item, datetime(2026, 1, 1), datetime(2026, 12, 31))
+    assert [d.date() for d in dates] == [date(2026, 3, 10), date(2026, 4, 10), date(2026, 5, 10)]
+    assert occurrence_dates(item, datetime(2026, 6, 1), datetime(2026, 12, 31)) == []
+
+
+
+
+def test_reschedule_keeps_overdue_occurrence():
+    item = recurring(RecurringFrequency.MONTHLY, datetime(2026, 1, 5), day_of_month=5)
+    item.next_due_date = datetime(2026, 8, 5)
+    reschedule(item, date(2026, 10, 17))
+    assert item.next_due_date == datetime(2026, 8, 5)
+
+    item.next_due_date = None
+    reschedule(item, date(2026, 10, 17))
+    assert item.next_due_date == datetime(2026, 11, 5)
+
+
+@pytest.mark.parametrize("frequency, start_date, expected", [
+    (RecurringFrequency.MONTHLY, datetime(2028, 3, 15), datetime(2028, 3, 15)),
+    (RecurringFrequency.YEARLY, datetime(2027, 12, 1), datetime(2027, 12, 1)),
+    (RecurringFrequency.WEEKLY, datetime(2030, 1, 2), datetime(2030, 1, 2)),
+])
+def test_next_occurrence_of_a_far_future_start(frequency, start_date, expected):
+    item = recurring(frequency, start_date)
+    assert next_occurrence(item, date(2026, 10, 17)) == expected
+
+
+def test_next_occurrence_after_end_date_is_none():
+    item = recurring(RecurringFrequency.MONTHLY, datetime(2025, 1, 5), end_date=datetime(2025, 6, 5))
+    assert next_occurrence(item, date(2026, 10, 17)) is None
+
+
+@pytest.mark.anyio
+async def test_generate_is_idempotent_and_delete_keeps_expenses(client, headers):
+    created = await client.post(RECURRING, headers=headers, json={
+        "name": "Academia", "value": 99.9, "category": "Saúde", "frequency": "monthly",
+        "day_of_month": 10, "start_date": "2026-01-10T08:00:00",
+    })
+    assert created.status_code == 201
+    recurring_id = created.json()["id"]
+    window = {"start_date": "2026-01-01T00:00:00", "end_date": "2026-06-30T00:00:00"}
+
+    first = await client.post(f"{RECURRING}/{recurring_id}/generate", headers=headers, json=window)
+    second = await client.post(f"{RECURRING}/{recurring_id}/generate", headers=headers, json=window)
+    assert (first.json()["generated"], second.json()["generated"]) == (6, 0)
+
+    assert (await client.delete(f"{RECURRING}/{recurring_id}", headers=headers)).status_code == 204
+    expenses = (await client.get("/api/v1/expenses", headers=headers, params={"is_recurring": True})).json()
+    assert len(expenses) == 6
+
+
+@pytest.mark.anyio
+async def test_far_future_recurrence_is_scheduled(client, headers):
+    created = await client.post(RECURRING, headers=headers, json={
+        "name": "Seguro", "value": 1200.0, "category": "Outros", "frequency": "yearly",
+        "start_date": "2029-05-20T09:00:00",
+    })
+    assert created.json()["next_due_date"] == "2029-05-20T09:00:00"
+
+    toggled = await client.patch(f"{RECURRING}/{created.json()['id']}/toggle-active", headers=headers)
+    assert toggled.json()["next_due_date"] is None
+    toggled = await client.patch(f"{RECURRING}/{created.json()['id']}/toggle-active", headers=headers)
+    assert toggled.json()["next_due_date"] == "2029-05-20T09:00:00"
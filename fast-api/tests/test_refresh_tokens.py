@@ -0,0 +1,59 @@
+import pytest
+from app.services.refresh_tokens import issue_refresh_token, rotate_refresh_token
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_rotation_issues_a_new_token(db, user_id):
+    token = await issue_refresh_token(db, user_id)
+    await db.flush()
+    rotated = await rotate_refresh_token(db, token)
+    assert rotated is not None
+    assert rotated[0] == user_id
+    assert rotated[1] != token
+    await db.rollback()
+
+
+async def test_reusing_a_rotated_token_revokes_the_session(db, user_id):
+    first = await issue_refresh_token(db, user_id)
+    other_session = await issue_refresh_token(db, user_id)
+    await db.flush()
+    _, second = await rotate_refresh_token(db, first)
+    await db.flush()
+
+    # Reutilização do token já trocado: recusado e a sessão inteira é revogada
+    assert await rotate_refresh_token(db, first) is None
+    assert await rotate_refresh_token(db, second) is None
+    # Outras sessões do usuário continuam válidas
+    assert await rotate_refresh_token(db, other_session) is not None
+    await db.rollback()
+
+
+async def test_unknown_token_is_rejected(db, user_id):
+    assert await rotate_refresh_token(db, "desconhecido") is None
+
+
+async def test_refresh_endpoint_rotates_and_logout_revokes(client, auth, headers):
+    # Mesmo nome de campo na resposta e no corpo de /auth/refresh e /auth/logout
+    assert "refreshToken" in auth and "refresh_token" not in auth
+    first = auth["refreshToken"]
+
+    response = await client.post("/api/v1/auth/refresh", json={"refreshToken": first})
+    assert response.status_code == 200
+    second = response.json()["refreshToken"]
+    assert second != first
+    assert response.json()["user"]["id"] == auth["user"]["id"]
+
+    response = await client.post("/api/v1/auth/logout", headers=headers, json={"refreshToken": second})
+    assert response.status_code == 200
+    response = await client.post("/api/v1/auth/refresh", json={"refreshToken": second})
+    assert response.status_code == 401
+
+
+async def test_refresh_endpoint_detects_reuse(client, auth):
+    first = auth["refreshToken"]
+    second = (await client.post("/api/v1/auth/refresh", json={"refreshToken": first})).json()["refreshToken"]
+
+    assert (await client.post("/api/v1/auth/refresh", json={"refreshToken": first})).status_code == 401
+    # A reutilização revoga a sessão inteira, inclusive o token mais recente
+    assert (await client.post("/api/v1/auth/refresh", json={"refreshToken": second})).status_code == 401
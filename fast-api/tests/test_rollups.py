@@ -0,0 +1,79 @@
+from datetime import date, datetime
+import pytest
+from sqlalchemy import insert, select
+from app.models.expense import Expense
+from app.models.expense_rollup import ExpenseMonthlyRollup
+from app.services.rollups import RollupDeltas, rebuild_rollups
+
+pytestmark = pytest.mark.anyio
+
+
+async def rollup_rows(db, user_id):
+    result = await db.execute(
+        select(ExpenseMonthlyRollup.month, ExpenseMonthlyRollup.category, ExpenseMonthlyRollup.total, ExpenseMonthlyRollup.count)
+        .where(ExpenseMonthlyRollup.user_id == user_id)
+        .order_by(ExpenseMonthlyRollup.month, ExpenseMonthlyRollup.category)
+    )
+    return [tuple(row) for row in result.all()]
+
+
+def expense(user_id, when, category, value):
+    return {"user_id": user_id, "name": "Teste", "date": when, "category": category, "value": value}
+
+
+async def test_deltas_match_full_rebuild(db, user_id):
+    rows = [
+        expense(user_id, datetime(2026, 1, 5), "Alimentação", 10.0),
+        expense(user_id, datetime(2026, 1, 31, 23, 59), "Alimentação", 15.5),
+        expense(user_id, datetime(2026, 2, 1), "Alimentação", 7.0),
+        expense(user_id, datetime(2026, 2, 14), "Lazer", 40.0),
+    ]
+    await db.execute(insert(Expense), rows)
+    deltas = RollupDeltas()
+    deltas.add_rows(rows)
+    await deltas.apply(db)
+    incremental = await rollup_rows(db, user_id)
+
+    await rebuild_rollups(db, user_id)
+    assert await rollup_rows(db, user_id) == incremental
+    assert incremental == [
+        (date(2026, 1, 1), "Alimentação", 25.5, 2),
+        (date(2026, 2, 1), "Alimentação", 7.0, 1),
+        (date(2026, 2, 1), "Lazer", 40.0, 1),
+    ]
+    await db.rollback()
+
+
+async def test_deltas_accumulate_and_drop_empty_months(db, user_id):
+    deltas = RollupDeltas()
+    deltas.add(user_id, datetime(2026, 3, 1), "Moradia", 1500.0)
+    deltas.add(user_id, datetime(2026, 4, 1), "Moradia", 1500.0)
+    await deltas.apply(db)
+
+    # Mover a despesa de abril para março
+    deltas.remove(user_id, datetime(2026, 4, 1), "Moradia", 1500.0)
+    deltas.add(user_id, datetime(2026, 3, 20), "Moradia", 200.0)
+    await deltas.apply(db)
+
+    assert await rollup_rows(db, user_id) == [(date(2026, 3, 1), "Moradia", 1700.0, 2)]
+    await db.rollback()
+
+
+async def test_expense_endpoints_keep_rollups_in_sync(client, auth, headers, db):
+    user_id = auth["user"]["id"]
+    body = {"name": "Mercado", "value": 80.0, "category": "Alimentação", "date": "2026-01-20T10:00:00"}
+    first = (await client.post("/api/v1/expenses", headers=headers, json=body)).json()
+    second = (await client.post("/api/v1/expenses", headers=headers, json={**body, "value": 20.0})).json()
+    await client.put(f"/api/v1/expenses/{first['id']}", headers=headers, json={
+        "category": "Lazer", "date": "2026-02-03T10:00:00",
+    })
+    await client.delete(f"/api/v1/expenses/{second['id']}", headers=headers)
+    await client.post("/api/v1/expenses/batch", headers=headers, json={"operations": [
+        {"op": "create", "data": {**body, "value": 5.0}},
+    ]})
+
+    incremental = await rollup_rows(db, user_id)
+    assert incremental == [(date(2026, 1, 1), "Alimentação", 5.0, 1), (date(2026, 2, 1), "Lazer", 80.0, 1)]
+    await rebuild_rollups(db, user_id)
+    assert await rollup_rows(db, user_id) == incremental
+    await db.rollback()
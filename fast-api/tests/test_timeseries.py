@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+INVESTMENTS = "/api/v1/investments"
+
+
+async def create_investment(client, headers, **fields):
+    response = await client.post(INVESTMENTS, headers=headers, json={
+        "name": "Ativo", "type": "Renda Fixa", "value": 1000.0, "current_value": 1000.0, **fields,
+    })
+    assert response.status_code == 201
+    return response.json()
+
+
+async def test_future_purchase_is_left_out_of_the_series(client, headers):
+    await create_investment(client, headers, purchase_date="2026-01-01T00:00:00", current_value=1100.0)
+    # O ponto inicial do histórico é gravado agora, antes da data do aporte
+    await create_investment(client, headers, type="Ações", purchase_date="2099-01-01T00:00:00")
+
+    today = datetime.utcnow().date()
+    response = await client.get(f"{INVESTMENTS}/timeseries", headers=headers, params={
+        "start_date": (today - timedelta(days=2)).isoformat(),
+    })
+    assert response.status_code == 200
+    series = response.json()
+    assert series["dates"][-1] == today.isoformat()
+    assert series["total"] == [1000.0, 1000.0, 1100.0]
+    assert list(series["series"]) == ["Renda Fixa"]
+
+
+async def test_series_by_investment_and_invalid_ranges(client, headers):
+    first = await create_investment(client, headers, purchase_date="2026-01-02T00:00:00")
+    second = await create_investment(client, headers, purchase_date="2026-01-04T00:00:00", value=500.0)
+
+    response = await client.get(f"{INVESTMENTS}/timeseries", headers=headers, params={
+        "start_date": "2026-01-01", "end_date": "2026-01-05", "group_by": "investment",
+    })
+    series = response.json()
+    assert series["total"] == [0.0, 1000.0, 1000.0, 1500.0, 1500.0]
+    assert series["series"][first["id"]] == [0.0, 1000.0, 1000.0, 1000.0, 1000.0]
+    assert series["series"][second["id"]] == [0.0, 0.0, 0.0, 500.0, 500.0]
+
+    response = await client.get(f"{INVESTMENTS}/timeseries", headers=headers, params={
+        "start_date": "2026-01-05", "end_date": "2026-01-01",
+    })
+    assert response.status_code == 400
+
+
+async def test_empty_portfolio(client, headers):
+    response = await client.get(f"{INVESTMENTS}/timeseries", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["dates"] == []
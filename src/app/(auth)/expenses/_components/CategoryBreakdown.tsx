@@ -3,21 +3,17 @@
 import { useTheme } from '@/context/ThemeContext';
 import { colors } from '@/lib/styles/colors';
 import { Card } from '@/components/Card';
-import type { Expense, Period } from './types';
+import type { Period } from './types';
 
 interface CategoryBreakdownProps {
-  expenses: Expense[];
+  // Totais por categoria já agregados pela API (GET /expenses/stats)
+  categoryTotals: Record<string, number>;
   period: Period;
 }
 
-export function CategoryBreakdown({ expenses }: CategoryBreakdownProps) {
+export function CategoryBreakdown({ categoryTotals }: CategoryBreakdownProps) {
   const { getThemeColor } = useTheme();
 
-  const categoryTotals = expenses.reduce((acc, exp) => {
-    acc[exp.category] = (acc[exp.category] || 0) + exp.value;
-    return acc;
-  }, {} as Record<string, number>);
-
   const total = Object.values(categoryTotals).reduce((sum, val) => sum + val, 0);
 
   const sortedCategories = Object.entries(categoryTotals)
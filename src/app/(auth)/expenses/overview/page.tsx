@@ -3,51 +3,55 @@
 import { useTheme } from '@/context/ThemeContext';
 import { colors } from '@/lib/styles/colors';
 import { Card } from '@/components/Card';
+import { LoadMoreButton } from '@/components/LoadMoreButton';
 import { ExpenseStats } from '../_components/ExpenseStats';
 import { CategoryBreakdown } from '../_components/CategoryBreakdown';
 import { PeriodSelector } from '../_components/PeriodSelector';
-import { useState } from 'react';
+import { useMemo, useState } from 'react';
 import Link from 'next/link';
 import { ArrowLeftIcon } from '@heroicons/react/24/outline';
-import { useExpenses } from '@/hooks/api/useExpenses';
+import { useExpenses, useExpenseStats } from '@/hooks/api/useExpenses';
 import { useRecurringExpenses } from '@/hooks/api/useRecurringExpenses';
 import type { Period } from '@/lib/schemas/expense.schema';
 
+// Calculate date range based on period
+function getDateRange(period: Period) {
+  const now = new Date();
+  const endDate = now.toISOString().split('T')[0];
+  let startDate = '';
+  
+  switch (period) {
+    case 'day':
+      startDate = endDate;
+      break;
+    case 'week':
+      const weekAgo = new Date(now.setDate(now.getDate() - 7));
+      startDate = weekAgo.toISOString().split('T')[0];
+      break;
+    case 'month':
+      const monthAgo = new Date(now.setMonth(now.getMonth() - 1));
+      startDate = monthAgo.toISOString().split('T')[0];
+      break;
+    case 'year':
+      const yearAgo = new Date(now.setFullYear(now.getFullYear() - 1));
+      startDate = yearAgo.toISOString().split('T')[0];
+      break;
+  }
+  
+  // end_date inclui o dia de hoje inteiro
+  return { startDate, endDate: `${endDate}T23:59:59` };
+}
+
 export default function ExpensesOverviewPage() {
   const { getThemeColor } = useTheme();
   const [period, setPeriod] = useState<Period>('month');
   
-  // Calculate date range based on period
-  const getDateRange = (period: Period) => {
-    const now = new Date();
-    const endDate = now.toISOString().split('T')[0];
-    let startDate = '';
-    
-    switch (period) {
-      case 'day':
-        startDate = endDate;
-        break;
-      case 'week':
-        const weekAgo = new Date(now.setDate(now.getDate() - 7));
-        startDate = weekAgo.toISOString().split('T')[0];
-        break;
-      case 'month':
-        const monthAgo = new Date(now.setMonth(now.getMonth() - 1));
-        startDate = monthAgo.toISOString().split('T')[0];
-        break;
-      case 'year':
-        const yearAgo = new Date(now.setFullYear(now.getFullYear() - 1));
-        startDate = yearAgo.toISOString().split('T')[0];
-        break;
-    }
-    
-    return { startDate, endDate };
-  };
-
-  const { startDate, endDate } = getDateRange(period);
+  // Filtros estáveis entre renderizações; um objeto novo a cada render refaria as buscas
+  const filters = useMemo(() => getDateRange(period), [period]);
   
-  // Fetch expenses from API
-  const { expenses, loading } = useExpenses({ startDate, endDate });
+  // Totais agregados pela API; a lista de despesas é carregada uma página por vez
+  const { expenses, loading, hasMore, loadingMore, loadMore } = useExpenses(filters);
+  const { stats, loading: statsLoading } = useExpenseStats(filters);
   const { recurringExpenses, loading: recurringLoading } = useRecurringExpenses();
 
   // Calculate upcoming bills from recurring expenses
@@ -63,12 +67,12 @@ export default function ExpensesOverviewPage() {
   };
 
   // Calculate comparison with previous period
-  const currentTotal = expenses.reduce((sum, exp) => sum + exp.value, 0);
+  const currentTotal = stats?.total ?? 0;
   const previousTotal = 1120; // This would come from another API call with different period
   const savings = previousTotal - currentTotal;
   const savingsPercentage = previousTotal > 0 ? ((savings / previousTotal) * 100) : 0;
 
-  if (loading || recurringLoading) {
+  if (loading || statsLoading || recurringLoading) {
     return (
       <div className="flex items-center justify-center min-h-screen">
         <div className="text-center">
@@ -122,9 +126,10 @@ export default function ExpensesOverviewPage() {
 
       {/* Stats */}
       <ExpenseStats expenses={expenses} />
+      <LoadMoreButton hasMore={hasMore} loading={loadingMore} onClick={loadMore} />
 
       {/* Category Breakdown */}
-      <CategoryBreakdown expenses={expenses} period={period} />
+      <CategoryBreakdown categoryTotals={stats?.byCategory ?? {}} period={period} />
 
       {/* Additional Insights */}
       <div className="grid grid-cols-1 lg:grid-cols-2 gap-6">
@@ -4,6 +4,7 @@ import { useTheme } from '@/context/ThemeContext';
 import { colors } from '@/lib/styles/colors';
 import { Card } from '@/components/Card';
 import { Button } from '@/components/Button';
+import { LoadMoreButton } from '@/components/LoadMoreButton';
 import { Modal } from '@/components/Modal';
 import { RecurringExpenseForm } from '../_components/RecurringExpenseForm';
 import { RecurringExpenseCard } from '../_components/RecurringExpenseCard';
@@ -25,6 +26,9 @@ export default function RecurringExpensesPage() {
     totalYearly,
     loading,
     error,
+    hasMore,
+    loadingMore,
+    loadMore,
     createRecurringExpense,
     deleteRecurringExpense,
     toggleActive,
@@ -230,6 +234,8 @@ export default function RecurringExpensesPage() {
             </div>
           )}
 
+          <LoadMoreButton hasMore={hasMore} loading={loadingMore} onClick={loadMore} />
+
           {/* Empty State */}
           {recurringExpenses.length === 0 && !loading && (
             <Card elevated>
@@ -4,14 +4,15 @@ import { useTheme } from '@/context/ThemeContext';
 import { colors } from '@/lib/styles/colors';
 import { Button } from '@/components/Button';
 import { Modal } from '@/components/Modal';
+import { LoadMoreButton } from '@/components/LoadMoreButton';
 import { GlassCalendar } from '@/components/GlassCalendar';
-import { useState } from 'react';
+import { useMemo, useState } from 'react';
 import { ExpenseForm } from '../_components/ExpenseForm';
 import { ExpenseList } from '../_components/ExpenseList';
 import { PlusIcon, ArrowLeftIcon } from '@heroicons/react/24/outline';
 import { format, isSameDay, parseISO } from 'date-fns';
 import Link from 'next/link';
-import { useExpenses } from '@/hooks/api/useExpenses';
+import { useExpenses, useExpenseStats } from '@/hooks/api/useExpenses';
 import type { CreateExpenseInput } from '@/lib/schemas/expense.schema';
 
 export default function TransactionsPage() {
@@ -19,18 +20,35 @@ export default function TransactionsPage() {
   const [showForm, setShowForm] = useState(false);
   const [selectedDate, setSelectedDate] = useState<Date>(new Date());
   
-  // Fetch expenses from API
-  const { expenses, loading, createExpense, deleteExpense } = useExpenses();
+  // Buscar só os gastos do dia selecionado, uma página por vez
+  const dayFilters = useMemo(() => {
+    const day = format(selectedDate, 'yyyy-MM-dd');
+    return { startDate: day, endDate: `${day}T23:59:59` };
+  }, [selectedDate]);
+
+  const {
+    expenses,
+    loading,
+    hasMore,
+    loadingMore,
+    loadMore,
+    createExpense,
+    deleteExpense,
+  } = useExpenses(dayFilters);
+  const { stats, loading: statsLoading, refetch: refetchStats } = useExpenseStats(dayFilters);
 
   const handleAddExpense = async (expenseData: CreateExpenseInput) => {
     const success = await createExpense(expenseData);
     if (success) {
       setShowForm(false);
+      refetchStats();
     }
   };
 
   const handleDeleteExpense = async (id: string) => {
-    await deleteExpense(id);
+    if (await deleteExpense(id)) {
+      refetchStats();
+    }
   };
 
   const handleDateSelect = (date: Date) => {
@@ -47,23 +65,12 @@ export default function TransactionsPage() {
     isSameDay(parseISO(expense.date), selectedDate)
   );
 
-  // Total for selected date
-  const totalForSelectedDate = filteredExpenses.reduce((acc, exp) => acc + exp.value, 0);
-
-  if (loading) {
-    return (
-      <div className="flex items-center justify-center min-h-screen">
-        <div className="text-center">
-          <div className="animate-spin rounded-full h-12 w-12 border-b-2 mx-auto mb-4"
-            style={{ borderColor: getThemeColor(colors.brand.primary) }}
-          />
-          <p style={{ color: getThemeColor(colors.text.secondary) }}>
-            Carregando transações...
-          </p>
-        </div>
-      </div>
-    );
-  }
+  // Total e quantidade do dia vêm das estatísticas, que cobrem também as páginas não carregadas
+  const dayStats = statsLoading ? null : stats;
+  const totalForSelectedDate = dayStats
+    ? dayStats.total
+    : filteredExpenses.reduce((acc, exp) => acc + exp.value, 0);
+  const countForSelectedDate = dayStats ? dayStats.count : filteredExpenses.length;
 
   return (
     <div className="space-y-6">
@@ -158,7 +165,7 @@ export default function TransactionsPage() {
               className="text-xs mt-1"
               style={{ color: getThemeColor(colors.text.tertiary) }}
             >
-              {filteredExpenses.length} {filteredExpenses.length === 1 ? 'gasto' : 'gastos'} neste dia
+              {countForSelectedDate} {countForSelectedDate === 1 ? 'gasto' : 'gastos'} neste dia
             </p>
           </div>
         </div>
@@ -176,9 +183,11 @@ export default function TransactionsPage() {
               className="text-sm mt-1"
               style={{ color: getThemeColor(colors.text.secondary) }}
             >
-              {filteredExpenses.length === 0 
+              {loading
+                ? 'Carregando transações...'
+                : filteredExpenses.length === 0 
                 ? 'Nenhum gasto neste dia' 
-                : `Mostrando ${filteredExpenses.length} ${filteredExpenses.length === 1 ? 'gasto' : 'gastos'}`
+                : `Mostrando ${filteredExpenses.length} de ${countForSelectedDate} ${countForSelectedDate === 1 ? 'gasto' : 'gastos'}`
               }
             </p>
           </div>
@@ -186,6 +195,7 @@ export default function TransactionsPage() {
             expenses={filteredExpenses}
             onDelete={handleDeleteExpense}
           />
+          <LoadMoreButton hasMore={hasMore} loading={loadingMore} onClick={loadMore} />
         </div>
       </div>
     </div>
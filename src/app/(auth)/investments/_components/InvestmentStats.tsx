@@ -3,22 +3,23 @@
 import { useTheme } from '@/context/ThemeContext';
 import { colors } from '@/lib/styles/colors';
 import { Card } from '@/components/Card';
-import type { Investment } from '../page';
+import type { InvestmentStats as PortfolioStats } from '@/lib/schemas/investment.schema';
 
 interface InvestmentStatsProps {
-  investments: Investment[];
+  // Totais da carteira inteira, agregados pela API (GET /investments/stats)
+  stats: PortfolioStats | null;
 }
 
-export function InvestmentStats({ investments }: InvestmentStatsProps) {
+export function InvestmentStats({ stats }: InvestmentStatsProps) {
   const { getThemeColor } = useTheme();
 
-  const totalInvested = investments.reduce((sum, inv) => sum + inv.value, 0);
-  const totalCurrent = investments.reduce((sum, inv) => sum + inv.currentValue, 0);
-  const totalProfit = totalCurrent - totalInvested;
-  const profitPercentage = totalInvested > 0 ? ((totalProfit / totalInvested) * 100).toFixed(2) : '0';
+  const totalInvested = stats?.totalInvested ?? 0;
+  const totalCurrent = stats?.currentTotal ?? 0;
+  const totalProfit = stats?.totalProfit ?? 0;
+  const profitPercentage = (stats?.profitPercentage ?? 0).toFixed(2);
 
-  const typeDistribution = investments.reduce((acc, inv) => {
-    acc[inv.type] = (acc[inv.type] || 0) + inv.currentValue;
+  const typeDistribution = Object.entries(stats?.byType ?? {}).reduce((acc, [type, totals]) => {
+    acc[type] = totals.current;
     return acc;
   }, {} as Record<string, number>);
 
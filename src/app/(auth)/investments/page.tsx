@@ -4,12 +4,13 @@ import { useTheme } from '@/context/ThemeContext';
 import { colors } from '@/lib/styles/colors';
 import { Button } from '@/components/Button';
 import { Modal } from '@/components/Modal';
+import { LoadMoreButton } from '@/components/LoadMoreButton';
 import { useState } from 'react';
 import { InvestmentForm } from './_components/InvestmentForm';
 import { InvestmentList } from './_components/InvestmentList';
 import { InvestmentStats } from './_components/InvestmentStats';
 import { PlusIcon } from '@heroicons/react/24/outline';
-import { useInvestments } from '@/hooks/api/useInvestments';
+import { useInvestments, useInvestmentStats } from '@/hooks/api/useInvestments';
 import type { CreateInvestmentInput } from '@/lib/schemas/investment.schema';
 
 export default function InvestmentsPage() {
@@ -20,22 +21,30 @@ export default function InvestmentsPage() {
   const { 
     investments, 
     loading, 
+    hasMore,
+    loadingMore,
+    loadMore,
     createInvestment, 
     deleteInvestment 
   } = useInvestments();
+  // Os totais cobrem a carteira inteira, não só as páginas já carregadas
+  const { stats, loading: statsLoading, refetch: refetchStats } = useInvestmentStats();
 
   const handleAddInvestment = async (investmentData: CreateInvestmentInput) => {
     const success = await createInvestment(investmentData);
     if (success) {
       setShowForm(false);
+      refetchStats();
     }
   };
 
   const handleDeleteInvestment = async (id: string) => {
-    await deleteInvestment(id);
+    if (await deleteInvestment(id)) {
+      refetchStats();
+    }
   };
 
-  if (loading) {
+  if (loading || (statsLoading && !stats)) {
     return (
       <div className="flex items-center justify-center min-h-screen">
         <div className="text-center">
@@ -79,7 +88,7 @@ export default function InvestmentsPage() {
       </div>
 
       {/* Stats */}
-      <InvestmentStats investments={investments} />
+      <InvestmentStats stats={stats} />
 
       {/* Modal Form */}
       <Modal
@@ -99,6 +108,7 @@ export default function InvestmentsPage() {
         investments={investments}
         onDelete={handleDeleteInvestment}
       />
+      <LoadMoreButton hasMore={hasMore} loading={loadingMore} onClick={loadMore} />
     </div>
   );
 }
@@ -0,0 +1,24 @@
+'use client';
+
+import { Button } from './Button';
+
+interface LoadMoreButtonProps {
+  hasMore: boolean;
+  loading: boolean;
+  onClick: () => void;
+}
+
+// Botão para buscar a próxima página de uma listagem paginada por cursor
+export function LoadMoreButton({ hasMore, loading, onClick }: LoadMoreButtonProps) {
+  if (!hasMore) {
+    return null;
+  }
+
+  return (
+    <div className="flex justify-center mt-4">
+      <Button variant="neutral" onClick={onClick} disabled={loading}>
+        {loading ? 'Carregando...' : 'Carregar mais'}
+      </Button>
+    </div>
+  );
+}
@@ -12,13 +12,16 @@ export function useExpenses(filters?: ExpenseFilters) {
   const [expenses, setExpenses] = useState<Expense[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   const fetchExpenses = useCallback(async () => {
     try {
       setLoading(true);
       setError(null);
-      const data = await expensesApi.getAll(filters);
-      setExpenses(data);
+      const page = await expensesApi.getAll(filters);
+      setExpenses(page.items);
+      setNextCursor(page.nextCursor);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Erro ao carregar despesas');
       console.error('Error fetching expenses:', err);
@@ -31,6 +34,27 @@ export function useExpenses(filters?: ExpenseFilters) {
     fetchExpenses();
   }, [fetchExpenses]);
 
+  // Buscar a próxima página e anexá-la à lista já carregada
+  const loadMore = useCallback(async () => {
+    if (!nextCursor || loadingMore) return;
+    try {
+      setLoadingMore(true);
+      setError(null);
+      const page = await expensesApi.getAll(filters, nextCursor);
+      setExpenses((prev) => {
+        // Itens criados nesta tela podem reaparecer numa página seguinte
+        const loaded = new Set(prev.map((item) => item.id));
+        return [...prev, ...page.items.filter((item) => !loaded.has(item.id))];
+      });
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Erro ao carregar despesas');
+      console.error('Error fetching expenses:', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  }, [filters, nextCursor, loadingMore]);
+
   const createExpense = async (data: CreateExpenseInput): Promise<Expense | null> => {
     try {
       setError(null);
@@ -79,6 +103,9 @@ export function useExpenses(filters?: ExpenseFilters) {
     createExpense,
     updateExpense,
     deleteExpense,
+    hasMore: nextCursor !== null,
+    loadingMore,
+    loadMore,
     refetch: fetchExpenses,
   };
 }
@@ -13,13 +13,16 @@ export function useInvestments(filters?: InvestmentFilters) {
   const [investments, setInvestments] = useState<Investment[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   const fetchInvestments = useCallback(async () => {
     try {
       setLoading(true);
       setError(null);
-      const data = await investmentsApi.getAll(filters);
-      setInvestments(data);
+      const page = await investmentsApi.getAll(filters);
+      setInvestments(page.items);
+      setNextCursor(page.nextCursor);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Erro ao carregar investimentos');
       console.error('Error fetching investments:', err);
@@ -32,6 +35,27 @@ export function useInvestments(filters?: InvestmentFilters) {
     fetchInvestments();
   }, [fetchInvestments]);
 
+  // Buscar a próxima página e anexá-la à lista já carregada
+  const loadMore = useCallback(async () => {
+    if (!nextCursor || loadingMore) return;
+    try {
+      setLoadingMore(true);
+      setError(null);
+      const page = await investmentsApi.getAll(filters, nextCursor);
+      setInvestments((prev) => {
+        // Itens criados nesta tela podem reaparecer numa página seguinte
+        const loaded = new Set(prev.map((item) => item.id));
+        return [...prev, ...page.items.filter((item) => !loaded.has(item.id))];
+      });
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Erro ao carregar investimentos');
+      console.error('Error fetching investments:', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  }, [filters, nextCursor, loadingMore]);
+
   const createInvestment = async (
     data: CreateInvestmentInput
   ): Promise<Investment | null> => {
@@ -101,6 +125,9 @@ export function useInvestments(filters?: InvestmentFilters) {
     updateInvestment,
     deleteInvestment,
     updateCurrentValue,
+    hasMore: nextCursor !== null,
+    loadingMore,
+    loadMore,
     refetch: fetchInvestments,
   };
 }
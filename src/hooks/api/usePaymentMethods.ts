@@ -10,13 +10,16 @@ export function usePaymentMethods() {
   const [paymentMethods, setPaymentMethods] = useState<PaymentMethod[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   const fetchPaymentMethods = useCallback(async () => {
     try {
       setLoading(true);
       setError(null);
-      const data = await paymentMethodsApi.getAll();
-      setPaymentMethods(data);
+      const page = await paymentMethodsApi.getAll();
+      setPaymentMethods(page.items);
+      setNextCursor(page.nextCursor);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Erro ao carregar métodos de pagamento');
       console.error('Error fetching payment methods:', err);
@@ -29,6 +32,27 @@ export function usePaymentMethods() {
     fetchPaymentMethods();
   }, [fetchPaymentMethods]);
 
+  // Buscar a próxima página e anexá-la à lista já carregada
+  const loadMore = useCallback(async () => {
+    if (!nextCursor || loadingMore) return;
+    try {
+      setLoadingMore(true);
+      setError(null);
+      const page = await paymentMethodsApi.getAll(nextCursor);
+      setPaymentMethods((prev) => {
+        // Itens criados nesta tela podem reaparecer numa página seguinte
+        const loaded = new Set(prev.map((item) => item.id));
+        return [...prev, ...page.items.filter((item) => !loaded.has(item.id))];
+      });
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Erro ao carregar métodos de pagamento');
+      console.error('Error fetching payment methods:', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  }, [nextCursor, loadingMore]);
+
   const createPaymentMethod = async (
     data: CreatePaymentMethodInput
   ): Promise<PaymentMethod | null> => {
@@ -101,6 +125,9 @@ export function usePaymentMethods() {
     updatePaymentMethod,
     deletePaymentMethod,
     setDefaultPaymentMethod,
+    hasMore: nextCursor !== null,
+    loadingMore,
+    loadMore,
     refetch: fetchPaymentMethods,
   };
 }
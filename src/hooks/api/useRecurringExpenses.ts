@@ -10,13 +10,16 @@ export function useRecurringExpenses(activeOnly?: boolean) {
   const [recurringExpenses, setRecurringExpenses] = useState<RecurringExpense[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   const fetchRecurringExpenses = useCallback(async () => {
     try {
       setLoading(true);
       setError(null);
-      const data = await recurringExpensesApi.getAll(activeOnly);
-      setRecurringExpenses(data);
+      const page = await recurringExpensesApi.getAll(activeOnly);
+      setRecurringExpenses(page.items);
+      setNextCursor(page.nextCursor);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Erro ao carregar despesas recorrentes');
       console.error('Error fetching recurring expenses:', err);
@@ -29,6 +32,27 @@ export function useRecurringExpenses(activeOnly?: boolean) {
     fetchRecurringExpenses();
   }, [fetchRecurringExpenses]);
 
+  // Buscar a próxima página e anexá-la à lista já carregada
+  const loadMore = useCallback(async () => {
+    if (!nextCursor || loadingMore) return;
+    try {
+      setLoadingMore(true);
+      setError(null);
+      const page = await recurringExpensesApi.getAll(activeOnly, nextCursor);
+      setRecurringExpenses((prev) => {
+        // Itens criados nesta tela podem reaparecer numa página seguinte
+        const loaded = new Set(prev.map((item) => item.id));
+        return [...prev, ...page.items.filter((item) => !loaded.has(item.id))];
+      });
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Erro ao carregar despesas recorrentes');
+      console.error('Error fetching recurring expenses:', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  }, [activeOnly, nextCursor, loadingMore]);
+
   const createRecurringExpense = async (
     data: CreateRecurringExpenseInput
   ): Promise<RecurringExpense | null> => {
@@ -142,6 +166,9 @@ export function useRecurringExpenses(activeOnly?: boolean) {
     deleteRecurringExpense,
     toggleActive,
     generateExpenses,
+    hasMore: nextCursor !== null,
+    loadingMore,
+    loadMore,
     refetch: fetchRecurringExpenses,
   };
 }
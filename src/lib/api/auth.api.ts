@@ -59,7 +59,9 @@ export const authApi = {
   // Fazer logout
   logout: async (): Promise<void> => {
     try {
-      await apiClient.post(ENDPOINTS.LOGOUT);
+      // Enviar o refresh token para que o backend revogue a sessão
+      const refreshToken = localStorage.getItem('refresh_token');
+      await apiClient.post(ENDPOINTS.LOGOUT, refreshToken ? { refreshToken } : undefined);
     } finally {
       // Sempre remover tokens, mesmo se a requisição falhar
       localStorage.removeItem('auth_token');
@@ -1,4 +1,4 @@
-import axios from 'axios';
+import axios, { InternalAxiosRequestConfig } from 'axios';
 
 // Função para converter snake_case para camelCase
 function toCamelCase(str: string): string {
@@ -26,6 +26,14 @@ function convertKeysToCamelCase(obj: any): any {
   return obj;
 }
 
+// Converter as chaves dos parâmetros de query para snake_case, como a API espera
+function convertParamsToSnakeCase(params: Record<string, unknown>): Record<string, unknown> {
+  return Object.keys(params).reduce((acc, key) => {
+    acc[key.replace(/[A-Z]/g, (letter) => `_${letter.toLowerCase()}`)] = params[key];
+    return acc;
+  }, {} as Record<string, unknown>);
+}
+
 // Configuração do cliente HTTP
 export const apiClient = axios.create({
   baseURL: process.env.NEXT_PUBLIC_API_URL,
@@ -42,6 +50,9 @@ apiClient.interceptors.request.use(
     if (token) {
       config.headers.Authorization = `Bearer ${token}`;
     }
+    if (config.params) {
+      config.params = convertParamsToSnakeCase(config.params);
+    }
     return config;
   },
   (error) => {
@@ -49,6 +60,36 @@ apiClient.interceptors.request.use(
   }
 );
 
+// Rotas em que um 401 significa credenciais inválidas, e não access token expirado
+const NO_REFRESH_ENDPOINTS = ['/auth/refresh', '/auth/login', '/auth/register'];
+
+let refreshing: Promise<string | null> | null = null;
+
+// Trocar o refresh token por um novo par de tokens. Requisições que recebem 401 ao mesmo
+// tempo compartilham a mesma renovação, pois reutilizar um refresh token revoga a sessão
+function refreshAccessToken(): Promise<string | null> {
+  if (!refreshing) {
+    const refreshToken = localStorage.getItem('refresh_token');
+    const request = refreshToken
+      ? axios
+          .post('/auth/refresh', { refreshToken }, { baseURL: apiClient.defaults.baseURL })
+          .then((response) => {
+            const authData = convertKeysToCamelCase(response.data);
+            localStorage.setItem('auth_token', authData.token);
+            if (authData.refreshToken) {
+              localStorage.setItem('refresh_token', authData.refreshToken);
+            }
+            return authData.token as string;
+          })
+          .catch(() => null)
+      : Promise.resolve(null);
+    refreshing = request.finally(() => {
+      refreshing = null;
+    });
+  }
+  return refreshing;
+}
+
 // Interceptor para tratamento de erros e conversão de snake_case para camelCase
 apiClient.interceptors.response.use(
   (response) => {
@@ -60,12 +101,48 @@ apiClient.interceptors.response.use(
     }
     return response;
   },
-  (error) => {
+  async (error) => {
+    const request = error.config as (InternalAxiosRequestConfig & { _retry?: boolean }) | undefined;
     if (error.response?.status === 401) {
-      // Token expirado ou inválido
+      // Access token expirado: renovar uma vez com o refresh token e repetir a requisição
+      if (request && !request._retry && !NO_REFRESH_ENDPOINTS.includes(request.url ?? '')) {
+        request._retry = true;
+        const token = await refreshAccessToken();
+        if (token) {
+          request.headers.Authorization = `Bearer ${token}`;
+          return apiClient(request);
+        }
+      }
+      // Sessão expirada ou revogada
       localStorage.removeItem('auth_token');
+      localStorage.removeItem('refresh_token');
       window.location.href = '/login';
     }
     return Promise.reject(error);
   }
 );
+
+// Maior página aceita pelas listagens da API (MAX_PAGE_SIZE no backend)
+export const PAGE_SIZE = 200;
+
+// Uma página de uma listagem paginada por cursor
+export interface Page<T> {
+  items: T[];
+  nextCursor: string | null;
+}
+
+// Buscar uma página de uma listagem. O cursor da próxima vem no header X-Next-Cursor
+// e é null na última página; a UI pede a seguinte só quando precisar dela
+export async function getPage<T = unknown>(
+  url: string,
+  params?: object,
+  cursor?: string | null,
+): Promise<Page<T>> {
+  const response = await apiClient.get(url, {
+    params: { limit: PAGE_SIZE, ...params, ...(cursor ? { cursor } : {}) },
+  });
+  return {
+    items: response.data as T[],
+    nextCursor: (response.headers['x-next-cursor'] as string | undefined) || null,
+  };
+}
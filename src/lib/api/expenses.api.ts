@@ -1,4 +1,4 @@
-import { apiClient } from './client';
+import { apiClient, getPage, Page } from './client';
 import {
   Expense,
   CreateExpenseInput,
@@ -16,12 +16,10 @@ const ENDPOINTS = {
 };
 
 export const expensesApi = {
-  // Listar todas as despesas
-  getAll: async (filters?: ExpenseFilters): Promise<Expense[]> => {
-    const response = await apiClient.get(ENDPOINTS.EXPENSES, {
-      params: filters,
-    });
-    return response.data.map((item: unknown) => expenseSchema.parse(item));
+  // Listar despesas, uma página por vez
+  getAll: async (filters?: ExpenseFilters, cursor?: string | null): Promise<Page<Expense>> => {
+    const page = await getPage(ENDPOINTS.EXPENSES, filters, cursor);
+    return { ...page, items: page.items.map((item) => expenseSchema.parse(item)) };
   },
 
   // Buscar despesa por ID
@@ -56,18 +54,18 @@ export const expensesApi = {
   },
 
   // Buscar despesas por categoria
-  getByCategory: async (category: string): Promise<Expense[]> => {
-    const response = await apiClient.get(ENDPOINTS.EXPENSES, {
-      params: { category },
-    });
-    return response.data.map((item: unknown) => expenseSchema.parse(item));
+  getByCategory: async (category: string, cursor?: string | null): Promise<Page<Expense>> => {
+    const page = await getPage(ENDPOINTS.EXPENSES, { category }, cursor);
+    return { ...page, items: page.items.map((item) => expenseSchema.parse(item)) };
   },
 
   // Buscar despesas por período
-  getByPeriod: async (startDate: string, endDate: string): Promise<Expense[]> => {
-    const response = await apiClient.get(ENDPOINTS.EXPENSES, {
-      params: { startDate, endDate },
-    });
-    return response.data.map((item: unknown) => expenseSchema.parse(item));
+  getByPeriod: async (
+    startDate: string,
+    endDate: string,
+    cursor?: string | null
+  ): Promise<Page<Expense>> => {
+    const page = await getPage(ENDPOINTS.EXPENSES, { startDate, endDate }, cursor);
+    return { ...page, items: page.items.map((item) => expenseSchema.parse(item)) };
   },
 };
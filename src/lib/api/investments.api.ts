@@ -1,4 +1,4 @@
-import { apiClient } from './client';
+import { apiClient, getPage, Page } from './client';
 import {
   Investment,
   CreateInvestmentInput,
@@ -20,12 +20,13 @@ const ENDPOINTS = {
 };
 
 export const investmentsApi = {
-  // Listar todos os investimentos
-  getAll: async (filters?: InvestmentFilters): Promise<Investment[]> => {
-    const response = await apiClient.get(ENDPOINTS.INVESTMENTS, {
-      params: filters,
-    });
-    return response.data.map((item: unknown) => investmentSchema.parse(item));
+  // Listar investimentos, uma página por vez
+  getAll: async (
+    filters?: InvestmentFilters,
+    cursor?: string | null
+  ): Promise<Page<Investment>> => {
+    const page = await getPage(ENDPOINTS.INVESTMENTS, filters, cursor);
+    return { ...page, items: page.items.map((item) => investmentSchema.parse(item)) };
   },
 
   // Buscar investimento por ID
@@ -72,10 +73,8 @@ export const investmentsApi = {
   },
 
   // Buscar investimentos por tipo
-  getByType: async (type: string): Promise<Investment[]> => {
-    const response = await apiClient.get(ENDPOINTS.INVESTMENTS, {
-      params: { type },
-    });
-    return response.data.map((item: unknown) => investmentSchema.parse(item));
+  getByType: async (type: string, cursor?: string | null): Promise<Page<Investment>> => {
+    const page = await getPage(ENDPOINTS.INVESTMENTS, { type }, cursor);
+    return { ...page, items: page.items.map((item) => investmentSchema.parse(item)) };
   },
 };
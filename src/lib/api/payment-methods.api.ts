@@ -1,4 +1,4 @@
-import { apiClient } from './client';
+import { apiClient, getPage, Page } from './client';
 import {
   PaymentMethod,
   CreatePaymentMethodInput,
@@ -13,10 +13,10 @@ const ENDPOINTS = {
 };
 
 export const paymentMethodsApi = {
-  // Listar todos os métodos de pagamento
-  getAll: async (): Promise<PaymentMethod[]> => {
-    const response = await apiClient.get(ENDPOINTS.PAYMENT_METHODS);
-    return response.data.map((item: unknown) => paymentMethodSchema.parse(item));
+  // Listar métodos de pagamento, uma página por vez
+  getAll: async (cursor?: string | null): Promise<Page<PaymentMethod>> => {
+    const page = await getPage(ENDPOINTS.PAYMENT_METHODS, undefined, cursor);
+    return { ...page, items: page.items.map((item) => paymentMethodSchema.parse(item)) };
   },
 
   // Buscar método de pagamento por ID
@@ -50,10 +50,9 @@ export const paymentMethodsApi = {
 
   // Buscar método padrão
   getDefault: async (): Promise<PaymentMethod | null> => {
-    const response = await apiClient.get(ENDPOINTS.PAYMENT_METHODS, {
-      params: { isDefault: true },
-    });
-    const methods = response.data.map((item: unknown) => paymentMethodSchema.parse(item));
-    return methods.length > 0 ? methods[0] : null;
+    // A listagem traz o método padrão primeiro
+    const { items } = await getPage(ENDPOINTS.PAYMENT_METHODS, { limit: 1 });
+    const method = items.length > 0 ? paymentMethodSchema.parse(items[0]) : null;
+    return method?.isDefault ? method : null;
   },
 };
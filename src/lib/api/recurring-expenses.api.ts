@@ -1,4 +1,4 @@
-import { apiClient } from './client';
+import { apiClient, getPage, Page } from './client';
 import {
   RecurringExpense,
   CreateRecurringExpenseInput,
@@ -61,13 +61,17 @@ const toCamelCase = (obj: any): any => {
 };
 
 export const recurringExpensesApi = {
-  // Listar todas as despesas recorrentes
-  getAll: async (activeOnly?: boolean): Promise<RecurringExpense[]> => {
-    const response = await apiClient.get(ENDPOINTS.RECURRING_EXPENSES, {
-      params: activeOnly !== undefined ? { is_active: activeOnly } : undefined,
-    });
-    const converted = toCamelCase(response.data);
-    return converted as RecurringExpense[];
+  // Listar despesas recorrentes, uma página por vez
+  getAll: async (
+    activeOnly?: boolean,
+    cursor?: string | null
+  ): Promise<Page<RecurringExpense>> => {
+    const page = await getPage(
+      ENDPOINTS.RECURRING_EXPENSES,
+      activeOnly !== undefined ? { is_active: activeOnly } : undefined,
+      cursor,
+    );
+    return { ...page, items: toCamelCase(page.items) as RecurringExpense[] };
   },
 
   // Buscar despesa recorrente por ID
@@ -132,7 +136,7 @@ export const recurringExpensesApi = {
   },
 
   // Buscar despesas ativas
-  getActive: async (): Promise<RecurringExpense[]> => {
-    return recurringExpensesApi.getAll(true);
+  getActive: async (cursor?: string | null): Promise<Page<RecurringExpense>> => {
+    return recurringExpensesApi.getAll(true, cursor);
   },
 };